@@ -0,0 +1,41 @@
+"""Compare the pairwise and clique formulations of the clash constraints.
+
+Usage::
+
+    $ python benchmarks/bench_clash_constraints.py
+"""
+import time
+import pulp
+from conference_scheduler import scheduler
+from conference_scheduler.lp_problem import constraints as lpc
+from conference_scheduler.lp_problem import utils as lpu
+from instances import random_conference
+
+
+if __name__ == '__main__':
+    solver = pulp.PULP_CBC_CMD(msg=False, timeLimit=120)
+    for number_of_events, number_of_slots in ((20, 60), (40, 120),
+                                              (60, 200)):
+        events, slots = random_conference(
+            number_of_events, number_of_slots, number_of_tags=30)
+        model = lpu.ConferenceModel(events=events, slots=slots)
+        X = lpu.variables(model.shape)
+        print(f'{number_of_events} events, {number_of_slots} slots:')
+
+        for clashes, generator in lpc.clash_constraints.items():
+            start = time.perf_counter()
+            constraints = list(generator(
+                events, slots, X, summation_type='lpsum', model=model))
+            built = time.perf_counter() - start
+
+            start = time.perf_counter()
+            try:
+                scheduler.solution(
+                    events, slots, solver=solver, clashes=clashes)
+                status = 'solved'
+            except ValueError:
+                status = 'no solution found'
+            solved = time.perf_counter() - start
+
+            print(f'    {clashes}: {len(constraints)} constraints built in '
+                  f'{built:.3f}s, {status} in {solved:.3f}s')
@@ -0,0 +1,34 @@
+"""Compare the sweep line concurrent slots with the original pairwise check.
+
+Usage::
+
+    $ python benchmarks/bench_concurrent_slots.py
+"""
+import timeit
+from conference_scheduler.lp_problem import utils as lpu
+from instances import random_conference
+
+
+def pairwise_concurrent_slots(slots):
+    """The original implementation comparing every pair of slots"""
+    for i, slot in enumerate(slots):
+        for j, other_slot in enumerate(slots[i + 1:]):
+            if lpu.slots_overlap(slot, other_slot):
+                yield (i, j + i + 1)
+
+
+if __name__ == '__main__':
+    for number_of_slots in (100, 1200, 2000):
+        events, slots = random_conference(0, number_of_slots)
+
+        expected = list(pairwise_concurrent_slots(slots))
+        assert list(lpu.concurrent_slots(slots)) == expected
+
+        pairwise = min(timeit.repeat(
+            lambda: list(pairwise_concurrent_slots(slots)),
+            number=1, repeat=3))
+        sweep = min(timeit.repeat(
+            lambda: list(lpu.concurrent_slots(slots)), number=1, repeat=3))
+        print(f'{number_of_slots} slots, {len(expected)} pairs: '
+              f'pairwise {pairwise:.4f}s, sweep line {sweep:.4f}s, '
+              f'speed up {pairwise / sweep:.0f}x')
@@ -0,0 +1,62 @@
+"""Compare the solutions of simulated annealing with different cooling
+schedules against the number of iterations.
+
+Usage::
+
+    $ python benchmarks/bench_cooling.py
+"""
+import warnings
+import numpy as np
+from conference_scheduler import validator
+from conference_scheduler import heuristics as heu
+from conference_scheduler.lp_problem import objective_functions as of
+from instances import random_conference
+
+
+def schedules():
+    return {
+        'exponential (default)': (None, None),
+        'geometric': (heu.GeometricCooling(0.999), None),
+        'linear': (heu.LinearCooling(), None),
+        'adaptive': (heu.AdaptiveCooling(), None),
+        'geometric with reheating': (heu.GeometricCooling(0.999), 2000),
+    }
+
+
+if __name__ == '__main__':
+    warnings.simplefilter('ignore')
+    iterations = (10 ** 3, 10 ** 4, 5 * 10 ** 4)
+    for number_of_events, number_of_slots in ((50, 150), (100, 300)):
+        events, slots = random_conference(number_of_events, number_of_slots)
+        count_violations = validator.ViolationTracker(events, slots)
+        X = heu.get_initial_array(events, slots, seed=0)
+        print(f'{number_of_events} events, {number_of_slots} slots, '
+              f'violations after {iterations} iterations:')
+        for name, (schedule, reheat_after) in schedules().items():
+            results = []
+            for max_iterations in iterations:
+                solution = heu.simulated_annealing(
+                    initial_array=X, objective_function=count_violations,
+                    initial_temperature=2, cooling_schedule=schedule,
+                    reheat_after=reheat_after, lower_bound=0,
+                    max_iterations=max_iterations,
+                    rng=np.random.default_rng(0))
+                results.append(count_violations(solution))
+            print(f'    {name}: {results}')
+
+        X = heu.get_greedy_initial_array(events, slots)
+        func = of.EfficiencyCapacityDemandDifference(events, slots)
+        print(f'{number_of_events} events, {number_of_slots} slots, '
+              f'capacity demand difference from {func(X)} after '
+              f'{iterations} iterations:')
+        for name, (schedule, reheat_after) in schedules().items():
+            results = []
+            for max_iterations in iterations:
+                solution = heu.simulated_annealing(
+                    initial_array=X, objective_function=func,
+                    initial_temperature=100, cooling_schedule=schedule,
+                    reheat_after=reheat_after,
+                    max_iterations=max_iterations,
+                    rng=np.random.default_rng(0))
+                results.append(int(func(solution)))
+            print(f'    {name}: {results}')
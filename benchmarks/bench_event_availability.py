@@ -0,0 +1,51 @@
+"""Compare the tag matrix event availability array with the original loop.
+
+Usage::
+
+    $ python benchmarks/bench_event_availability.py
+"""
+import timeit
+import numpy as np
+from conference_scheduler.lp_problem import utils as lpu
+from instances import random_conference
+
+
+def loop_event_availability_array(events):
+    """The original E by E double loop implementation"""
+    array = np.ones((len(events), len(events)))
+    for row, event in enumerate(events):
+        for col, other_event in enumerate(events):
+            if row != col:
+                tags = set(event.tags)
+                events_share_tag = len(tags.intersection(other_event.tags)) > 0
+                if (other_event in event.unavailability) or events_share_tag:
+                    array[row, col] = 0
+                    array[col, row] = 0
+    return array
+
+
+if __name__ == '__main__':
+    for number_of_events, loop_repeat in ((100, 3), (1000, 1), (5000, 0)):
+        events, slots = random_conference(number_of_events, 10)
+        model = lpu.ConferenceModel(events=events)
+
+        with_model = min(timeit.repeat(
+            lambda: lpu.event_availability_array(events, model=model),
+            number=1, repeat=3))
+        vectorised = min(timeit.repeat(
+            lambda: lpu.event_availability_array(events),
+            number=1, repeat=3))
+        print(f'{number_of_events} events: tag matrix {vectorised:.4f}s '
+              f'(model prebuilt {with_model:.4f}s)', end='')
+
+        # The original implementation takes minutes for 5000 events
+        if loop_repeat:
+            expected = loop_event_availability_array(events)
+            assert np.array_equal(
+                lpu.event_availability_array(events, model=model), expected)
+            loop = min(timeit.repeat(
+                lambda: loop_event_availability_array(events),
+                number=1, repeat=loop_repeat))
+            print(f', loop {loop:.4f}s, speed up {loop / vectorised:.0f}x',
+                  end='')
+        print()
@@ -0,0 +1,58 @@
+"""Time the heuristics finding a schedule without violations.
+
+Usage::
+
+    $ python benchmarks/bench_heuristics.py
+"""
+import time
+import numpy as np
+from conference_scheduler import validator
+from conference_scheduler import heuristics as heu
+from instances import random_conference
+
+
+if __name__ == '__main__':
+    for number_of_events, number_of_slots in ((50, 150), (100, 300)):
+        events, slots = random_conference(number_of_events, number_of_slots)
+        print(f'{number_of_events} events, {number_of_slots} slots:')
+        functions = {
+            'array validator': validator.ArrayValidator(events, slots),
+            'violation tracker': validator.ViolationTracker(events, slots),
+        }
+        for name, count_violations in functions.items():
+            np.random.seed(0)
+            X = heu.get_initial_array(events, slots)
+            start = time.perf_counter()
+            X = heu.hill_climber(
+                initial_array=X, objective_function=count_violations,
+                max_iterations=10 ** 4)
+            elapsed = time.perf_counter() - start
+            print(f'    {name}: {count_violations(X)} violations after '
+                  f'10000 iterations in {elapsed:.3f}s')
+
+        count_violations = functions['violation tracker']
+        np.random.seed(0)
+        initial_arrays = {
+            'random initial array': heu.get_initial_array(events, slots),
+            'greedy initial array': heu.get_greedy_initial_array(
+                events, slots),
+        }
+        for name, X in initial_arrays.items():
+            print(f'    {name}: {count_violations(X)} violations')
+
+        algorithms = {
+            'hill climber': (heu.hill_climber, {}),
+            'hill climber in batches of 32': (heu.hill_climber, {
+                'batch_size': 32, 'max_iterations': 10 ** 4 // 32}),
+            'tabu search': (heu.tabu_search, {'neighbourhood_size': 20}),
+        }
+        for name, (algorithm, kwargs) in algorithms.items():
+            np.random.seed(0)
+            X = heu.get_initial_array(events, slots)
+            start = time.perf_counter()
+            X = algorithm(
+                initial_array=X, objective_function=count_violations,
+                lower_bound=0, **{'max_iterations': 10 ** 4, **kwargs})
+            elapsed = time.perf_counter() - start
+            print(f'    {name}: {count_violations(X)} violations in '
+                  f'{elapsed:.3f}s')
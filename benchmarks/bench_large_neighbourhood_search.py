@@ -0,0 +1,49 @@
+"""Compare the large neighbourhood search with the hill climber for the
+efficiency objective function from a valid schedule.
+
+Usage::
+
+    $ python benchmarks/bench_large_neighbourhood_search.py
+"""
+import time
+import warnings
+import numpy as np
+from conference_scheduler import validator
+from conference_scheduler import heuristics as heu
+from conference_scheduler.lp_problem import objective_functions as of
+from instances import random_conference
+
+
+if __name__ == '__main__':
+    warnings.simplefilter('ignore')
+    for number_of_events, number_of_slots in ((100, 300), (200, 600)):
+        events, slots = random_conference(number_of_events, number_of_slots)
+        count_violations = validator.ViolationTracker(events, slots)
+        X = heu.get_greedy_initial_array(events, slots)
+        X = heu.hill_climber(
+            initial_array=X, objective_function=count_violations,
+            lower_bound=0, max_iterations=10 ** 4)
+        func = of.EfficiencyCapacityDemandDifference(events, slots)
+        print(f'{number_of_events} events, {number_of_slots} slots, '
+              f'{count_violations(X)} violations, capacity demand '
+              f'difference {func(X)}:')
+
+        start = time.perf_counter()
+        solution = heu.hill_climber(
+            initial_array=X, objective_function=func,
+            acceptance_criteria=count_violations, max_iterations=10 ** 4,
+            rng=np.random.default_rng(0))
+        elapsed = time.perf_counter() - start
+        print(f'    hill climber: {func(solution)} in {elapsed:.3f}s')
+
+        for neighbourhood in heu.neighbourhoods:
+            start = time.perf_counter()
+            solution = heu.large_neighbourhood_search(
+                events, slots, X,
+                objective_function=of.efficiency_capacity_demand_difference,
+                neighbourhood=neighbourhood, max_iterations=20,
+                rng=np.random.default_rng(0))
+            elapsed = time.perf_counter() - start
+            print(f'    large neighbourhood search ({neighbourhood}): '
+                  f'{func(solution)} with {count_violations(solution)} '
+                  f'violations in {elapsed:.3f}s')
@@ -0,0 +1,61 @@
+"""Compare building the pulp problem from the constraint generators with
+building it from the constraint matrix.
+
+Usage::
+
+    $ python benchmarks/bench_model_build.py
+"""
+import time
+import pulp
+from conference_scheduler.lp_problem import constraints as lpc
+from conference_scheduler.lp_problem import matrix as lpm
+from conference_scheduler.lp_problem import utils as lpu
+from instances import random_conference
+
+
+def generator_problem(events, slots, model):
+    """Build the problem as scheduler.solution originally did"""
+    problem = pulp.LpProblem()
+    X = lpu.variables(model.shape)
+    beta = pulp.LpVariable("upper_bound")
+    for constraint in lpc.all_constraints(
+        events, slots, X, beta, 'lpsum', model=model
+    ):
+        problem += constraint.condition
+    return problem
+
+
+def matrix_problem(events, slots, model):
+    """Build the problem as scheduler.solution now does"""
+    problem = pulp.LpProblem()
+    X = lpu.variables(model.shape)
+    beta = pulp.LpVariable("upper_bound")
+    columns = lpm.variable_columns(model.shape)
+    matrix = lpm.constraint_matrix(
+        events, slots, columns, beta_column=len(X), model=model)
+    lpm.add_constraints(problem, matrix, list(X.values()) + [beta])
+    return problem
+
+
+if __name__ == '__main__':
+    for number_of_events, number_of_slots in ((50, 100), (100, 200)):
+        events, slots = random_conference(
+            number_of_events, number_of_slots, number_of_tags=30)
+        model = lpu.ConferenceModel(events=events, slots=slots)
+        print(f'{number_of_events} events, {number_of_slots} slots:')
+        for name, build in (('generators', generator_problem),
+                            ('matrix', matrix_problem)):
+            start = time.perf_counter()
+            problem = build(events, slots, model)
+            duration = time.perf_counter() - start
+            nonzeros = sum(len(c) for c in problem.constraints.values())
+            print(f'    {name}: {len(problem.constraints)} constraints, '
+                  f'{nonzeros} non zeros built in {duration:.3f}s')
+
+        start = time.perf_counter()
+        matrix = lpm.constraint_matrix(
+            events, slots, lpm.variable_columns(model.shape),
+            beta_column=model.shape.events * model.shape.slots, model=model)
+        duration = time.perf_counter() - start
+        print(f'    constraint matrix alone: {len(matrix.values)} non zeros '
+              f'built in {duration:.3f}s')
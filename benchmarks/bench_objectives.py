@@ -0,0 +1,30 @@
+"""Compare the time to solve with the efficiency and equity objectives.
+
+Usage::
+
+    $ python benchmarks/bench_objectives.py
+"""
+import time
+import pulp
+from conference_scheduler import scheduler
+from conference_scheduler.lp_problem import objective_functions as of
+from instances import random_conference
+
+
+if __name__ == '__main__':
+    solver = pulp.PULP_CBC_CMD(msg=False, timeLimit=120)
+    objectives = {
+        'efficiency': of.efficiency_capacity_demand_difference,
+        'equity': of.equity_capacity_demand_difference,
+    }
+    for number_of_events, number_of_slots in ((20, 60), (40, 120)):
+        events, slots = random_conference(
+            number_of_events, number_of_slots, number_of_tags=30)
+        print(f'{number_of_events} events, {number_of_slots} slots:')
+        for name, objective in objectives.items():
+            start = time.perf_counter()
+            scheduler.solution(
+                events, slots, objective_function=objective, solver=solver,
+                sparse=True, clashes='clique')
+            solved = time.perf_counter() - start
+            print(f'    {name}: solved in {solved:.3f}s')
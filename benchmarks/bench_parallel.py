@@ -0,0 +1,41 @@
+"""Compare a single simulated annealing chain with the parallel drivers.
+
+Usage::
+
+    $ python benchmarks/bench_parallel.py
+"""
+import os
+import time
+import numpy as np
+from conference_scheduler import validator
+from conference_scheduler import heuristics as heu
+from instances import random_conference
+
+
+if __name__ == '__main__':
+    processes = os.cpu_count()
+    for number_of_events, number_of_slots in ((100, 300), (200, 600)):
+        events, slots = random_conference(number_of_events, number_of_slots)
+        count_violations = validator.ViolationTracker(events, slots)
+        X = heu.get_initial_array(events, slots, seed=0)
+        print(f'{number_of_events} events, {number_of_slots} slots, '
+              f'{processes} processes:')
+
+        algorithms = {
+            'simulated annealing': (heu.simulated_annealing, {
+                'rng': np.random.default_rng(0)}),
+            'multi start': (heu.multi_start, {
+                'number_of_chains': processes, 'processes': processes,
+                'seed': 0}),
+            'parallel tempering': (heu.parallel_tempering, {
+                'temperatures': np.geomspace(0.1, 10, processes),
+                'processes': processes, 'seed': 0}),
+        }
+        for name, (algorithm, kwargs) in algorithms.items():
+            start = time.perf_counter()
+            solution = algorithm(
+                initial_array=X, objective_function=count_violations,
+                max_iterations=10 ** 4, **kwargs)
+            elapsed = time.perf_counter() - start
+            print(f'    {name}: {count_violations(solution)} violations in '
+                  f'{elapsed:.3f}s')
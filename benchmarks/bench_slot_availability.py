@@ -0,0 +1,45 @@
+"""Compare the vectorised slot availability array with the original loop.
+
+Usage::
+
+    $ python benchmarks/bench_slot_availability.py
+"""
+import timeit
+import numpy as np
+from conference_scheduler.lp_problem import utils as lpu
+from instances import random_conference
+
+
+def loop_slot_availability_array(events, slots):
+    """The original E by S double loop implementation"""
+    array = np.ones((len(events), len(slots)))
+    for row, event in enumerate(events):
+        for col, slot in enumerate(slots):
+            if slot in event.unavailability or event.duration > slot.duration:
+                array[row, col] = 0
+    return array
+
+
+if __name__ == '__main__':
+    for number_of_events, number_of_slots in ((100, 50), (500, 200),
+                                              (3000, 1200)):
+        events, slots = random_conference(number_of_events, number_of_slots)
+        model = lpu.ConferenceModel(events=events, slots=slots)
+
+        expected = loop_slot_availability_array(events, slots)
+        assert np.array_equal(
+            lpu.slot_availability_array(events, slots, model=model), expected)
+
+        loop = min(timeit.repeat(
+            lambda: loop_slot_availability_array(events, slots),
+            number=1, repeat=3))
+        vectorised = min(timeit.repeat(
+            lambda: lpu.slot_availability_array(events, slots),
+            number=1, repeat=3))
+        with_model = min(timeit.repeat(
+            lambda: lpu.slot_availability_array(events, slots, model=model),
+            number=1, repeat=3))
+        print(f'{number_of_events} events, {number_of_slots} slots: '
+              f'loop {loop:.4f}s, vectorised {vectorised:.4f}s '
+              f'(model prebuilt {with_model:.6f}s), '
+              f'speed up {loop / vectorised:.0f}x')
@@ -0,0 +1,55 @@
+"""Time the heuristics with and without a trace and show where the traced
+runs spend their time.
+
+Usage::
+
+    $ python benchmarks/bench_trace.py
+"""
+import time
+import warnings
+import numpy as np
+from conference_scheduler import validator
+from conference_scheduler import heuristics as heu
+from conference_scheduler.lp_problem import objective_functions as of
+from instances import random_conference
+
+
+if __name__ == '__main__':
+    warnings.simplefilter('ignore')
+    for number_of_events, number_of_slots in ((50, 150), (100, 300)):
+        events, slots = random_conference(number_of_events, number_of_slots)
+        print(f'{number_of_events} events, {number_of_slots} slots:')
+        count_violations = validator.ViolationTracker(events, slots)
+        func = of.EfficiencyCapacityDemandDifference(events, slots)
+        X = heu.hill_climber(
+            initial_array=heu.get_greedy_initial_array(events, slots),
+            objective_function=count_violations, lower_bound=0,
+            max_iterations=10 ** 5, rng=np.random.default_rng(0))
+
+        algorithms = {
+            'hill climber': (heu.hill_climber, {}),
+            'hill climber in batches of 32': (heu.hill_climber, {
+                'batch_size': 32, 'max_iterations': 10 ** 4 // 32}),
+            'simulated annealing': (heu.simulated_annealing, {
+                'cooling_schedule': heu.GeometricCooling(0.999)}),
+            'tabu search': (heu.tabu_search, {}),
+        }
+        for name, (algorithm, kwargs) in algorithms.items():
+            kwargs = {'max_iterations': 10 ** 4, **kwargs}
+            elapsed = {}
+            for trace in (None, heu.Trace()):
+                start = time.perf_counter()
+                algorithm(
+                    initial_array=X, objective_function=func,
+                    acceptance_criteria=count_violations, trace=trace,
+                    rng=np.random.default_rng(0), **kwargs)
+                elapsed[trace is None] = time.perf_counter() - start
+            print(f'    {name}: {elapsed[True]:.3f}s, '
+                  f'{elapsed[False]:.3f}s with a trace')
+            record = trace.records[-1]
+            print(f'        acceptance ratio {record.acceptance_ratio:.3f}, '
+                  f'{record.objective_rate:.0f} objective and '
+                  f'{record.violations_rate:.0f} violations evaluations/s')
+            for kind in ('moves', 'objective', 'violations'):
+                print(f'        {kind}: {trace.counts[kind]} in '
+                      f'{trace.times[kind]:.3f}s')
@@ -0,0 +1,31 @@
+"""Compare counting violated constraints with the constraint generators and
+with the array validator.
+
+Usage::
+
+    $ python benchmarks/bench_validator.py
+"""
+import timeit
+import numpy as np
+from conference_scheduler import validator
+from conference_scheduler.lp_problem import utils as lpu
+from instances import random_conference
+
+
+if __name__ == '__main__':
+    for number_of_events, number_of_slots in ((20, 60), (50, 150)):
+        events, slots = random_conference(number_of_events, number_of_slots)
+        model = lpu.ConferenceModel(events=events, slots=slots)
+        X = np.eye(number_of_slots)[
+            np.random.permutation(number_of_slots)[:number_of_events]]
+        count_violations = validator.ArrayValidator(
+            events, slots, model=model)
+
+        generators = timeit.timeit(
+            lambda: len(list(validator.array_violations(
+                X, events, slots, model=model))),
+            number=3) / 3
+        arrays = timeit.timeit(lambda: count_violations(X), number=100) / 100
+        print(f'{number_of_events} events, {number_of_slots} slots: '
+              f'generators {generators * 1e6:.0f}us, '
+              f'array validator {arrays * 1e6:.0f}us')
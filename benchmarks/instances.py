@@ -0,0 +1,50 @@
+"""Generate random conferences of a given size for benchmarking."""
+from datetime import datetime, timedelta
+import numpy as np
+from conference_scheduler.resources import Event, Slot
+
+
+def random_conference(number_of_events, number_of_slots, number_of_tags=20,
+                      venues=10, unavailability=3, seed=0):
+    """
+    Return a tuple of events and slots for a randomly generated conference
+
+    Slots are spread across the given number of venues in consecutive
+    30 and 60 minute blocks. Each event is given up to three tags and up to
+    `unavailability` slots and events in its unavailability.
+    """
+    random_state = np.random.RandomState(seed)
+    start = datetime(2017, 10, 26, 9, 0)
+
+    slots = []
+    for i in range(number_of_slots):
+        venue = i % venues
+        block = i // venues
+        duration = int(random_state.choice([30, 60]))
+        slots.append(Slot(
+            venue=f'Room {venue}',
+            starts_at=start + timedelta(minutes=60 * block),
+            duration=duration,
+            capacity=int(random_state.randint(10, 500)),
+            session=f'Session {block // 3}'))
+
+    tags = [f'tag {i}' for i in range(number_of_tags)]
+    events = []
+    for i in range(number_of_events):
+        events.append(Event(
+            name=f'Talk {i}',
+            duration=int(random_state.choice([30, 30, 30, 60])),
+            demand=int(random_state.randint(0, 500)),
+            tags=list(random_state.choice(
+                tags, size=random_state.randint(0, 4), replace=False))))
+
+    for event in events:
+        for _ in range(random_state.randint(0, unavailability + 1)):
+            if random_state.random_sample() < 0.5:
+                unavailable = slots[random_state.randint(number_of_slots)]
+            else:
+                unavailable = events[random_state.randint(number_of_events)]
+            if unavailable is not event:
+                event.add_unavailability(unavailable)
+
+    return events, slots
@@ -11,7 +11,7 @@ setup(
     author='Owen Campbell, Vince Knight',
     author_email='owen.campbell@tanti.org.uk',
     description='A Python tool to assist the task of scheduling a conference',
-    install_requires=['pulp', 'numpy'],
+    install_requires=['pulp>=2.0', 'numpy>=1.17'],
     setup_requires=['pytest-runner'],
     tests_require=['pytest', 'pytest-pep8'],
     classifiers=[
@@ -1,3 +1,8 @@
 from .utils import *
 from .hill_climber import *
 from .simulated_annealing import *
+from .tabu_search import *
+from .parallel import *
+from .cooling import *
+from .trace import *
+from .large_neighbourhood_search import *
@@ -0,0 +1,103 @@
+"""Cooling schedules for :py:func:`simulated_annealing`
+
+A cooling schedule is started with the initial temperature and the maximum
+number of iterations of the search and is then called after each iteration
+with the current temperature, the number of iterations (since the last
+reheat, if any) and whether the move of that iteration was accepted. It
+returns the new temperature.
+"""
+import numpy as np
+
+
+__all__ = [
+    'acceptance_probability', 'ExponentialCooling', 'GeometricCooling',
+    'LinearCooling', 'AdaptiveCooling'
+]
+
+
+def acceptance_probability(delta, temperature):
+    """
+    Return the probability of accepting a move which increases the objective
+    function by delta at a given temperature
+    """
+    # Dividing by a temperature close to zero overflows to an infinite
+    # exponent, for which the probability is zero as expected
+    with np.errstate(over='ignore'):
+        return np.exp(-delta / temperature)
+
+
+class ExponentialCooling:
+    """
+    Multiply the temperature by cooldown_rate ** iterations
+
+    The temperature falls very quickly: with a rate of 0.7 it is effectively
+    zero after a few dozen iterations.
+    """
+    def __init__(self, cooldown_rate=0.7):
+        self.cooldown_rate = cooldown_rate
+
+    def start(self, initial_temperature, max_iterations):
+        pass
+
+    def __call__(self, temperature, iterations, accepted):
+        return temperature * (self.cooldown_rate) ** iterations
+
+
+class GeometricCooling:
+    """
+    Multiply the temperature by cooldown_rate at each iteration
+    """
+    def __init__(self, cooldown_rate=0.99):
+        self.cooldown_rate = cooldown_rate
+
+    def start(self, initial_temperature, max_iterations):
+        pass
+
+    def __call__(self, temperature, iterations, accepted):
+        return temperature * self.cooldown_rate
+
+
+class LinearCooling:
+    """
+    Decrease the temperature by the same amount at each iteration so that it
+    reaches zero after the maximum number of iterations
+    """
+    def start(self, initial_temperature, max_iterations):
+        self.step = initial_temperature / max(max_iterations, 1)
+
+    def __call__(self, temperature, iterations, accepted):
+        return max(temperature - self.step, 0)
+
+
+class AdaptiveCooling:
+    """
+    Adjust the temperature according to the rate at which moves are accepted
+
+    The rate is measured over windows of a number of iterations. After each
+    window the temperature is multiplied by cooldown_rate if the rate was
+    above a target and divided by it otherwise. The target falls linearly
+    from initial_acceptance_rate to zero over the maximum number of
+    iterations.
+    """
+    def __init__(self, initial_acceptance_rate=0.5, cooldown_rate=0.9,
+                 window=100):
+        self.initial_acceptance_rate = initial_acceptance_rate
+        self.cooldown_rate = cooldown_rate
+        self.window = window
+
+    def start(self, initial_temperature, max_iterations):
+        self.max_iterations = max(max_iterations, 1)
+        self.accepted = 0
+
+    def __call__(self, temperature, iterations, accepted):
+        self.accepted += accepted
+        if iterations % self.window:
+            return temperature
+
+        acceptance_rate = self.accepted / self.window
+        self.accepted = 0
+        target = self.initial_acceptance_rate * max(
+            1 - iterations / self.max_iterations, 0)
+        if acceptance_rate > target:
+            return temperature * self.cooldown_rate
+        return temperature / self.cooldown_rate
@@ -1,47 +1,135 @@
-from .utils import element_from_neighbourhood, get_initial_array
+from .utils import (
+    Budget, SearchState, incremental_functions, get_initial_array)
+import numpy as np
 import warnings
 
+
+__all__ = ['hill_climber']
+
+
 def hill_climber(objective_function,
                  initial_array,
                  lower_bound=-float('inf'),
                  acceptance_criteria=None,
-                 max_iterations=10 ** 3):
+                 max_iterations=10 ** 3,
+                 batch_size=None,
+                 time_limit=None,
+                 deadline=None,
+                 max_stagnation=None,
+                 anytime=False,
+                 trace=None,
+                 rng=None):
     """
     Implement a basic hill climbing algorithm.
 
-    Has two stopping conditions:
+    Has the following stopping conditions:
 
     1. Maximum number of iterations;
-    2. A known lower bound, a none is passed then this is not used.
+    2. A known lower bound, a none is passed then this is not used;
+    3. A time_limit in seconds or a deadline (a time.monotonic() value), if
+       either is given;
+    4. max_stagnation iterations without improvement, if it is given.
+
+    If anytime is True then a KeyboardInterrupt stops the search and the best
+    solution found so far is returned.
+
+    If trace (a :py:class:`heuristics.Trace`) is not None then the progress
+    of the search and the evaluations are recorded in it.
 
     If acceptance_criteria (a callable) is not None then this is used to obtain
     an upper bound on some other measure (different to the objective function).
     In practice this is used when optimising the objective function to ensure
     that we don't accept a solution that improves the objective function but tht
     adds more constraint violations.
+
+    If the objective_function or acceptance_criteria have a delta method (see
+    :py:class:`validator.ViolationTracker`) they are evaluated incrementally
+    for each move.
+
+    If batch_size is not None then each iteration draws that many random moves
+    and applies the best of them if it improves the objective function
+    (steepest descent over a sample of the neighbourhood). Functions with a
+    deltas method are evaluated for the whole batch at once.
+
+    Random moves are drawn from rng (a np.random.Generator) if it is given and
+    from the global numpy random state otherwise.
     """
 
-    X = initial_array
+    X = np.array(initial_array)
     if acceptance_criteria is not None:
         acceptance_bound = acceptance_criteria(X)
+        current_violations = acceptance_bound
+    objective_function, acceptance_criteria = incremental_functions(
+        X, objective_function, acceptance_criteria)
+    state = SearchState(
+        X, objective_function, acceptance_criteria, rng=rng, trace=trace)
+
+    budget = Budget(time_limit, deadline, max_stagnation)
+    # The current solution may be left part way through a move when
+    # interrupted so a copy of it is kept in anytime mode
+    best_X = state.snapshot() if anytime else None
 
     iterations = 0
+    accepted_moves = 0
     current_energy = objective_function(X)
 
-    while current_energy > lower_bound and iterations <= max_iterations:
+    try:
+        while (current_energy > lower_bound and
+               iterations <= max_iterations and
+               not budget.exhausted(current_energy)):
+
+            if trace is not None:
+                trace.record(iterations, current_energy, current_energy,
+                             accepted_moves)
+            iterations += 1
+            if batch_size is not None:
+                moves = state.random_moves(batch_size)
+                candidate_energies = state.values(
+                    objective_function, moves, current_energy)
+                if acceptance_criteria is not None:
+                    candidate_violations = state.values(
+                        acceptance_criteria, moves, current_violations)
+                    candidate_energies = np.where(
+                        candidate_violations <= acceptance_bound,
+                        candidate_energies, np.inf)
+                best = np.argmin(candidate_energies)
+                if candidate_energies[best] < current_energy:
+                    if acceptance_criteria is not None:
+                        current_violations = candidate_violations[best]
+                    state.apply(moves.move(best))
+                    accepted_moves += 1
+                    current_energy = candidate_energies[best]
+                    if anytime:
+                        best_X = state.snapshot()
+                continue
+
+            move = state.random_move()
+            candidate_energy = state.value(
+                objective_function, move, current_energy)
 
-        iterations += 1
-        candidate = element_from_neighbourhood(X)
-        candidate_energy = objective_function(candidate)
+            if candidate_energy < current_energy:
+                if acceptance_criteria is not None:
+                    candidate_violations = state.value(
+                        acceptance_criteria, move, current_violations)
+                    if candidate_violations > acceptance_bound:
+                        continue
+                    current_violations = candidate_violations
 
-        if (candidate_energy < current_energy and
-            (acceptance_criteria is None or
-             acceptance_criteria(candidate) <= acceptance_bound)):
+                state.apply(move)
+                accepted_moves += 1
+                current_energy = candidate_energy
+                if anytime:
+                    best_X = state.snapshot()
+    except KeyboardInterrupt:
+        if not anytime:
+            raise
 
-            X = candidate
-            current_energy = candidate_energy
+    if trace is not None:
+        trace.record(iterations, current_energy, current_energy,
+                     accepted_moves, force=True)
 
     if lower_bound > -float('inf') and current_energy != lower_bound:
-        warnings.warn(f"Lower bound {lower_bound} not achieved after {max_iterations} iterations")
+        warnings.warn(f"Lower bound {lower_bound} not achieved after "
+                      f"{iterations} iterations")
 
-    return X
+    return state.to_array(best_X)
@@ -0,0 +1,224 @@
+from functools import partial
+from .utils import (
+    Assignment, Budget, array_to_assignment, assignment_to_array)
+from conference_scheduler.lp_problem import matrix as lpm
+from conference_scheduler.lp_problem import objective_functions as of
+from conference_scheduler.lp_problem import utils as lpu
+import numpy as np
+
+
+__all__ = ['neighbourhoods', 'large_neighbourhood_search']
+
+
+# Each neighbourhood returns the events to free given the slot of each event
+# and the boolean array of the pairs of conflicting events, in either order
+
+def _session_neighbourhood(model, conflicts, slot_of, random):
+    event = random.choice(len(slot_of))
+    sessions = model.session_ids[slot_of]
+    return np.flatnonzero(sessions == sessions[event])
+
+
+def _conflict_neighbourhood(model, conflicts, slot_of, random):
+    events = np.flatnonzero(conflicts.any(axis=1))
+    if len(events) == 0:
+        return _random_neighbourhood(model, conflicts, slot_of, random)
+    event = random.choice(events)
+    return np.append(event, np.flatnonzero(conflicts[event]))
+
+
+def _random_neighbourhood(model, conflicts, slot_of, random):
+    return np.arange(len(slot_of))
+
+
+def _no_objective(X):
+    return 0
+
+
+def _timed(trace, kind, function, *args):
+    if trace is None:
+        return function(*args)
+    return trace.timed(kind, 1, function, *args)
+
+
+neighbourhoods = {
+    'session': _session_neighbourhood,
+    'conflict': _conflict_neighbourhood,
+    'random': _random_neighbourhood,
+}
+
+
+def large_neighbourhood_search(events,
+                               slots,
+                               initial_array,
+                               objective_function=None,
+                               neighbourhood='session',
+                               neighbourhood_size=10,
+                               lower_bound=-float('inf'),
+                               max_iterations=100,
+                               solver=None,
+                               clashes='clique',
+                               time_limit=None,
+                               deadline=None,
+                               max_stagnation=None,
+                               anytime=False,
+                               trace=None,
+                               rng=None,
+                               **kwargs):
+    """
+    Implement a large neighbourhood search which solves sub problems with the
+    linear program of :py:func:`scheduler.solution`
+
+    At each iteration some of the events are freed and the others are fixed
+    in their slots. The linear program is then solved with variables for the
+    slots available to the freed events and for the current slot of each
+    fixed event only. The solution replaces the current one if it is no
+    worse.
+
+    The events freed are at most neighbourhood_size of:
+
+    - 'session': the events in the session of a random event;
+    - 'conflict': a random event with conflicts and the events it conflicts
+      with;
+    - 'random': all the events.
+
+    Every sub problem contains the current schedule so the initial array
+    should be a valid schedule (for example one found by another heuristic
+    with :py:class:`validator.ViolationTracker` as objective function).
+
+    Has the following stopping conditions:
+
+    1. Maximum number of iterations;
+    2. A known lower bound, a none is passed then this is not used;
+    3. A time_limit in seconds or a deadline (a time.monotonic() value), if
+       either is given. A sub problem being solved is not interrupted;
+    4. max_stagnation iterations without improvement, if it is given.
+
+    If anytime is True then a KeyboardInterrupt stops the search and the best
+    solution found so far is returned.
+
+    If trace (a :py:class:`heuristics.Trace`) is not None then the progress
+    of the search, the evaluations of the objective function and the time
+    spent building and solving the sub problems ('solver') are recorded in
+    it.
+
+    Parameters
+    ----------
+    events : list or tuple
+        of :py:class:`resources.Event` instances
+    slots : list or tuple
+        of :py:class:`resources.Slot` instances
+    initial_array : np.array
+        a schedule in array form
+    objective_function : callable, optional
+        from lp_problem.objective_functions
+    neighbourhood : str
+        either 'session', 'conflict' or 'random'
+    neighbourhood_size : int
+        the maximum number of events freed
+    solver : pulp.solver, optional
+        defaults to pulp's default solver or, if that is CBC, to CBC without
+        output and with warmStart=True. The current schedule is set as the
+        initial value of the variables, which is only used by solvers
+        created with warmStart=True.
+    clashes : str
+        either 'pairwise' or 'clique', which gives far fewer constraints when
+        many of the freed events conflict
+    rng : np.random.Generator, optional
+        from which the events to free are drawn. If None, the global numpy
+        random state is used.
+    kwargs : keyword arguments
+        arguments for the objective function
+
+    Returns
+    -------
+    np.array
+        the best schedule found in array form
+    """
+    X = np.array(initial_array)
+    assignment = array_to_assignment(X)
+    random = np.random if rng is None else rng
+    if solver is None:
+        solver = lpu.default_solver(msg=False)
+
+    model = lpu.ConferenceModel(events=events, slots=slots)
+    slot_availability = lpu.slot_availability_array(
+        events, slots, model=model) != 0
+    conflicts = lpu.conflict_array(events, model=model)
+    conflicts = conflicts | conflicts.T
+    concurrency = lpu.concurrency_array(slots, model=model).astype(float)
+    if objective_function is None:
+        evaluate = _no_objective
+    else:
+        evaluate = of.compiled_objective(
+            objective_function, events=events, slots=slots, **kwargs)
+    choose_events = neighbourhoods[neighbourhood]
+
+    budget = Budget(time_limit, deadline, max_stagnation)
+    iterations = 0
+    accepted_moves = 0
+    current_energy = evaluate(X)
+
+    try:
+        while (current_energy > lower_bound and
+               iterations < max_iterations and
+               not budget.exhausted(current_energy)):
+
+            if trace is not None:
+                trace.record(iterations, current_energy, current_energy,
+                             accepted_moves)
+            iterations += 1
+            slot_of = assignment.slot_of
+            freed = choose_events(model, conflicts, slot_of, random)
+            if len(freed) > neighbourhood_size:
+                freed = random.choice(freed, neighbourhood_size, replace=False)
+
+            # The fixed events only have a variable for their current slot
+            # and the freed events for the available slots which are not used
+            # by, or concurrent with a slot of, a fixed event they conflict
+            # with
+            availability = np.zeros(model.shape, dtype=bool)
+            availability[np.arange(len(slot_of)), slot_of] = True
+            availability[freed] = False
+            fixed = np.flatnonzero(availability.any(axis=1))
+            occupied = availability.any(axis=0)
+            clashing = conflicts[np.ix_(freed, fixed)].astype(float) @ (
+                concurrency[slot_of[fixed]]) > 0
+            availability[freed] = slot_availability[freed] & ~(
+                occupied | clashing)
+            availability[freed, slot_of[freed]] = True
+
+            problem, variables, beta = _timed(
+                trace, 'solver', partial(
+                    lpm.build_problem, events, slots,
+                    objective_function=objective_function,
+                    availability=availability, clashes=clashes, model=model,
+                    **kwargs))
+            for (event, slot), variable in variables.items():
+                variable.setInitialValue(int(slot_of[event] == slot))
+
+            if _timed(trace, 'solver', problem.solve, solver) != 1:
+                continue
+
+            candidate = np.array(slot_of)
+            for (event, slot), variable in variables.items():
+                if variable.value() > 0.5:
+                    candidate[event] = slot
+            candidate = Assignment(candidate, model.shape.slots)
+
+            candidate_energy = _timed(
+                trace, 'objective', evaluate,
+                assignment_to_array(candidate, dtype=X.dtype))
+            if candidate_energy <= current_energy:
+                assignment = candidate
+                accepted_moves += 1
+                current_energy = candidate_energy
+    except KeyboardInterrupt:
+        if not anytime:
+            raise
+
+    if trace is not None:
+        trace.record(iterations, current_energy, current_energy,
+                     accepted_moves, force=True)
+
+    return assignment_to_array(assignment, dtype=X.dtype)
@@ -0,0 +1,349 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from .cooling import acceptance_probability
+from .simulated_annealing import simulated_annealing
+from .trace import Trace
+from .utils import Budget, SearchState, incremental_functions
+import numpy as np
+import os
+import time
+import warnings
+
+
+__all__ = ['multi_start', 'parallel_tempering']
+
+
+# The functions of the search in each worker process, set once when the
+# process starts rather than sent with each task
+_worker_functions = None
+
+
+def _set_worker_functions(objective_function, acceptance_criteria):
+    global _worker_functions
+    _worker_functions = (objective_function, acceptance_criteria)
+
+
+def _executor(processes, objective_function, acceptance_criteria):
+    return ProcessPoolExecutor(
+        max_workers=processes,
+        initializer=_set_worker_functions,
+        initargs=(objective_function, acceptance_criteria))
+
+
+def _seed_sequences(seed, number):
+    if seed is None:
+        seed = np.random.randint(2 ** 32)
+    return np.random.SeedSequence(seed).spawn(number)
+
+
+def _run_chain(algorithm, initial_array, lower_bound, seed_sequence, kwargs,
+               functions=None):
+    objective_function, acceptance_criteria = functions or _worker_functions
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        X = algorithm(objective_function=objective_function,
+                      initial_array=initial_array,
+                      acceptance_criteria=acceptance_criteria,
+                      lower_bound=lower_bound,
+                      rng=np.random.default_rng(seed_sequence),
+                      **kwargs)
+    return objective_function(X), X, kwargs.get('trace')
+
+
+def multi_start(objective_function,
+                initial_array,
+                algorithm=simulated_annealing,
+                number_of_chains=4,
+                processes=None,
+                seed=None,
+                acceptance_criteria=None,
+                lower_bound=-float('inf'),
+                time_limit=None,
+                deadline=None,
+                trace=None,
+                **kwargs):
+    """
+    Run independent chains of a heuristic algorithm in parallel and return the
+    best solution found
+
+    Each chain runs the algorithm from the initial array with its own
+    np.random.Generator. The generators are spawned from seed or, if it is
+    None, from a number drawn from the global numpy random state so that
+    seeding it gives reproducible results. The result does not depend on the
+    number of processes, only on the number of chains.
+
+    The objective_function and acceptance_criteria are sent to the worker
+    processes so must be picklable (as are those of
+    :py:mod:`lp_problem.objective_functions` and :py:mod:`validator`).
+
+    Parameters
+    ----------
+    algorithm : callable
+        a heuristic algorithm from conference_scheduler.heuristics
+    number_of_chains : int
+        the number of chains, which does not depend on the number of CPUs so
+        that a seeded search gives the same result on any machine
+    processes : int, optional
+        the number of worker processes, defaults to the number of CPUs. If 1,
+        the chains are run in this process.
+    seed : int, optional
+    time_limit : float, optional
+        the number of seconds after which all the chains stop
+    deadline : float, optional
+        a time.monotonic() value at which all the chains stop
+    trace : heuristics.Trace, optional
+        in which the counts and times of all the chains and the records of the
+        chain giving the best solution are kept
+    kwargs : keyword arguments
+        arguments for the algorithm
+    """
+    deadline = Budget(time_limit, deadline).deadline
+    if deadline is not None:
+        kwargs = {**kwargs, 'deadline': deadline}
+    if processes is None:
+        processes = os.cpu_count()
+    chain = partial(_run_chain, algorithm, np.array(initial_array),
+                    lower_bound)
+    seed_sequences = _seed_sequences(seed, number_of_chains)
+    chains_kwargs = [kwargs] * number_of_chains
+    if trace is not None:
+        # Each chain has its own trace, without the callback which may not be
+        # picklable
+        chains_kwargs = [
+            {**kwargs, 'trace': Trace(trace.records.maxlen, trace.every)}
+            for _ in range(number_of_chains)]
+
+    if processes == 1:
+        results = list(map(
+            partial(chain, functions=(objective_function,
+                                      acceptance_criteria)),
+            seed_sequences, chains_kwargs))
+    else:
+        with _executor(processes, objective_function,
+                       acceptance_criteria) as executor:
+            results = list(executor.map(chain, seed_sequences, chains_kwargs))
+
+    best = min(range(number_of_chains), key=lambda chain: results[chain][0])
+    best_energy, best_X, best_trace = results[best]
+    if trace is not None:
+        for _, _, chain_trace in results:
+            trace.merge(chain_trace)
+        for record in best_trace.records:
+            trace.records.append(record)
+            if trace.callback is not None:
+                trace.callback(record)
+        trace.accepted = best_trace.accepted
+
+    if lower_bound > -float('inf') and best_energy != lower_bound:
+        warnings.warn(f"Lower bound {lower_bound} not achieved by "
+                      f"{number_of_chains} chains")
+
+    return best_X
+
+
+def _run_replica(X, temperature, iterations, rng, lower_bound,
+                 acceptance_bound, deadline=None, traced=False,
+                 functions=None):
+    """
+    Run the Metropolis algorithm at a fixed temperature, until a deadline if
+    one is given
+
+    Returns the current and the best solution, their energies, the generator
+    with its new state, the number of accepted moves and, if traced, a Trace
+    of the evaluations.
+    """
+    objective_function, acceptance_criteria = functions or _worker_functions
+    X = np.array(X)
+    if acceptance_criteria is not None:
+        current_violations = acceptance_criteria(X)
+    objective_function, acceptance_criteria = incremental_functions(
+        X, objective_function, acceptance_criteria)
+    trace = Trace(maxlen=0) if traced else None
+    state = SearchState(
+        X, objective_function, acceptance_criteria, rng=rng, trace=trace)
+    best_X = state.snapshot()
+
+    current_energy = objective_function(X)
+    best_energy = current_energy
+    accepted_moves = 0
+
+    for _ in range(iterations):
+        if best_energy <= lower_bound or (
+                deadline is not None and time.monotonic() >= deadline):
+            break
+
+        move = state.random_move()
+        candidate_energy = state.value(
+            objective_function, move, current_energy)
+        delta = candidate_energy - current_energy
+
+        if delta < 0 or (
+            temperature > 0 and
+            rng.random() < acceptance_probability(delta, temperature)
+        ):
+            if acceptance_criteria is not None:
+                candidate_violations = state.value(
+                    acceptance_criteria, move, current_violations)
+                if candidate_violations > acceptance_bound:
+                    continue
+                current_violations = candidate_violations
+
+            state.apply(move)
+            accepted_moves += 1
+            current_energy = candidate_energy
+            if current_energy < best_energy:
+                best_energy = current_energy
+                best_X = state.snapshot()
+
+    return (state.to_array(), current_energy, state.to_array(best_X),
+            best_energy, rng, accepted_moves, trace)
+
+
+def parallel_tempering(objective_function,
+                       initial_array,
+                       temperatures=None,
+                       acceptance_criteria=None,
+                       lower_bound=-float('inf'),
+                       max_iterations=10 ** 3,
+                       exchange_interval=50,
+                       processes=None,
+                       seed=None,
+                       time_limit=None,
+                       deadline=None,
+                       max_stagnation=None,
+                       anytime=False,
+                       trace=None):
+    """
+    Implement a parallel tempering (replica exchange) algorithm
+
+    A replica of the solution is run at each temperature of the ladder, in
+    parallel, accepting a worse solution with probability
+    exp(-delta / temperature). Every exchange_interval iterations the
+    solutions of replicas at neighbouring temperatures are swapped with
+    probability min(1, exp((1 / T_i - 1 / T_j) * (E_i - E_j))) so that good
+    solutions move down to the low temperatures.
+
+    Has the following stopping conditions:
+
+    1. Maximum number of iterations (of each replica);
+    2. A known lower bound, a none is passed then this is not used;
+    3. A time_limit in seconds or a deadline (a time.monotonic() value), if
+       either is given;
+    4. max_stagnation exchanges without improvement, if it is given.
+
+    If anytime is True then a KeyboardInterrupt stops the search and the best
+    solution found so far is returned.
+
+    If acceptance_criteria (a callable) is not None then moves giving a
+    greater value of it than the initial array are not accepted.
+
+    Each replica has its own np.random.Generator spawned as in
+    :py:func:`multi_start`, and the functions must be picklable.
+
+    Parameters
+    ----------
+    temperatures : list, optional
+        defaults to 8 temperatures from 1 to 10 ** 4 in geometric progression
+    exchange_interval : int
+        the number of iterations between exchanges
+    processes : int, optional
+        the number of worker processes, defaults to the number of
+        temperatures. If 1, the replicas are run in this process.
+    seed : int, optional
+    trace : heuristics.Trace, optional
+        in which the progress is recorded at each exchange, with the current
+        energy and temperature of the coldest replica and the acceptance
+        ratio over all the replicas
+
+    Returns the best solution found.
+    """
+    if temperatures is None:
+        temperatures = np.geomspace(1, 10 ** 4, 8)
+    temperatures = np.sort(temperatures)
+    number_of_replicas = len(temperatures)
+    if processes is None:
+        processes = min(number_of_replicas, os.cpu_count())
+
+    X = np.array(initial_array)
+    acceptance_bound = None
+    if acceptance_criteria is not None:
+        acceptance_bound = acceptance_criteria(X)
+    *rngs, exchange_rng = [
+        np.random.default_rng(seed_sequence)
+        for seed_sequence in _seed_sequences(seed, number_of_replicas + 1)]
+    replicas = [X] * number_of_replicas
+    energies = [objective_function(X)] * number_of_replicas
+    best_X, best_energy = X, energies[0]
+
+    if processes == 1:
+        executor = None
+        run_replica = partial(
+            _run_replica,
+            functions=(objective_function, acceptance_criteria))
+        run = map
+    else:
+        executor = _executor(
+            processes, objective_function, acceptance_criteria)
+        run_replica = _run_replica
+        run = executor.map
+
+    budget = Budget(time_limit, deadline, max_stagnation)
+    iterations = 0
+    rounds = 0
+    accepted_moves = 0
+    try:
+        while (best_energy > lower_bound and
+               iterations < max_iterations and
+               not budget.exhausted(best_energy)):
+            if trace is not None:
+                trace.record(iterations, energies[0], best_energy,
+                             accepted_moves / number_of_replicas,
+                             temperatures[0])
+            steps = min(exchange_interval, max_iterations - iterations)
+            results = list(run(
+                run_replica, replicas, temperatures, [steps] * len(rngs),
+                rngs, [lower_bound] * len(rngs),
+                [acceptance_bound] * len(rngs),
+                [budget.deadline] * len(rngs),
+                [trace is not None] * len(rngs)))
+            iterations += steps
+
+            for replica, (X, energy, replica_best_X, replica_best_energy,
+                          rng, accepted, replica_trace) in enumerate(results):
+                replicas[replica] = X
+                energies[replica] = energy
+                rngs[replica] = rng
+                accepted_moves += accepted
+                if trace is not None:
+                    trace.merge(replica_trace)
+                if replica_best_energy < best_energy:
+                    best_X, best_energy = replica_best_X, replica_best_energy
+
+            for replica in range(rounds % 2, number_of_replicas - 1, 2):
+                other = replica + 1
+                exponent = (
+                    (1 / temperatures[replica] - 1 / temperatures[other]) *
+                    (energies[replica] - energies[other]))
+                if exponent >= 0 or exchange_rng.random() < np.exp(exponent):
+                    replicas[replica], replicas[other] = (
+                        replicas[other], replicas[replica])
+                    energies[replica], energies[other] = (
+                        energies[other], energies[replica])
+            rounds += 1
+    except KeyboardInterrupt:
+        if not anytime:
+            raise
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if trace is not None:
+        trace.record(iterations, energies[0], best_energy,
+                     accepted_moves / number_of_replicas, temperatures[0],
+                     force=True)
+
+    if lower_bound > -float('inf') and best_energy != lower_bound:
+        warnings.warn(f"Lower bound {lower_bound} not achieved after "
+                      f"{iterations} iterations")
+
+    return best_X
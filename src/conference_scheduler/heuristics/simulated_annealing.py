@@ -1,59 +1,137 @@
-from .utils import element_from_neighbourhood, get_initial_array
+from .utils import (
+    Budget, SearchState, incremental_functions, get_initial_array)
+from .cooling import ExponentialCooling, acceptance_probability
 import numpy as np
 import warnings
 
+
+__all__ = ['simulated_annealing']
+
+
 def simulated_annealing(objective_function,
                         initial_array,
                         initial_temperature=10 ** 4,
                         cooldown_rate=0.7,
                         acceptance_criteria=None,
                         lower_bound=-float('inf'),
-                        max_iterations=10 ** 3):
+                        max_iterations=10 ** 3,
+                        cooling_schedule=None,
+                        reheat_after=None,
+                        time_limit=None,
+                        deadline=None,
+                        max_stagnation=None,
+                        anytime=False,
+                        trace=None,
+                        rng=None):
     """
-    Implement a simulated annealing algorithm with exponential cooling
+    Implement a simulated annealing algorithm
+
+    The temperature is updated after each iteration by the cooling_schedule
+    (see :py:mod:`heuristics.cooling`). If it is None the temperature is
+    multiplied by cooldown_rate ** iterations.
+
+    If reheat_after is not None then the temperature is set back to the
+    initial_temperature when the best solution has not improved for that many
+    iterations. The cooling schedule is then given the number of iterations
+    since the reheat.
 
-    Has two stopping conditions:
+    Has the following stopping conditions:
 
     1. Maximum number of iterations;
-    2. A known lower bound, a none is passed then this is not used.
+    2. A known lower bound, a none is passed then this is not used;
+    3. A time_limit in seconds or a deadline (a time.monotonic() value), if
+       either is given;
+    4. max_stagnation iterations without improvement, if it is given.
+
+    If anytime is True then a KeyboardInterrupt stops the search and the best
+    solution found so far is returned.
+
+    If trace (a :py:class:`heuristics.Trace`) is not None then the progress
+    of the search and the evaluations are recorded in it.
 
     Note that starting with an initial_temperature corresponds to a hill
     climbing algorithm
+
+    Random numbers are drawn from rng (a np.random.Generator) if it is given
+    and from the global numpy random state otherwise.
     """
 
-    X = initial_array
+    X = np.array(initial_array)
     if acceptance_criteria is not None:
         acceptance_bound = acceptance_criteria(X)
-    best_X = X
+        current_violations = acceptance_bound
+    objective_function, acceptance_criteria = incremental_functions(
+        X, objective_function, acceptance_criteria)
+    state = SearchState(
+        X, objective_function, acceptance_criteria, rng=rng, trace=trace)
+    random = np.random if rng is None else rng
+    best_X = state.snapshot()
 
+    budget = Budget(time_limit, deadline, max_stagnation)
     iterations = 0
+    accepted_moves = 0
     current_energy = objective_function(X)
     best_energy = current_energy
     temperature = initial_temperature
+    if cooling_schedule is None:
+        cooling_schedule = ExponentialCooling(cooldown_rate)
+    cooling_schedule.start(initial_temperature, max_iterations)
+    last_improvement = 0
+    reheated_at = 0
+
+    try:
+        while (current_energy > lower_bound and
+               iterations <= max_iterations and
+               not budget.exhausted(best_energy)):
+
+            if trace is not None:
+                trace.record(iterations, current_energy, best_energy,
+                             accepted_moves, temperature)
+            iterations += 1
+            move = state.random_move()
+            candidate_energy = state.value(
+                objective_function, move, current_energy)
 
-    while current_energy > lower_bound and iterations <= max_iterations:
+            delta = candidate_energy - current_energy
 
-        iterations += 1
-        candidate = element_from_neighbourhood(X)
-        candidate_energy = objective_function(candidate)
+            if (candidate_energy < best_energy and
+                (acceptance_criteria is None or
+                 state.value(acceptance_criteria, move,
+                             current_violations) <= acceptance_bound)):
 
-        delta = candidate_energy - current_energy
+                best_energy = candidate_energy
+                best_X = state.snapshot(move)
+                last_improvement = iterations
 
-        if (candidate_energy < best_energy and
-            (acceptance_criteria is None or
-             acceptance_criteria(candidate) <= acceptance_bound)):
+            accepted = delta < 0 or (
+                temperature > 0 and
+                random.random() < acceptance_probability(delta, temperature))
+            if accepted:
+                if hasattr(acceptance_criteria, 'delta'):
+                    current_violations = state.value(
+                        acceptance_criteria, move, current_violations)
+                state.apply(move)
+                accepted_moves += 1
+                current_energy = candidate_energy
 
-            best_energy = candidate_energy
-            best_X = candidate
+            temperature = cooling_schedule(
+                temperature, iterations - reheated_at, accepted)
 
-        if delta < 0 or (temperature > 0 and
-                         np.random.random() < np.exp(-delta / temperature)):
-            X = candidate
-            current_energy = candidate_energy
+            if (reheat_after is not None and
+                    iterations - last_improvement >= reheat_after):
+                temperature = initial_temperature
+                last_improvement = iterations
+                reheated_at = iterations
+    except KeyboardInterrupt:
+        if not anytime:
+            raise
 
-        temperature *= (cooldown_rate) ** iterations
+    if trace is not None:
+        trace.record(iterations, current_energy, best_energy,
+                     accepted_moves, temperature, force=True)
 
     if lower_bound > -float('inf') and current_energy != lower_bound:
-        warnings.warn(f"Lower bound {lower_bound} not achieved after {max_iterations} iterations")
+        warnings.warn(f"Lower bound {lower_bound} not achieved after "
+                      f"{iterations} iterations")
 
-    return best_X
+    return state.to_array(best_X)
@@ -0,0 +1,135 @@
+from .utils import Budget, SearchState, incremental_functions
+import numpy as np
+import warnings
+
+
+__all__ = ['tabu_search']
+
+
+def tabu_search(objective_function,
+                initial_array,
+                lower_bound=-float('inf'),
+                acceptance_criteria=None,
+                max_iterations=10 ** 3,
+                neighbourhood_size=20,
+                tenure=5,
+                time_limit=None,
+                deadline=None,
+                max_stagnation=None,
+                anytime=False,
+                trace=None,
+                rng=None):
+    """
+    Implement a tabu search algorithm
+
+    At each iteration neighbourhood_size random moves are evaluated and the
+    best of them is applied, even if it is worse than the current solution.
+    The events moved and the slots they are moved to are then tabu for the
+    next tenure iterations: a move of a tabu event or into a tabu slot is only
+    considered if it gives a better solution than the best found so far
+    (aspiration).
+
+    Has the following stopping conditions:
+
+    1. Maximum number of iterations;
+    2. A known lower bound, a none is passed then this is not used;
+    3. A time_limit in seconds or a deadline (a time.monotonic() value), if
+       either is given;
+    4. max_stagnation iterations without improvement, if it is given.
+
+    If anytime is True then a KeyboardInterrupt stops the search and the best
+    solution found so far is returned.
+
+    If trace (a :py:class:`heuristics.Trace`) is not None then the progress
+    of the search and the evaluations are recorded in it.
+
+    If acceptance_criteria (a callable) is not None then moves giving a
+    greater value of it than the initial array are not considered.
+
+    Returns the best solution found. Random moves are drawn from rng (a
+    np.random.Generator) if it is given and from the global numpy random state
+    otherwise.
+    """
+
+    X = np.array(initial_array)
+    if acceptance_criteria is not None:
+        acceptance_bound = acceptance_criteria(X)
+        current_violations = acceptance_bound
+    objective_function, acceptance_criteria = incremental_functions(
+        X, objective_function, acceptance_criteria)
+    state = SearchState(
+        X, objective_function, acceptance_criteria, rng=rng, trace=trace)
+    best_X = state.snapshot()
+
+    m, n = X.shape
+    event_tabu_until = np.zeros(m, dtype=int)
+    slot_tabu_until = np.zeros(n, dtype=int)
+
+    budget = Budget(time_limit, deadline, max_stagnation)
+    iterations = 0
+    accepted_moves = 0
+    current_energy = objective_function(X)
+    best_energy = current_energy
+
+    try:
+        while (best_energy > lower_bound and
+               iterations <= max_iterations and
+               not budget.exhausted(best_energy)):
+
+            if trace is not None:
+                trace.record(iterations, current_energy, best_energy,
+                             accepted_moves)
+            iterations += 1
+            chosen = None
+            for _ in range(neighbourhood_size):
+                move = state.random_move()
+                candidate_energy = state.value(
+                    objective_function, move, current_energy)
+                if chosen is not None and candidate_energy >= chosen[1]:
+                    continue
+
+                events = [move.event]
+                slots = [move.new_slot]
+                if move.other_event is not None:
+                    events.append(move.other_event)
+                    slots.append(move.slot)
+                tabu = (np.any(event_tabu_until[events] >= iterations) or
+                        np.any(slot_tabu_until[slots] >= iterations))
+                if tabu and candidate_energy >= best_energy:
+                    continue
+
+                candidate_violations = None
+                if acceptance_criteria is not None:
+                    candidate_violations = state.value(
+                        acceptance_criteria, move, current_violations)
+                    if candidate_violations > acceptance_bound:
+                        continue
+
+                chosen = (move, candidate_energy, candidate_violations, events,
+                          slots)
+
+            if chosen is None:
+                continue
+
+            move, current_energy, current_violations, events, slots = chosen
+            state.apply(move)
+            accepted_moves += 1
+            event_tabu_until[events] = iterations + tenure
+            slot_tabu_until[slots] = iterations + tenure
+
+            if current_energy < best_energy:
+                best_energy = current_energy
+                best_X = state.snapshot()
+    except KeyboardInterrupt:
+        if not anytime:
+            raise
+
+    if trace is not None:
+        trace.record(iterations, current_energy, best_energy,
+                     accepted_moves, force=True)
+
+    if lower_bound > -float('inf') and best_energy != lower_bound:
+        warnings.warn(f"Lower bound {lower_bound} not achieved after "
+                      f"{iterations} iterations")
+
+    return state.to_array(best_X)
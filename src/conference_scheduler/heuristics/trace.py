@@ -0,0 +1,104 @@
+"""Telemetry for the heuristic algorithms
+
+A :py:class:`Trace` passed to an algorithm as trace records the progress of
+the search in a ring buffer and the number of, and time spent on, the moves
+and the evaluations of the objective function and of the acceptance criteria
+(usually :py:class:`validator.ViolationTracker`).
+"""
+from collections import Counter, deque
+from typing import NamedTuple
+import time
+
+
+__all__ = ['TraceRecord', 'Trace']
+
+
+class TraceRecord(NamedTuple):
+    iteration: int
+    elapsed: float
+    current_energy: float
+    best_energy: float
+    acceptance_ratio: float
+    temperature: float
+    objective_rate: float
+    violations_rate: float
+
+
+class Trace:
+    """
+    A ring buffer of the progress of a heuristic search
+
+    Each record gives the iteration, the seconds since the trace was created,
+    the current and best energy, the ratio of accepted moves to iterations so
+    far, the temperature (None for algorithms without one) and the number of
+    evaluations per second of the objective function and of the acceptance
+    criteria.
+
+    The counts and times attributes give the number of and the seconds spent
+    on each kind of work: 'moves' (drawing and applying moves), 'objective',
+    'violations' and, for :py:func:`large_neighbourhood_search`, 'solver'.
+
+    Parameters
+    ----------
+    maxlen : int
+        the number of records kept, the oldest are discarded
+    every : int
+        the number of iterations between records
+    callback : callable, optional
+        called with each TraceRecord as it is recorded
+    """
+    def __init__(self, maxlen=10 ** 4, every=1, callback=None):
+        self.records = deque(maxlen=maxlen)
+        self.every = every
+        self.callback = callback
+        self.counts = Counter()
+        self.times = Counter()
+        self.accepted = 0
+        self.next_iteration = 0
+        self.start_time = time.perf_counter()
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.start_time
+
+    def timed(self, kind, number, function, *args):
+        """
+        Return function(*args), counting number of kind of work and the time
+        it takes
+        """
+        start = time.perf_counter()
+        result = function(*args)
+        self.times[kind] += time.perf_counter() - start
+        self.counts[kind] += number
+        return result
+
+    def merge(self, other):
+        """Add the counts and times of another trace"""
+        self.counts.update(other.counts)
+        self.times.update(other.times)
+
+    def record(self, iteration, current_energy, best_energy, accepted,
+               temperature=None, force=False):
+        """
+        Record the state of the search every so many iterations, or if force
+        is True, given the number of moves accepted so far
+        """
+        self.accepted = accepted
+        if not force and iteration < self.next_iteration:
+            return
+        if self.records and self.records[-1].iteration == iteration:
+            return
+        self.next_iteration = iteration + self.every
+        elapsed = self.elapsed
+        record = TraceRecord(
+            iteration=iteration,
+            elapsed=elapsed,
+            current_energy=current_energy,
+            best_energy=best_energy,
+            acceptance_ratio=accepted / iteration if iteration else 0,
+            temperature=temperature,
+            objective_rate=self.counts['objective'] / elapsed,
+            violations_rate=self.counts['violations'] / elapsed)
+        self.records.append(record)
+        if self.callback is not None:
+            self.callback(record)
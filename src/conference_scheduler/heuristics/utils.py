@@ -1,4 +1,64 @@
+from typing import NamedTuple
+import time
 import numpy as np
+from conference_scheduler.lp_problem import utils as lpu
+
+
+__all__ = [
+    'Move', 'Moves', 'moves_from_list', 'element_from_neighbourhood',
+    'get_initial_array', 'Assignment', 'array_to_assignment',
+    'assignment_to_array', 'get_greedy_initial_array',
+    'get_matching_initial_array', 'random_move', 'apply_move', 'reverse_move',
+    'is_assignment_array', 'incremental_functions', 'candidate_value',
+    'candidate_values', 'update_state', 'SearchState', 'Budget'
+]
+
+
+class Move(NamedTuple):
+    """
+    Moving an event from its slot to a new slot
+
+    If other_event is not None it is the event in the new slot, which is moved
+    to the slot of the event (a swap).
+    """
+    event: int
+    slot: int
+    new_slot: int
+    other_event: int = None
+
+
+class Moves(NamedTuple):
+    """
+    A batch of moves as arrays, with an other_event of -1 for moves to an
+    empty slot
+    """
+    event: np.ndarray
+    slot: np.ndarray
+    new_slot: np.ndarray
+    other_event: np.ndarray
+
+    def __len__(self):
+        return len(self.event)
+
+    def move(self, index):
+        """Return a move of the batch as a Move"""
+        other_event = int(self.other_event[index])
+        return Move(
+            int(self.event[index]), int(self.slot[index]),
+            int(self.new_slot[index]),
+            None if other_event == -1 else other_event)
+
+
+def moves_from_list(moves):
+    """
+    Return a list of Move as Moves
+    """
+    fields = np.array([
+        (move.event, move.slot, move.new_slot,
+         -1 if move.other_event is None else move.other_event)
+        for move in moves], dtype=np.int64).reshape(len(moves), 4)
+    return Moves(*fields.T)
+
 
 def element_from_neighbourhood(X):
     """
@@ -43,3 +103,512 @@ def get_initial_array(events, slots, seed=None):
         X[i, i] = 1
     np.random.shuffle(X)
     return X
+
+
+class Assignment:
+    """
+    A schedule in which every event is in exactly one slot and every slot has
+    at most one event
+
+    It is held as the slot of each event (slot_of) and the event in each slot
+    (event_in, -1 for an empty slot) so that moves are drawn, applied and
+    undone in place in constant time.
+    """
+    def __init__(self, slot_of, number_of_slots):
+        self.slot_of = np.array(slot_of, dtype=np.int32)
+        self.event_in = np.full(number_of_slots, -1, dtype=np.int32)
+        self.event_in[self.slot_of] = np.arange(
+            len(self.slot_of), dtype=np.int32)
+
+    @property
+    def shape(self):
+        return len(self.slot_of), len(self.event_in)
+
+    def copy(self):
+        assignment = Assignment.__new__(Assignment)
+        assignment.slot_of = self.slot_of.copy()
+        assignment.event_in = self.event_in.copy()
+        return assignment
+
+    def random_move(self, rng=None):
+        """
+        Return a random Move, drawing the same random numbers as
+        :py:func:`element_from_neighbourhood` for the array of the assignment
+
+        The numbers are drawn from rng (a np.random.Generator) if it is given
+        and from the global numpy random state otherwise.
+        """
+        m, n = self.shape
+
+        event = _random_integer(m, rng)
+        slot = int(self.slot_of[event])
+
+        new_slot = _random_integer(n - 1, rng)
+        if new_slot >= slot:
+            new_slot += 1
+
+        other_event = int(self.event_in[new_slot])
+        if other_event == -1:
+            other_event = None
+        return Move(int(event), slot, int(new_slot), other_event)
+
+    def random_moves(self, number, rng=None):
+        """
+        Return a batch of random moves as Moves
+
+        The numbers are drawn from rng (a np.random.Generator) if it is given
+        and from the global numpy random state otherwise.
+        """
+        m, n = self.shape
+        if rng is None:
+            events = np.random.randint(m, size=number)
+            new_slots = np.random.randint(n - 1, size=number)
+        else:
+            events = rng.integers(m, size=number)
+            new_slots = rng.integers(n - 1, size=number)
+
+        slots = self.slot_of[events].astype(np.int64)
+        new_slots += new_slots >= slots
+        return Moves(events, slots, new_slots,
+                     self.event_in[new_slots].astype(np.int64))
+
+    def apply(self, move):
+        """Apply a Move in place"""
+        event, slot, new_slot, other_event = move
+        self.slot_of[event] = new_slot
+        self.event_in[new_slot] = event
+        if other_event is None:
+            self.event_in[slot] = -1
+        else:
+            self.slot_of[other_event] = slot
+            self.event_in[slot] = other_event
+
+    def undo(self, move):
+        """Undo a Move applied in place"""
+        self.apply(reverse_move(move))
+
+
+def array_to_assignment(X):
+    """
+    Convert a schedule from array to Assignment form
+
+    Raises a ValueError if X is not an assignment array (see
+    :py:func:`is_assignment_array`).
+    """
+    if not is_assignment_array(X):
+        raise ValueError(
+            'Every event must be in exactly one slot and every slot must '
+            'have at most one event')
+    X = np.asarray(X)
+    return Assignment(np.nonzero(X)[1], X.shape[1])
+
+
+def assignment_to_array(assignment, dtype=np.int8):
+    """
+    Convert a schedule from Assignment to array form
+    """
+    X = np.zeros(assignment.shape, dtype=dtype)
+    X[np.arange(len(assignment.slot_of)), assignment.slot_of] = 1
+    return X
+
+
+def get_greedy_initial_array(events, slots, model=None):
+    """
+    Obtain an initial array by scheduling the most constrained events first
+
+    An event has as options the free slots for which it is available and
+    which are not concurrent with the slot of a conflicting event already
+    scheduled. At each step the event with the fewest options (and then the
+    most conflicting events) is scheduled in the option which removes the
+    fewest options of the other events, preferring the smallest slot with
+    enough capacity for its demand or else the largest slot. An event without
+    options is scheduled in a free slot breaking as few of those conditions as
+    possible.
+    """
+    if model is None:
+        model = lpu.ConferenceModel(events=events, slots=slots)
+    number_of_events, number_of_slots = model.shape
+    available = lpu.slot_availability_array(events, slots, model=model) != 0
+    conflicts = lpu.conflict_array(events, model=model)
+    conflicts |= conflicts.T
+    concurrent = lpu.concurrency_array(slots, model=model)
+    pairs = model.slot_intervals.pairs()
+    capacities = model.capacities
+
+    free = np.ones(number_of_slots, dtype=bool)
+    clashing = np.zeros((number_of_events, number_of_slots), dtype=bool)
+    options = available.copy()
+    number_of_options = options.sum(axis=1)
+    number_of_events_with_option = options.sum(axis=0)
+    tie_break = number_of_events - conflicts.sum(axis=1)
+    unscheduled = np.ones(number_of_events, dtype=bool)
+
+    scheduled = np.iinfo(np.int64).max
+    X = np.zeros((number_of_events, number_of_slots))
+    for _ in range(number_of_events):
+        priority = np.where(
+            unscheduled,
+            number_of_options * (number_of_events + 1) + tie_break,
+            scheduled)
+        event = np.argmin(priority)
+        unscheduled[event] = False
+        number_of_events_with_option -= options[event]
+
+        candidates = options[event]
+        for fallback in (
+            free & available[event],
+            free & ~clashing[event],
+            free,
+            available[event],
+            np.ones(number_of_slots, dtype=bool),
+        ):
+            if candidates.any():
+                break
+            candidates = fallback
+        candidates = np.flatnonzero(candidates)
+
+        # The options lost by the other events for each candidate slot:
+        # the slot itself and the concurrent slots for conflicting events
+        others = np.flatnonzero(unscheduled & conflicts[event])
+        options_of_others = options[others]
+        lost = number_of_events_with_option.copy()
+        if len(others) > 0:
+            weights = options_of_others.sum(axis=0)
+            lost += np.bincount(
+                pairs[:, 0], weights=weights[pairs[:, 1]],
+                minlength=number_of_slots).astype(np.int64)
+            lost += np.bincount(
+                pairs[:, 1], weights=weights[pairs[:, 0]],
+                minlength=number_of_slots).astype(np.int64)
+        lost = lost[candidates]
+        fits = capacities[candidates] >= model.demands[event]
+        fit = np.where(
+            fits, capacities[candidates], -capacities[candidates])
+        slot = candidates[np.lexsort((fit, ~fits, lost))[0]]
+
+        X[event, slot] = 1
+        free[slot] = False
+        number_of_options -= options[:, slot]
+        options[:, slot] = False
+        number_of_events_with_option[slot] = 0
+        options_of_others[:, slot] = False
+        removed = options_of_others & concurrent[slot]
+        number_of_events_with_option -= removed.sum(axis=0)
+        number_of_options[others] -= removed.sum(axis=1)
+        clashing[others] |= concurrent[slot]
+        options[others] = options_of_others & ~concurrent[slot]
+    return X
+
+
+def get_matching_initial_array(events, slots, model=None):
+    """
+    Obtain an initial array from a maximum matching of events to slots for
+    which they are available
+
+    Events which are not matched are scheduled in the remaining free slots
+    (or in the first slot if there are none).
+    """
+    if model is None:
+        model = lpu.ConferenceModel(events=events, slots=slots)
+    number_of_events, number_of_slots = model.shape
+    availability = lpu.slot_availability_array(events, slots, model=model)
+    matching = lpu.maximum_matching(availability != 0)
+
+    free = np.ones(number_of_slots, dtype=bool)
+    free[matching[matching >= 0]] = False
+    unmatched = np.flatnonzero(matching == -1)
+    free_slots = np.flatnonzero(free)[:len(unmatched)]
+    matching[unmatched[:len(free_slots)]] = free_slots
+    matching[matching == -1] = 0
+
+    X = np.zeros((number_of_events, number_of_slots))
+    X[np.arange(number_of_events), matching] = 1
+    return X
+
+
+def _random_integer(high, rng=None):
+    if rng is None:
+        return np.random.randint(high)
+    return int(rng.integers(high))
+
+
+def random_move(X, rng=None):
+    """
+    Return a random Move of the neighbourhood of X
+
+    The random numbers drawn are the same as those of
+    :py:func:`element_from_neighbourhood` so that applying the move to X gives
+    the same array. They are drawn from rng (a np.random.Generator) if it is
+    given and from the global numpy random state otherwise.
+    """
+    m, n = X.shape
+
+    event = _random_integer(m, rng)
+    slot = np.where(X[event, :] == 1)[0][0]
+
+    new_slot = _random_integer(n - 1, rng)
+    if new_slot >= slot:
+        new_slot += 1
+    scheduled_events_in_slot = np.where(X[:, new_slot] == 1)[0]
+
+    other_event = None
+    if len(scheduled_events_in_slot) > 0:
+        other_event = int(scheduled_events_in_slot[0])
+    return Move(int(event), int(slot), int(new_slot), other_event)
+
+
+def apply_move(X, move):
+    """
+    Apply a Move to an array in place
+    """
+    if move.other_event is None:
+        X[move.event] = 0
+        X[move.event, move.new_slot] = 1
+    else:
+        swap_rows = [move.event, move.other_event]
+        X[swap_rows] = X[swap_rows[::-1]]
+
+
+def reverse_move(move):
+    """
+    Return the Move undoing a Move
+    """
+    return move._replace(slot=move.new_slot, new_slot=move.slot)
+
+
+def is_assignment_array(X):
+    """
+    Return whether every event of an array is scheduled in exactly one slot
+    and every slot has at most one event: the arrays which the moves keep as
+    such.
+    """
+    X = np.asarray(X)
+    return (
+        X.ndim == 2 and
+        bool(np.all((X == 0) | (X == 1))) and
+        bool(np.all(X.sum(axis=1) == 1)) and
+        bool(np.all(X.sum(axis=0) <= 1)))
+
+
+def incremental_functions(X, *functions):
+    """
+    Return the functions with which to evaluate moves from X
+
+    Functions with a delta method (see :py:class:`validator.ViolationTracker`)
+    are set to the state X if X is an assignment array and are otherwise
+    replaced by a function without one.
+    """
+    assignment = is_assignment_array(X)
+    incremental = []
+    for function in functions:
+        if hasattr(function, 'delta'):
+            if assignment:
+                function.reset(X)
+            else:
+                function = _without_delta(function)
+        incremental.append(function)
+    return incremental
+
+
+def _without_delta(function):
+    def evaluate(X):
+        return function(X)
+    return evaluate
+
+
+def candidate_value(function, X, move, value):
+    """
+    Return the value of a function for X after a move, given its current
+    value
+
+    Functions with a delta method are evaluated incrementally and others by
+    applying the move to X and restoring it.
+    """
+    if hasattr(function, 'delta'):
+        return value + function.delta(move)
+    rows = [move.event]
+    if move.other_event is not None:
+        rows.append(move.other_event)
+    saved = X[rows]
+    apply_move(X, move)
+    candidate = function(X)
+    X[rows] = saved
+    return candidate
+
+
+def candidate_values(function, X, moves, value):
+    """
+    Return the values of a function for X after each of a batch of Moves,
+    given its current value
+
+    Functions with a deltas method are evaluated for the whole batch at once
+    and others one move at a time as for :py:func:`candidate_value`.
+    """
+    if hasattr(function, 'deltas'):
+        return value + function.deltas(moves)
+    return np.array([
+        candidate_value(function, X, moves.move(index), value)
+        for index in range(len(moves))])
+
+
+def update_state(function, move):
+    """
+    Apply a move to the state of a function with a delta method
+    """
+    if hasattr(function, 'delta'):
+        function.apply(move)
+
+
+class SearchState:
+    """
+    The current schedule of a neighbourhood search
+
+    Moves are drawn from an Assignment if every event of the initial array is
+    in exactly one slot and every slot has at most one event. The array itself
+    is only kept up to date if it is needed: for arrays which are not
+    assignments or to evaluate a function without a delta method.
+
+    Parameters
+    ----------
+    X : np.array
+        the initial schedule in array form, which is modified in place
+    functions : callable
+        the functions evaluated for moves, as given by
+        :py:func:`incremental_functions`
+    rng : np.random.Generator, optional
+        from which random moves are drawn. If None, the global numpy random
+        state is used.
+    trace : heuristics.Trace, optional
+        which counts and times the moves and the evaluations of the first
+        function (the objective function) and of the second (the acceptance
+        criteria)
+    """
+    def __init__(self, X, *functions, rng=None, trace=None):
+        self.X = X
+        self.rng = rng
+        self.trace = trace
+        self.kinds = dict(zip(map(id, functions), ('objective', 'violations')))
+        self.functions = [
+            function for function in functions if function is not None]
+        self.assignment = None
+        if is_assignment_array(X):
+            self.assignment = array_to_assignment(X)
+        self.array_needed = self.assignment is None or not all(
+            hasattr(function, 'delta') for function in self.functions)
+
+    def random_move(self):
+        if self.trace is not None:
+            return self.trace.timed('moves', 1, self._random_move)
+        return self._random_move()
+
+    def _random_move(self):
+        if self.assignment is None:
+            return random_move(self.X, self.rng)
+        return self.assignment.random_move(self.rng)
+
+    def random_moves(self, number):
+        """Return a batch of random moves as Moves"""
+        if self.trace is not None:
+            return self.trace.timed(
+                'moves', number, self._random_moves, number)
+        return self._random_moves(number)
+
+    def _random_moves(self, number):
+        if self.assignment is None:
+            return moves_from_list([
+                random_move(self.X, self.rng) for _ in range(number)])
+        return self.assignment.random_moves(number, self.rng)
+
+    def value(self, function, move, value):
+        """Return the value of a function after a move"""
+        if self.trace is not None:
+            return self.trace.timed(
+                self.kinds[id(function)], 1, candidate_value, function,
+                self.X, move, value)
+        return candidate_value(function, self.X, move, value)
+
+    def values(self, function, moves, value):
+        """Return the values of a function after each of a batch of moves"""
+        if self.trace is not None:
+            return self.trace.timed(
+                self.kinds[id(function)], len(moves), candidate_values,
+                function, self.X, moves, value)
+        return candidate_values(function, self.X, moves, value)
+
+    def apply(self, move):
+        """Apply a move to the schedule and to the state of the functions"""
+        if self.trace is not None:
+            # The moves are counted when drawn
+            self.trace.timed('moves', 0, self._apply, move)
+        else:
+            self._apply(move)
+
+    def _apply(self, move):
+        if self.assignment is not None:
+            self.assignment.apply(move)
+        if self.array_needed:
+            apply_move(self.X, move)
+        for function in self.functions:
+            update_state(function, move)
+
+    def snapshot(self, move=None):
+        """Return a copy of the schedule, after a move if one is given"""
+        if self.assignment is None:
+            snapshot = self.X.copy()
+            if move is not None:
+                apply_move(snapshot, move)
+        else:
+            snapshot = self.assignment.copy()
+            if move is not None:
+                snapshot.apply(move)
+        return snapshot
+
+    def to_array(self, snapshot=None):
+        """Return the schedule, or a snapshot of it, in array form"""
+        if snapshot is None:
+            if self.array_needed:
+                return self.X
+            snapshot = self.assignment
+        if isinstance(snapshot, Assignment):
+            return assignment_to_array(snapshot, dtype=self.X.dtype)
+        return snapshot
+
+
+class Budget:
+    """
+    The time and the number of iterations without improvement allowed for a
+    search
+
+    Parameters
+    ----------
+    time_limit : float, optional
+        the number of seconds from now after which to stop
+    deadline : float, optional
+        a time.monotonic() value at which to stop
+    max_stagnation : int, optional
+        the number of iterations without improvement of the best energy after
+        which to stop
+    """
+    def __init__(self, time_limit=None, deadline=None, max_stagnation=None):
+        if time_limit is not None:
+            end = time.monotonic() + time_limit
+            deadline = end if deadline is None else min(deadline, end)
+        self.deadline = deadline
+        self.max_stagnation = max_stagnation
+        self.best_energy = None
+        self.stagnation = 0
+
+    def exhausted(self, best_energy):
+        """
+        Return whether to stop, given the best energy found so far, which is
+        called once per iteration
+        """
+        if self.best_energy is None or best_energy < self.best_energy:
+            self.best_energy = best_energy
+            self.stagnation = 0
+        else:
+            self.stagnation += 1
+        return (
+            (self.max_stagnation is not None and
+             self.stagnation >= self.max_stagnation) or
+            (self.deadline is not None and time.monotonic() >= self.deadline))
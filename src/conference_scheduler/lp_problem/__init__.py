@@ -1,2 +1,3 @@
 from .utils import *
 from .constraints import *
+from .matrix import *
@@ -1,46 +1,63 @@
 import itertools as it
-from conference_scheduler.resources import Shape, Constraint
+import numpy as np
+from conference_scheduler.resources import Constraint
 from conference_scheduler.lp_problem import utils as lpu
 
 
-def _schedule_all_events(events, slots, X, summation_type=None, **kwargs):
+def _schedule_all_events(
+    events, slots, X, summation_type=None, model=None, **kwargs
+):
 
-    shape = Shape(len(events), len(slots))
+    if model is None:
+        model = lpu.ConferenceModel(events=events, slots=slots)
+    shape = model.shape
     summation = lpu.summation_functions[summation_type]
 
     label = 'Event either not scheduled or scheduled multiple times'
     for event in range(shape.events):
         yield Constraint(
             f'{label} - event: {event}',
-            summation(X[event, slot] for slot in range(shape.slots)) == 1
+            summation(
+                X[event, slot] for slot in range(shape.slots)
+                if lpu.is_variable(X, (event, slot))
+            ) == 1
         )
 
 
-def _max_one_event_per_slot(events, slots, X, summation_type=None, **kwargs):
+def _max_one_event_per_slot(
+    events, slots, X, summation_type=None, model=None, **kwargs
+):
 
-    shape = Shape(len(events), len(slots))
+    if model is None:
+        model = lpu.ConferenceModel(events=events, slots=slots)
+    shape = model.shape
     summation = lpu.summation_functions[summation_type]
 
     label = 'Slot with multiple events scheduled'
     for slot in range(shape.slots):
-        yield Constraint(
-            f'{label} - slot: {slot}',
-            summation(X[(event, slot)] for event in range(shape.events)) <= 1
-        )
+        terms = [
+            X[(event, slot)] for event in range(shape.events)
+            if lpu.is_variable(X, (event, slot))
+        ]
+        if isinstance(X, lpu.SparseVariables) and len(terms) == 0:
+            continue
+        yield Constraint(f'{label} - slot: {slot}', summation(terms) <= 1)
 
 
-def _events_available_in_scheduled_slot(events, slots, X, **kwargs):
+def _events_available_in_scheduled_slot(
+    events, slots, X, model=None, **kwargs
+):
     """
     Constraint that ensures that an event is scheduled in slots for which it is
     available
     """
-    slot_availability_array = lpu.slot_availability_array(slots=slots,
-                                                          events=events)
+    slot_availability_array = lpu.slot_availability_array(
+        slots=slots, events=events, model=model)
 
     label = 'Event scheduled when not available'
     for row, event in enumerate(slot_availability_array):
         for col, availability in enumerate(event):
-            if availability == 0:
+            if availability == 0 and lpu.is_variable(X, (row, col)):
                 yield Constraint(
                     f'{label} - event: {row}, slot: {col}',
                     X[row, col] <= availability
@@ -48,22 +65,29 @@ def _events_available_in_scheduled_slot(events, slots, X, **kwargs):
 
 
 def _events_available_during_other_events(
-    events, slots, X, summation_type=None, **kwargs
+    events, slots, X, summation_type=None, model=None, **kwargs
 ):
     """
     Constraint that ensures that an event is not scheduled at the same time as
     another event for which it is unavailable. Unavailability of events is
     either because it is explicitly defined or because they share a tag.
     """
+    if model is None:
+        model = lpu.ConferenceModel(events=events, slots=slots)
     summation = lpu.summation_functions[summation_type]
-    event_availability_array = lpu.event_availability_array(events)
+    event_availability_array = lpu.event_availability_array(
+        events, model=model)
 
     label = 'Event clashes with another event'
-    for slot1, slot2 in lpu.concurrent_slots(slots):
+    for slot1, slot2 in lpu.concurrent_slots(slots, model=model):
         for row, event in enumerate(event_availability_array):
-            if events[row].unavailability:
+            if model.event_has_unavailability[row]:
                 for col, availability in enumerate(event):
-                    if availability == 0:
+                    if (
+                        availability == 0 and
+                        lpu.is_variable(X, (row, slot1)) and
+                        lpu.is_variable(X, (col, slot2))
+                    ):
                         yield Constraint(
                             f'{label} - event: {row} and event: {col}',
                             summation(
@@ -72,34 +96,128 @@ def _events_available_during_other_events(
                         )
 
 
+def _events_available_during_other_events_by_clique(
+    events, slots, X, summation_type=None, model=None, **kwargs
+):
+    """
+    An aggregated form of :py:func:`_events_available_during_other_events`
+    forbidding exactly the same pairs of variables.
+
+    The pairs of events constrained in both orders (see
+    :py:func:`utils.clash_array`) and the concurrent slots are both covered by
+    cliques and, for each pair of an event clique and a slot clique, at most
+    one of the events can be scheduled in one of the slots. For the pairs of
+    events constrained in one order only, an event scheduled in a slot
+    excludes the other event from all of the later concurrent slots.
+    """
+    if model is None:
+        model = lpu.ConferenceModel(events=events, slots=slots)
+    summation = lpu.summation_functions[summation_type]
+    clashes = lpu.clash_array(events, model=model)
+    event_cliques, slot_cliques = (
+        [clique.tolist() for clique in cliques]
+        for cliques in model.clash_cliques())
+
+    label = 'Event clashes with another event'
+    for event_clique in event_cliques:
+        for slot_clique in slot_cliques:
+            terms = [
+                X[event, slot]
+                for event in event_clique for slot in slot_clique
+                if lpu.is_variable(X, (event, slot))
+            ]
+            if len(terms) > 1:
+                yield Constraint(
+                    f'{label} - events: {event_clique} '
+                    f'and slots: {slot_clique}',
+                    summation(terms) <= 1
+                )
+
+    one_way = np.argwhere(clashes & ~clashes.T).tolist()
+    later = lpu.later_concurrent_slots(slots, model=model)
+    for slot, later_slots in enumerate(later):
+        for event, other_event in one_way:
+            if not lpu.is_variable(X, (event, slot)):
+                continue
+            terms = [
+                X[other_event, other_slot] for other_slot in later_slots
+                if lpu.is_variable(X, (other_event, other_slot))
+            ]
+            if len(terms) > 0:
+                yield Constraint(
+                    f'{label} - event: {event} in slot: {slot} '
+                    f'and event: {other_event}',
+                    summation([X[event, slot]] + terms) <= 1
+                )
+
+
+clash_constraints = {
+    'pairwise': _events_available_during_other_events,
+    'clique': _events_available_during_other_events_by_clique,
+}
+
+
 def _upper_bound_on_event_overflow(
-    events, slots, X, beta, summation_type=None, **kwargs
+    events, slots, X, beta, summation_type=None, model=None, **kwargs
 ):
     """
     This is an artificial constraint that is used by the objective function
     aiming to minimise the maximum overflow in a slot.
+
+    As at most one event is scheduled in each slot, the overflow of a slot is
+    the sum of demand * X over its column and there is one constraint for
+    each slot that is not dominated by the slot with the smallest capacity.
     """
+    if model is None:
+        model = lpu.ConferenceModel(events=events, slots=slots)
+    shape = model.shape
+    summation = lpu.summation_functions[summation_type]
+    exists = np.array([
+        lpu.is_variable(X, (row, col))
+        for row in range(shape.events) for col in range(shape.slots)
+    ], dtype=bool).reshape(shape)
+    demands = model.demands.tolist()
+    capacities = model.capacities.tolist()
+
     label = 'Artificial upper bound constraint'
-    for row, event in enumerate(events):
-        for col, slot in enumerate(slots):
-            yield Constraint(
-                f'{label} - slot: {col} and event: {row}',
-                event.demand * X[row, col] - slot.capacity <= beta)
+    for col in lpu.overflow_slots(
+        events, slots, exists=exists, model=model
+    ).tolist():
+        yield Constraint(
+            f'{label} - slot: {col}',
+            summation(
+                demand * X[row, col] for row, demand in enumerate(demands)
+                if exists[row, col]
+            ) - capacities[col] <= beta)
 
 
-def all_constraints(events, slots, X, beta=None, summation_type=None):
+def all_constraints(
+    events, slots, X, beta=None, summation_type=None, model=None,
+    clashes='pairwise'
+):
+    """
+    Yield all the constraints of the problem
+
+    The clash constraints are either given for every pair of conflicting
+    events (clashes='pairwise') or aggregated over cliques of conflicting
+    events and concurrent slots (clashes='clique'). Both forbid the same
+    schedules.
+    """
+    if model is None:
+        model = lpu.ConferenceModel(events=events, slots=slots)
     kwargs = {
         'events': events,
         'slots': slots,
         'X': X,
         'beta': beta,
-        'summation_type': summation_type
+        'summation_type': summation_type,
+        'model': model
     }
     generators = [
         _schedule_all_events,
         _max_one_event_per_slot,
         _events_available_in_scheduled_slot,
-        _events_available_during_other_events,
+        clash_constraints[clashes],
     ]
 
     if beta is not None:
@@ -0,0 +1,516 @@
+"""Build the constraints of the problem directly as sparse matrices
+
+Each function here mirrors a constraint generator in
+:py:mod:`conference_scheduler.lp_problem.constraints`, giving the same rows in
+the same order, but computes them from the arrays of a ConferenceModel rather
+than building a pulp expression for each constraint.
+"""
+from typing import NamedTuple
+import numpy as np
+import pulp
+from conference_scheduler.lp_problem import utils as lpu
+
+
+class ConstraintMatrix(NamedTuple):
+    """
+    Constraints in coordinate (COO) form
+
+    Constraint i is lower[i] <= sum_j A[i, j] x_j <= upper[i] where
+    A[rows[k], columns[k]] = values[k]
+    """
+    rows: np.ndarray
+    columns: np.ndarray
+    values: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+
+
+def _block(rows, columns, values, lower, upper):
+    return ConstraintMatrix(
+        np.asarray(rows, dtype=np.int64),
+        np.asarray(columns, dtype=np.int64),
+        np.asarray(values, dtype=float),
+        np.asarray(lower, dtype=float),
+        np.asarray(upper, dtype=float))
+
+
+def variable_columns(shape, availability=None):
+    """
+    Return an E by S array giving the column of the variable for each event
+    and slot pair
+
+    Pairs without a variable (those with zero availability if an
+    availability array is given) have column -1. Columns are numbered in the
+    same order as the keys of :py:func:`utils.variables`.
+    """
+    if availability is None:
+        exists = np.ones(shape, dtype=bool)
+    else:
+        exists = np.asarray(availability) != 0
+    columns = np.full(shape, -1, dtype=np.int64)
+    columns[exists] = np.arange(np.count_nonzero(exists))
+    return columns
+
+
+def _schedule_all_events(model, columns, **kwargs):
+    events, slots = np.nonzero(columns >= 0)
+    return _block(
+        rows=events,
+        columns=columns[events, slots],
+        values=np.ones(len(events)),
+        lower=np.ones(model.shape.events),
+        upper=np.ones(model.shape.events))
+
+
+def _max_one_event_per_slot(model, columns, **kwargs):
+    exists = columns >= 0
+    used = exists.any(axis=0)
+    slot_rows = np.cumsum(used) - 1
+    events, slots = np.nonzero(exists)
+    number_of_rows = np.count_nonzero(used)
+    return _block(
+        rows=slot_rows[slots],
+        columns=columns[events, slots],
+        values=np.ones(len(events)),
+        lower=np.full(number_of_rows, -np.inf),
+        upper=np.ones(number_of_rows))
+
+
+def _events_available_in_scheduled_slot(model, columns, **kwargs):
+    availability = lpu.slot_availability_array(
+        model.events, model.slots, model=model)
+    cells = columns[(availability == 0) & (columns >= 0)]
+    return _block(
+        rows=np.arange(len(cells)),
+        columns=cells,
+        values=np.ones(len(cells)),
+        lower=np.full(len(cells), -np.inf),
+        upper=np.zeros(len(cells)))
+
+
+def _pair_block(first, second):
+    """Return the rows first + second <= 1 for arrays of columns"""
+    number_of_rows = len(first)
+    return _block(
+        rows=np.repeat(np.arange(number_of_rows), 2),
+        columns=np.column_stack((first, second)).ravel(),
+        values=np.ones(2 * number_of_rows),
+        lower=np.full(number_of_rows, -np.inf),
+        upper=np.ones(number_of_rows))
+
+
+def _cell_pairs(columns, pairs):
+    """
+    Return the columns of the variables of every pair of events in every pair
+    of slots, ordered by pair of slots and then by pair of events
+    """
+    slots, events = np.nonzero(columns.T >= 0)
+    counts = np.bincount(slots, minlength=columns.shape[1])
+    starts = np.cumsum(counts) - counts
+
+    first_counts = counts[pairs[:, 0]]
+    second_counts = counts[pairs[:, 1]]
+    sizes = first_counts * second_counts
+    pair = np.repeat(np.arange(len(pairs)), sizes)
+    within = np.arange(len(pair)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    first = starts[pairs[pair, 0]] + within // second_counts[pair]
+    second = starts[pairs[pair, 1]] + within % second_counts[pair]
+    return (events[first], columns[events[first], slots[first]],
+            events[second], columns[events[second], slots[second]])
+
+
+def _clash_pairs(model, columns, clashes):
+    """
+    Return the events and columns of the variables of every pair forbidden
+    by a boolean E by E clashes array (see :py:func:`utils.clash_array`),
+    ordered as the rows of :py:func:`_events_available_during_other_events`
+    """
+    pairs = model.slot_intervals.pairs()
+    events, other_events = np.nonzero(clashes)
+
+    # The pairs of variables are either found for every pair of conflicting
+    # events or for every pair of variables in concurrent slots, whichever
+    # there are fewer of (for example when only some events have variables)
+    counts = np.count_nonzero(columns >= 0, axis=0)
+    if np.dot(counts[pairs[:, 0]], counts[pairs[:, 1]]) < (
+        len(pairs) * len(events)
+    ):
+        event, first, other_event, second = _cell_pairs(columns, pairs)
+        conflicting = clashes[event, other_event]
+        return (event[conflicting], first[conflicting],
+                other_event[conflicting], second[conflicting])
+
+    first = columns[events[None, :], pairs[:, 0][:, None]]
+    second = columns[other_events[None, :], pairs[:, 1][:, None]]
+    exists = (first >= 0) & (second >= 0)
+    return (np.broadcast_to(events, first.shape)[exists], first[exists],
+            np.broadcast_to(other_events, first.shape)[exists],
+            second[exists])
+
+
+def _events_available_during_other_events(model, columns, **kwargs):
+    clashes = lpu.clash_array(model.events, model=model)
+    _, first, _, second = _clash_pairs(model, columns, clashes)
+    return _pair_block(first, second)
+
+
+def _clique_members(items, cliques, number_of_vertices):
+    """
+    Return the index of each item of an array of vertices, and of each
+    clique containing it, once for every such pair
+    """
+    sizes = np.array([len(clique) for clique in cliques], dtype=np.int64)
+    vertices = np.concatenate(cliques) if cliques else np.zeros(0, int)
+    clique_ids = np.repeat(np.arange(len(cliques)), sizes)
+    order = np.argsort(vertices, kind='stable')
+    counts = np.bincount(vertices, minlength=number_of_vertices)
+    starts = np.cumsum(counts) - counts
+
+    sizes = counts[items]
+    index = np.repeat(np.arange(len(items)), sizes)
+    within = np.arange(len(index)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    return index, clique_ids[order[starts[items[index]] + within]]
+
+
+def _events_available_during_other_events_by_clique(
+    model, columns, **kwargs
+):
+    clashes = lpu.clash_array(model.events, model=model)
+    event_cliques, slot_cliques = model.clash_cliques()
+
+    # Every variable belongs to the row of each pair of an event clique
+    # containing its event and a slot clique containing its slot. Rows are
+    # ordered by event clique and then by slot clique and only those with
+    # more than one variable are kept.
+    events, slots = np.nonzero(columns >= 0)
+    variable, event_clique = _clique_members(
+        events, event_cliques, model.shape.events)
+    index, slot_clique = _clique_members(
+        slots[variable], slot_cliques, model.shape.slots)
+    keys = event_clique[index] * len(slot_cliques) + slot_clique
+    order = np.argsort(keys, kind='stable')
+    keys, cells = keys[order], columns[events, slots][variable[index[order]]]
+    _, key_rows, sizes = np.unique(
+        keys, return_inverse=True, return_counts=True)
+    used = sizes[key_rows] > 1
+    clique_rows = (np.cumsum(sizes > 1) - 1)[key_rows[used]]
+    clique_cells = cells[used]
+    number_of_rows = np.count_nonzero(sizes > 1)
+
+    # For the pairs of events constrained in one order only, one row for each
+    # slot of the first event with the later concurrent slots of the other
+    event, first, other_event, second = _clash_pairs(
+        model, columns, clashes & ~clashes.T)
+    order = np.lexsort((other_event, event, slots[first]))
+    event, first = event[order], first[order]
+    other_event, second = other_event[order], second[order]
+    new_row = np.ones(len(first), dtype=bool)
+    new_row[1:] = (first[1:] != first[:-1]) | (
+        other_event[1:] != other_event[:-1])
+    pair_rows = number_of_rows + np.cumsum(new_row) - 1
+    number_of_rows += np.count_nonzero(new_row)
+
+    rows = np.concatenate((clique_rows, pair_rows[new_row], pair_rows))
+    return _block(
+        rows=rows,
+        columns=np.concatenate((clique_cells, first[new_row], second)),
+        values=np.ones(len(rows)),
+        lower=np.full(number_of_rows, -np.inf),
+        upper=np.ones(number_of_rows))
+
+
+_clash_constraints = {
+    'pairwise': _events_available_during_other_events,
+    'clique': _events_available_during_other_events_by_clique,
+}
+
+
+def _upper_bound_on_event_overflow(model, columns, beta_column, **kwargs):
+    # One row for each undominated slot: demand @ x - beta <= capacity
+    slots = lpu.overflow_slots(
+        model.events, model.slots, exists=columns >= 0, model=model)
+    cells = columns[:, slots]
+    demands = np.broadcast_to(model.demands[:, None], cells.shape)
+    exists = (cells >= 0) & (demands != 0)
+    slot_rows = np.broadcast_to(np.arange(len(slots)), cells.shape)
+    number_of_rows = len(slots)
+    return _block(
+        rows=np.concatenate((
+            slot_rows.T[exists.T], np.arange(number_of_rows))),
+        columns=np.concatenate((
+            cells.T[exists.T], np.full(number_of_rows, beta_column))),
+        values=np.concatenate((
+            demands.T[exists.T], np.full(number_of_rows, -1.0))),
+        lower=np.full(number_of_rows, -np.inf),
+        upper=model.capacities[slots])
+
+
+def constraint_matrix(
+    events, slots, columns, beta_column=None, clashes='pairwise', model=None
+):
+    """
+    Return all the constraints of the problem as a ConstraintMatrix
+
+    The rows are those given by
+    :py:func:`lp_problem.constraints.all_constraints` with pulp variables, in
+    the same order.
+
+    Parameters
+    ----------
+    events : list or tuple
+        of :py:class:`resources.Event` instances
+    slots : list or tuple
+        of :py:class:`resources.Slot` instances
+    columns : np.array
+        from :py:func:`variable_columns`
+    beta_column : int, optional
+        the column of the upper bound variable of the equity objective. If
+        given, the corresponding constraints are included.
+    clashes : str
+        either 'pairwise' or 'clique'
+    model : ConferenceModel, optional
+    """
+    if model is None:
+        model = lpu.ConferenceModel(events=events, slots=slots)
+    builders = [
+        _schedule_all_events,
+        _max_one_event_per_slot,
+        _events_available_in_scheduled_slot,
+        _clash_constraints[clashes],
+    ]
+    if beta_column is not None:
+        builders.append(_upper_bound_on_event_overflow)
+
+    blocks = []
+    offset = 0
+    for builder in builders:
+        block = builder(model=model, columns=columns, beta_column=beta_column)
+        blocks.append(block._replace(rows=block.rows + offset))
+        offset += len(block.lower)
+    return ConstraintMatrix(
+        *(np.concatenate(field) for field in zip(*blocks)))
+
+
+def add_constraints(problem, matrix, variables):
+    """
+    Add the constraints of a ConstraintMatrix to a pulp problem in bulk
+
+    Rows with equal bounds give an equality constraint and the others a
+    constraint for each finite bound. The senses and right hand sides of all
+    the rows are found at once so that only the pulp constraints themselves
+    are built one row at a time.
+
+    Parameters
+    ----------
+    problem : pulp.LpProblem
+    matrix : ConstraintMatrix
+    variables : list
+        of pulp variables indexed by column
+    """
+    order = np.argsort(matrix.rows, kind='stable')
+    rows = matrix.rows[order]
+    terms = list(zip(
+        [variables[column] for column in matrix.columns[order].tolist()],
+        matrix.values[order].tolist()))
+    number_of_rows = len(matrix.lower)
+    ends = np.cumsum(np.bincount(rows, minlength=number_of_rows))
+    starts = ends - np.bincount(rows, minlength=number_of_rows)
+
+    # One constraint for each sense of each row with terms, ordered by row
+    lower, upper = matrix.lower, matrix.upper
+    used = starts < ends
+    equal = used & (lower == upper)
+    less = used & ~equal & (upper != np.inf)
+    greater = used & ~equal & (lower != -np.inf)
+    constraint_rows = np.concatenate((
+        np.flatnonzero(equal), np.flatnonzero(less),
+        np.flatnonzero(greater)))
+    senses = np.repeat(
+        [pulp.LpConstraintEQ, pulp.LpConstraintLE, pulp.LpConstraintGE],
+        [np.count_nonzero(equal), np.count_nonzero(less),
+         np.count_nonzero(greater)])
+    rhs = np.where(senses == pulp.LpConstraintGE, lower[constraint_rows],
+                   upper[constraint_rows])
+    by_row = np.argsort(constraint_rows, kind='stable')
+    constraint_rows = constraint_rows[by_row]
+
+    for start, end, sense, bound in zip(
+        starts[constraint_rows].tolist(), ends[constraint_rows].tolist(),
+        senses[by_row].tolist(), rhs[by_row].tolist()
+    ):
+        problem.addConstraint(pulp.LpConstraint(
+            pulp.LpAffineExpression(terms[start:end]), sense=sense,
+            rhs=bound))
+
+
+def build_problem(
+    events, slots, objective_function=None, availability=None,
+    clashes='pairwise', model=None, **kwargs
+):
+    """
+    Return the scheduling problem as a pulp problem with its variables
+
+    The constraints are built as a ConstraintMatrix and added in bulk.
+
+    Parameters
+    ----------
+    events : list or tuple
+        of :py:class:`resources.Event` instances
+    slots : list or tuple
+        of :py:class:`resources.Slot` instances
+    objective_function : callable, optional
+        from lp_problem.objective_functions
+    availability : np.array, optional
+        if given, variables are only created for the event and slot pairs
+        with non zero availability
+    clashes : str
+        either 'pairwise' or 'clique'
+    model : ConferenceModel, optional
+    kwargs : keyword arguments
+        arguments for the objective function
+
+    Returns
+    -------
+    tuple
+        the pulp problem, the dictionary of variables X indexed by (event,
+        slot) and the upper bound variable beta
+    """
+    if model is None:
+        model = lpu.ConferenceModel(events=events, slots=slots)
+    problem = pulp.LpProblem()
+    X = lpu.variables(model.shape, availability=availability)
+    beta = pulp.LpVariable("upper_bound")
+
+    columns = variable_columns(model.shape, availability)
+    matrix = constraint_matrix(
+        events, slots, columns, beta_column=len(X), clashes=clashes,
+        model=model)
+    add_constraints(problem, matrix, list(X.values()) + [beta])
+
+    if objective_function is not None:
+        problem += objective_function(
+            events=events, slots=slots, X=X, beta=beta, **kwargs)
+    return problem, X, beta
+
+
+class MatrixForm(NamedTuple):
+    """
+    The scheduling problem as arrays
+
+    The problem is to minimise cost @ x + constant subject to
+    lower <= A @ x <= upper where A is given in compressed sparse row (CSR)
+    form by data, indices and indptr. Column j of A corresponds to
+    scheduling event variables[j, 0] in slot variables[j, 1] except for the
+    last column which is the upper bound variable of the equity objective.
+    """
+    data: np.ndarray
+    indices: np.ndarray
+    indptr: np.ndarray
+    shape: tuple
+    lower: np.ndarray
+    upper: np.ndarray
+    cost: np.ndarray
+    constant: float
+    variables: np.ndarray
+
+    @property
+    def beta_column(self):
+        return len(self.variables)
+
+    def toarray(self):
+        """Return A as a dense numpy array"""
+        array = np.zeros(self.shape)
+        rows = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+        np.add.at(array, (rows, self.indices), self.data)
+        return array
+
+
+def objective_coefficients(objective, variables):
+    """
+    Return the cost vector and constant of a linear pulp expression in the
+    given variables
+
+    Parameters
+    ----------
+    objective : pulp.LpAffineExpression, pulp.LpVariable or number
+    variables : list
+        of pulp variables indexed by column
+    """
+    expression = pulp.LpAffineExpression(objective)
+    columns = {variable.name: column
+               for column, variable in enumerate(variables)}
+    cost = np.zeros(len(variables))
+    for variable, coefficient in expression.items():
+        cost[columns[variable.name]] += coefficient
+    return cost, float(expression.constant)
+
+
+def matrix_form(
+    events, slots, objective=None, sparse=False, clashes='pairwise',
+    model=None, **kwargs
+):
+    """
+    Return the scheduling problem as sparse arrays
+
+    The constraints are those of
+    :py:func:`lp_problem.constraints.all_constraints` (including the bounds
+    on overflow for the equity objective) in the same order.
+
+    Parameters
+    ----------
+    events : list or tuple
+        of :py:class:`resources.Event` instances
+    slots : list or tuple
+        of :py:class:`resources.Slot` instances
+    objective : callable, optional
+        from lp_problem.objective_functions. It must be linear in X and beta.
+    sparse : bool
+        if True, only include variables for the event and slot pairs for which
+        the event is available
+    clashes : str
+        either 'pairwise' or 'clique'
+    model : ConferenceModel, optional
+    kwargs : keyword arguments
+        arguments for the objective function
+
+    Returns
+    -------
+    MatrixForm
+    """
+    if model is None:
+        model = lpu.ConferenceModel(events=events, slots=slots)
+    availability = None
+    if sparse:
+        availability = lpu.slot_availability_array(
+            events, slots, model=model)
+    columns = variable_columns(model.shape, availability)
+    number_of_columns = int(np.count_nonzero(columns >= 0)) + 1
+
+    matrix = constraint_matrix(
+        events, slots, columns, beta_column=number_of_columns - 1,
+        clashes=clashes, model=model)
+    number_of_rows = len(matrix.lower)
+    order = np.lexsort((matrix.columns, matrix.rows))
+    indptr = np.zeros(number_of_rows + 1, dtype=np.int64)
+    np.cumsum(
+        np.bincount(matrix.rows, minlength=number_of_rows), out=indptr[1:])
+
+    cost = np.zeros(number_of_columns)
+    constant = 0.0
+    if objective is not None:
+        X = lpu.variables(model.shape, availability=availability)
+        beta = pulp.LpVariable("upper_bound")
+        cost, constant = objective_coefficients(
+            objective(events=events, slots=slots, X=X, beta=beta, **kwargs),
+            list(X.values()) + [beta])
+
+    return MatrixForm(
+        data=matrix.values[order],
+        indices=matrix.columns[order],
+        indptr=indptr,
+        shape=(number_of_rows, number_of_columns),
+        lower=matrix.lower,
+        upper=matrix.upper,
+        cost=cost,
+        constant=constant,
+        variables=np.argwhere(columns >= 0))
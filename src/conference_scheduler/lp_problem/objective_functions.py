@@ -1,21 +1,55 @@
+import numpy as np
+import pulp
 from conference_scheduler.converter import schedule_to_array
+from conference_scheduler.lp_problem import matrix as lpm
+from conference_scheduler.lp_problem import utils as lpu
+from conference_scheduler.lp_problem.utils import is_variable
+from conference_scheduler.resources import Shape
+
+
+def _overflow_array(slots, events):
+    """
+    Return an E by S array of the difference between the demand for each
+    event and the capacity of each slot
+    """
+    demands = np.array([event.demand for event in events])
+    capacities = np.array([slot.capacity for slot in slots])
+    return demands[:, None] - capacities[None, :]
+
 
 def efficiency_capacity_demand_difference(slots, events, X, **kwargs):
     """
     A function that calculates the total difference between demand for an event
     and the slot capacity it is scheduled in.
     """
+    if isinstance(X, np.ndarray):
+        return np.sum(_overflow_array(slots, events) * X)
+
+    if isinstance(X, lpu.SparseVariables):
+        overflow = _overflow_array(slots, events)
+        return pulp.lpSum(
+            overflow[index] * variable for index, variable in X.items())
+
     overflow = 0
     for row, event in enumerate(events):
         for col, slot in enumerate(slots):
-            overflow += (event.demand - slot.capacity) * X[row, col]
+            if is_variable(X, (row, col)):
+                overflow += (event.demand - slot.capacity) * X[row, col]
     return overflow
 
-def equity_capacity_demand_difference(slots, events, X, beta, **kwargs):
+
+def equity_capacity_demand_difference(slots, events, X, beta=None, **kwargs):
     """
     A function that returns the maximum difference between demand for an event
     and the slot capacity it is scheduled in.
+
+    For an lp problem this is the variable beta which is an upper bound on
+    those differences. For a numpy array the maximum is calculated directly.
     """
+    if isinstance(X, np.ndarray):
+        demands = np.array([event.demand for event in events])
+        capacities = np.array([slot.capacity for slot in slots])
+        return np.max(demands[:, None] * X - capacities[None, :])
     return beta
 
 
@@ -24,9 +58,12 @@ def number_of_changes(slots, events, original_schedule, X, **kwargs):
     A function that counts the number of changes between a given schedule
     and an array (either numpy array of lp array).
     """
-    changes = 0
     original_array = schedule_to_array(original_schedule, events=events,
                                        slots=slots)
+    if isinstance(X, np.ndarray):
+        return np.count_nonzero((original_array != 0) ^ (X != 0))
+
+    changes = 0
     for row, event in enumerate(original_array):
         for col, slot in enumerate(event):
             if slot == 0:
@@ -34,3 +71,191 @@ def number_of_changes(slots, events, original_schedule, X, **kwargs):
             else:
                 changes += 1 - X[row, col]
     return changes
+
+
+# Compiled objective functions
+#
+# These evaluate an objective function for numpy arrays with everything that
+# does not depend on the array computed once. They are classes rather than
+# closures so that they can be pickled.
+
+class ObjectiveFunction:
+    """
+    An objective function with fixed events, slots and keyword arguments
+    """
+    def __init__(self, objective_function, events, slots, **kwargs):
+        self.objective_function = objective_function
+        self.events = events
+        self.slots = slots
+        self.kwargs = kwargs
+
+    def __call__(self, X):
+        return self.objective_function(
+            events=self.events, slots=self.slots, X=X, **self.kwargs)
+
+
+class LinearObjectiveFunction:
+    """
+    An objective function given by an E by S cost array and a constant
+
+    The change in value for a move of :py:mod:`conference_scheduler.heuristics`
+    is given by the delta method from the cost of the cells involved.
+    """
+    def __init__(self, cost, constant=0):
+        self.cost = cost
+        self.constant = constant
+
+    def __call__(self, X):
+        return np.sum(self.cost * X) + self.constant
+
+    def reset(self, X):
+        pass
+
+    def delta(self, move):
+        event, slot, new_slot, other_event = move
+        cost = self.cost
+        change = cost[event, new_slot] - cost[event, slot]
+        if other_event is not None:
+            change += cost[other_event, slot] - cost[other_event, new_slot]
+        return change
+
+    def deltas(self, moves):
+        """Return the changes in value for a batch of moves"""
+        event, slot, new_slot, other_event = moves
+        cost = self.cost
+        changes = cost[event, new_slot] - cost[event, slot]
+        swaps = other_event != -1
+        other_event, slot, new_slot = (
+            other_event[swaps], slot[swaps], new_slot[swaps])
+        changes[swaps] += cost[other_event, slot] - cost[other_event, new_slot]
+        return changes
+
+    def apply(self, move):
+        pass
+
+
+class EfficiencyCapacityDemandDifference(LinearObjectiveFunction):
+
+    def __init__(self, events, slots, **kwargs):
+        super().__init__(_overflow_array(slots, events))
+
+
+class EquityCapacityDemandDifference:
+
+    def __init__(self, events, slots, **kwargs):
+        self.demands = np.array([event.demand for event in events])[:, None]
+        self.capacities = np.array([slot.capacity for slot in slots])[None, :]
+
+    def __call__(self, X):
+        return np.max(self.demands * X - self.capacities)
+
+
+class NumberOfChanges(LinearObjectiveFunction):
+
+    def __init__(self, events, slots, original_schedule, **kwargs):
+        self.original_array = schedule_to_array(
+            original_schedule, events=events, slots=slots) != 0
+        # For arrays of zeros and ones, the number of changes is the number
+        # of original cells plus one for each other cell in X less one for
+        # each original cell in X
+        super().__init__(
+            cost=1 - 2 * self.original_array.astype(int),
+            constant=np.count_nonzero(self.original_array))
+
+    def __call__(self, X):
+        return np.count_nonzero(self.original_array ^ (X != 0))
+
+
+compiled_objective_functions = {
+    efficiency_capacity_demand_difference: EfficiencyCapacityDemandDifference,
+    equity_capacity_demand_difference: EquityCapacityDemandDifference,
+    number_of_changes: NumberOfChanges,
+}
+
+
+def compiled_objective(objective_function, events, slots, **kwargs):
+    """
+    Return a callable evaluating an objective function for numpy arrays
+
+    Parameters
+    ----------
+    objective_function : callable
+        from lp_problem.objective_functions
+    events : list or tuple
+        of :py:class:`resources.Event` instances
+    slots : list or tuple
+        of :py:class:`resources.Slot` instances
+    kwargs : keyword arguments
+        arguments for the objective function
+
+    Returns
+    -------
+    callable
+        taking an E by S array X and returning the value of the objective
+        function. Any data that does not depend on X is computed once.
+        Other functions are compiled to a cost array if they are linear when
+        evaluated with pulp variables (see :py:func:`cost_array`) and are
+        otherwise called with the array.
+    """
+    compiled = compiled_objective_functions.get(objective_function)
+    if compiled is not None:
+        return compiled(events=events, slots=slots, **kwargs)
+
+    # Functions written for numpy arrays only (using X.shape or slicing for
+    # example) cannot be evaluated with pulp variables. They are used as they
+    # are, and any error of their own is raised when they are evaluated.
+    try:
+        cost = cost_array(objective_function, events, slots, **kwargs)
+    except Exception:
+        cost = None
+    if cost is not None:
+        return LinearObjectiveFunction(*cost)
+    return ObjectiveFunction(objective_function, events, slots, **kwargs)
+
+
+def cost_array(objective_function, events, slots, **kwargs):
+    """
+    Return the cost array and constant of an objective function which is
+    linear in X
+
+    The objective function is evaluated once with the pulp variables of the
+    lp problem and the coefficients of the resulting expression are
+    extracted.
+
+    Parameters
+    ----------
+    objective_function : callable
+        written for :py:func:`scheduler.solution`
+    events : list or tuple
+        of :py:class:`resources.Event` instances
+    slots : list or tuple
+        of :py:class:`resources.Slot` instances
+    kwargs : keyword arguments
+        arguments for the objective function
+
+    Returns
+    -------
+    tuple
+        of an E by S numpy array and a number such that the objective
+        function is np.sum(cost * X) + constant, or None if the objective
+        function is not linear in the pulp variables, has other variables
+        or depends on beta
+    """
+    shape = Shape(len(events), len(slots))
+    X = lpu.variables(shape)
+    beta = pulp.LpVariable("upper_bound")
+    try:
+        objective = objective_function(
+            events=events, slots=slots, X=X, beta=beta, **kwargs)
+    except TypeError:
+        # pulp raises a TypeError for operations which are not linear
+        return None
+    try:
+        cost, constant = lpm.objective_coefficients(
+            objective, list(X.values()) + [beta])
+    except KeyError:
+        # The expression has variables other than X and beta
+        return None
+    if cost[-1] != 0:
+        return None
+    return cost[:-1].reshape(shape), constant
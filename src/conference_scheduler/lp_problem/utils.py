@@ -1,8 +1,241 @@
 import pulp
+import bisect
 import itertools as it
 import numpy as np
 import datetime
-from conference_scheduler.resources import Shape
+from conference_scheduler.resources import Shape, Event
+
+
+class IntervalIndex:
+    """
+    An index of the concurrent pairs of a collection of intervals
+
+    Two intervals are concurrent if one of them starts and ends within the
+    other (see :py:func:`slots_overlap`).
+
+    The pairs are found with a sweep line over the intervals sorted by start
+    (and by decreasing end for equal starts), keeping the active intervals
+    ordered by their end. Every earlier interval which ends no earlier than
+    the current one contains it, so each interval only costs a binary search
+    plus the number of pairs it belongs to.
+
+    Parameters
+    ----------
+    starts : np.array
+    ends : np.array
+    """
+
+    def __init__(self, starts, ends):
+        self.starts = np.asarray(starts)
+        self.ends = np.asarray(ends)
+        self._pairs = None
+        self._neighbours = None
+
+    def pairs(self):
+        """
+        Return a K by 2 array of the indices of all concurrent pairs
+
+        Each pair (i, j) has i < j and the pairs are sorted.
+        """
+        if self._pairs is None:
+            self._pairs = self._sweep()
+        return self._pairs
+
+    def _sweep(self):
+        order = np.lexsort((-self.ends, self.starts))
+        starts, ends = self.starts.tolist(), self.ends.tolist()
+        active_ends, active_ids = [], []
+        firsts, seconds = [], []
+        for j in order.tolist():
+            start, end = starts[j], ends[j]
+            # Intervals which have ended before this one starts cannot
+            # contain it or any of the later intervals
+            expired = bisect.bisect_left(active_ends, start)
+            del active_ends[:expired]
+            del active_ids[:expired]
+
+            containing = active_ids[bisect.bisect_left(active_ends, end):]
+            firsts.extend(min(i, j) for i in containing)
+            seconds.extend(max(i, j) for i in containing)
+
+            position = bisect.bisect_right(active_ends, end)
+            active_ends.insert(position, end)
+            active_ids.insert(position, j)
+
+        firsts = np.array(firsts, dtype=np.int64)
+        seconds = np.array(seconds, dtype=np.int64)
+        order = np.lexsort((seconds, firsts))
+        return np.column_stack((firsts[order], seconds[order]))
+
+    def concurrent_with(self, index):
+        """
+        Return a sorted array of the indices of the intervals concurrent with
+        the interval at index
+        """
+        if self._neighbours is None:
+            pairs = self.pairs()
+            ids = np.concatenate((pairs[:, 0], pairs[:, 1]))
+            neighbours = np.concatenate((pairs[:, 1], pairs[:, 0]))
+            order = np.lexsort((neighbours, ids))
+            offsets = np.searchsorted(
+                ids[order], np.arange(len(self.starts) + 1))
+            self._neighbours = (neighbours[order], offsets)
+        neighbours, offsets = self._neighbours
+        return neighbours[offsets[index]:offsets[index + 1]]
+
+
+class ConferenceModel:
+    """
+    A columnar representation of the events and slots of a conference
+
+    The attributes of the events and slots are read once and held as numpy
+    arrays so that the functions which build the various arrays and
+    constraints do not need to traverse the python objects repeatedly.
+
+    Parameters
+    ----------
+    events : list or tuple
+        of :py:class:`resources.Event` instances
+    slots : list or tuple
+        of :py:class:`resources.Slot` instances
+
+    Attributes
+    ----------
+    shape : resources.Shape
+    event_durations, demands : np.array
+        of length E
+    slot_durations, capacities : np.array
+        of length S
+    starts, ends : np.array
+        of length S giving the start and end of each slot in minutes after
+        the start of the earliest slot
+    slot_intervals : IntervalIndex
+        of the concurrent slots
+    sessions : list
+        of sorted session names
+    session_ids : np.array
+        of length S giving the index in sessions of each slot's session
+    tags : list
+        of sorted tag names
+    tag_membership : np.array
+        boolean E by T array which is True if event i has tag j
+    event_has_unavailability : np.array
+        boolean array of length E
+    unavailable_slots : tuple
+        of two integer arrays giving the (event, slot) indices of every slot
+        listed in the unavailability of an event
+    unavailable_events : tuple
+        of two integer arrays giving the (event, event) indices of every
+        event listed in the unavailability of an event
+    """
+
+    def __init__(self, events=(), slots=()):
+        self.events = events
+        self.slots = slots
+        self.shape = Shape(len(events), len(slots))
+
+        self.event_durations = np.array(
+            [event.duration for event in events], dtype=float)
+        self.demands = np.array(
+            [event.demand for event in events], dtype=float)
+        self.event_has_unavailability = np.array(
+            [len(event.unavailability) > 0 for event in events], dtype=bool)
+
+        self.slot_durations = np.array(
+            [slot.duration for slot in slots], dtype=float)
+        self.capacities = np.array(
+            [slot.capacity for slot in slots], dtype=float)
+
+        self.starts = np.zeros(len(slots))
+        if len(slots) > 0:
+            origin = min(slot.starts_at for slot in slots)
+            minute = datetime.timedelta(minutes=1)
+            self.starts = np.array(
+                [(slot.starts_at - origin) / minute for slot in slots],
+                dtype=float)
+        self.ends = self.starts + self.slot_durations
+        self.slot_intervals = IntervalIndex(self.starts, self.ends)
+
+        self.sessions = sorted(set(slot.session for slot in slots))
+        session_index = {
+            session: i for i, session in enumerate(self.sessions)}
+        self.session_ids = np.array(
+            [session_index[slot.session] for slot in slots], dtype=np.int64)
+
+        self.tags = sorted(set(tag for event in events for tag in event.tags))
+        tag_index = {tag: i for i, tag in enumerate(self.tags)}
+        self.tag_membership = np.zeros(
+            (len(events), len(self.tags)), dtype=bool)
+        for row, event in enumerate(events):
+            for tag in event.tags:
+                self.tag_membership[row, tag_index[tag]] = True
+
+        self.unavailable_slots = self._unavailable_slots()
+        self.unavailable_events = self._unavailable_events()
+        self._clash_cliques = None
+
+    def clash_cliques(self):
+        """
+        Return the clique covers of the pairs of events constrained in both
+        orders by the clash constraints (see :py:func:`clash_array`) and of
+        the concurrent slots
+
+        The covers are computed once and kept, as they only depend on the
+        conference.
+        """
+        if self._clash_cliques is None:
+            clashes = clash_array(self.events, model=self)
+            self._clash_cliques = (
+                clique_cover(clashes & clashes.T),
+                clique_cover(concurrency_array(self.slots, model=self)))
+        return self._clash_cliques
+
+    def _unavailable_slots(self):
+        """
+        Resolve the slots in the unavailability of each event to indices
+
+        Slots are looked up by value so that equal slots share the same
+        indices, as they would when using `slot in event.unavailability`.
+        """
+        slot_indices = {}
+        for col, slot in enumerate(self.slots):
+            slot_indices.setdefault(slot, []).append(col)
+
+        rows, cols = [], []
+        for row, event in enumerate(self.events):
+            for item in event.unavailability:
+                if isinstance(item, Event):
+                    continue
+                for col in slot_indices.get(item, ()):
+                    rows.append(row)
+                    cols.append(col)
+        return (np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64))
+
+    def _unavailable_events(self):
+        """
+        Resolve the events in the unavailability of each event to indices
+
+        Events are matched by equality, as they would be when using
+        `other_event in event.unavailability`, but only compared with the
+        events that share their name, duration and demand.
+        """
+        event_indices = {}
+        for col, event in enumerate(self.events):
+            key = (event.name, event.duration, event.demand)
+            event_indices.setdefault(key, []).append(col)
+
+        rows, cols = [], []
+        for row, event in enumerate(self.events):
+            for item in event.unavailability:
+                if not isinstance(item, Event):
+                    continue
+                key = (item.name, item.duration, item.demand)
+                for col in event_indices.get(key, ()):
+                    other_event = self.events[col]
+                    if other_event is item or other_event == item:
+                        rows.append(row)
+                        cols.append(col)
+        return (np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64))
 
 
 # According to David MacIver, using this function is more efficient than
@@ -22,45 +255,92 @@ summation_functions = {
 }
 
 
-def variables(shape: Shape):
-    return pulp.LpVariable.dicts(
+def default_solver(msg=True):
+    """
+    Return pulp's default solver, as a new solver with warmStart=True if it
+    is CBC so that the initial values of the variables are used
+
+    Parameters
+    ----------
+    msg : bool
+        whether a new CBC solver shows its output
+    """
+    solver = pulp.LpSolverDefault
+    if isinstance(solver, pulp.COIN_CMD):
+        return type(solver)(msg=msg, warmStart=True)
+    return solver
+
+
+class SparseVariables(dict):
+    """
+    A dictionary of variables for only some of the (event, slot) pairs
+
+    Looking up a pair without a variable returns 0 so that expressions
+    written for a full set of variables remain valid.
+    """
+
+    def __missing__(self, key):
+        return 0
+
+
+def variables(shape: Shape, availability=None):
+    """
+    Return a dictionary of binary variables indexed by (event, slot)
+
+    If an availability array is given, variables are only created for the
+    pairs with non zero availability and a :py:class:`SparseVariables`
+    dictionary is returned.
+    """
+    if availability is None:
+        return pulp.LpVariable.dicts(
+            "x",
+            it.product(range(shape.events), range(shape.slots)),
+            cat=pulp.LpBinary
+        )
+    return SparseVariables(pulp.LpVariable.dicts(
         "x",
-        it.product(range(shape.events), range(shape.slots)),
+        (tuple(index) for index in np.argwhere(availability).tolist()),
         cat=pulp.LpBinary
-    )
+    ))
+
+
+def is_variable(X, index):
+    """
+    Return whether X has an entry for the (event, slot) index
+
+    This is only ever False for a :py:class:`SparseVariables` dictionary.
+    """
+    return not isinstance(X, SparseVariables) or index in X
 
 
-def tag_array(events):
+def tag_array(events, model=None):
     """
     Return a numpy array mapping events to tags
 
     - Rows corresponds to events
     - Columns correspond to tags
     """
-    all_tags = sorted(set(tag for event in events for tag in event.tags))
-    array = np.zeros((len(events), len(all_tags)))
-    for row, event in enumerate(events):
-        for tag in event.tags:
-            array[row, all_tags.index(tag)] = 1
-    return array
+    if model is None:
+        model = ConferenceModel(events=events)
+    return model.tag_membership.astype(float)
 
 
-def session_array(slots):
+def session_array(slots, model=None):
     """
     Return a numpy array mapping sessions to slots
 
     - Rows corresponds to sessions
     - Columns correspond to slots
     """
-    # Flatten the list: this assumes that the sessions do not share slots
-    sessions = sorted(set([slot.session for slot in slots]))
-    array = np.zeros((len(sessions), len(slots)))
-    for col, slot in enumerate(slots):
-        array[sessions.index(slot.session), col] = 1
+    # This assumes that the sessions do not share slots
+    if model is None:
+        model = ConferenceModel(slots=slots)
+    array = np.zeros((len(model.sessions), model.shape.slots))
+    array[model.session_ids, np.arange(model.shape.slots)] = 1
     return array
 
 
-def slot_availability_array(events, slots):
+def slot_availability_array(events, slots, model=None):
     """
     Return a numpy array mapping events to slots
 
@@ -70,15 +350,15 @@ def slot_availability_array(events, slots):
     Array has value 0 if event cannot be scheduled in a given slot
     (1 otherwise)
     """
-    array = np.ones((len(events), len(slots)))
-    for row, event in enumerate(events):
-        for col, slot in enumerate(slots):
-            if slot in event.unavailability or event.duration > slot.duration:
-                array[row, col] = 0
+    if model is None:
+        model = ConferenceModel(events=events, slots=slots)
+    too_long = model.event_durations[:, None] > model.slot_durations[None, :]
+    array = np.where(too_long, 0.0, 1.0)
+    array[model.unavailable_slots] = 0
     return array
 
 
-def event_availability_array(events):
+def event_availability_array(events, model=None):
     """
     Return a numpy array mapping events to events
 
@@ -88,15 +368,16 @@ def event_availability_array(events):
     Array has value 0 if event cannot be scheduled at same time as other event
     (1 otherwise)
     """
-    array = np.ones((len(events), len(events)))
-    for row, event in enumerate(events):
-        for col, other_event in enumerate(events):
-            if row != col:
-                tags = set(event.tags)
-                events_share_tag = len(tags.intersection(other_event.tags)) > 0
-                if (other_event in event.unavailability) or events_share_tag:
-                    array[row, col] = 0
-                    array[col, row] = 0
+    if model is None:
+        model = ConferenceModel(events=events)
+    # The product of the tag matrix with its transpose counts the tags
+    # shared by each pair of events
+    tags = model.tag_membership.astype(np.float32)
+    array = np.where(tags @ tags.T > 0, 0.0, 1.0)
+    rows, cols = model.unavailable_events
+    array[rows, cols] = 0
+    array[cols, rows] = 0
+    np.fill_diagonal(array, 1)
     return array
 
 
@@ -124,14 +405,245 @@ def slots_overlap(slot, other_slot):
     return False
 
 
-def concurrent_slots(slots):
+def concurrent_slots(slots, model=None):
     """
     Yields all concurrent slot indices.
+
+    Two slots are concurrent if one of them starts and ends within the other
+    (see :py:func:`slots_overlap`).
+    """
+    if model is None:
+        model = ConferenceModel(slots=slots)
+    for i, j in model.slot_intervals.pairs().tolist():
+        yield (i, j)
+
+
+def conflict_array(events, model=None):
+    """
+    Return a boolean numpy array mapping events to events
+
+    - Rows corresponds to events
+    - Columns correspond to events
+
+    Array is True if the two events cannot be scheduled at the same time and
+    at least one of them has an explicit unavailability. These are the pairs
+    of events constrained, in at least one order, by the clash constraints
+    (see :py:func:`clash_array`).
+    """
+    if model is None:
+        model = ConferenceModel(events=events)
+    unavailable = event_availability_array(events, model=model) == 0
+    has_unavailability = model.event_has_unavailability
+    return unavailable & (
+        has_unavailability[:, None] | has_unavailability[None, :])
+
+
+def clash_array(events, model=None):
+    """
+    Return a boolean numpy array mapping events to events
+
+    - Rows corresponds to events
+    - Columns correspond to events
+
+    Array is True if the event of the row cannot be scheduled in the first
+    slot of a pair of concurrent slots (as given by
+    :py:func:`concurrent_slots`) while the event of the column is in the
+    second. This is the case if the two events cannot be scheduled at the
+    same time and the event of the row has an explicit unavailability, so
+    the array is only symmetric for pairs of events which both have one.
+    """
+    if model is None:
+        model = ConferenceModel(events=events)
+    unavailable = event_availability_array(events, model=model) == 0
+    return unavailable & model.event_has_unavailability[:, None]
+
+
+def later_concurrent_slots(slots, model=None):
     """
-    for i, slot in enumerate(slots):
-        for j, other_slot in enumerate(slots[i + 1:]):
-            if slots_overlap(slot, other_slot):
-                yield (i, j + i + 1)
+    Return a list giving, for each slot, the list of slots paired with it as
+    the second slot by :py:func:`concurrent_slots`
+    """
+    if model is None:
+        model = ConferenceModel(slots=slots)
+    later = [[] for _ in range(model.shape.slots)]
+    for i, j in concurrent_slots(slots, model=model):
+        later[i].append(j)
+    return later
+
+
+def concurrency_array(slots, model=None):
+    """
+    Return a boolean numpy array mapping slots to slots
+
+    - Rows corresponds to slots
+    - Columns correspond to slots
+
+    Array is True if the two slots are concurrent
+    """
+    if model is None:
+        model = ConferenceModel(slots=slots)
+    array = np.zeros((model.shape.slots, model.shape.slots), dtype=bool)
+    pairs = model.slot_intervals.pairs()
+    array[pairs[:, 0], pairs[:, 1]] = True
+    array[pairs[:, 1], pairs[:, 0]] = True
+    return array
+
+
+def overflow_slots(events, slots, exists=None, model=None):
+    """
+    Return the indices of the slots needing a bound on their overflow
+
+    The overflow of a slot can only exceed the overflow of the slot with the
+    smallest capacity when there is an event available for it with demand
+    greater than the difference in their capacities. The other slots are
+    dominated and can be dropped (if all demands are non negative).
+
+    Parameters
+    ----------
+    events : list or tuple
+        of :py:class:`resources.Event` instances
+    slots : list or tuple
+        of :py:class:`resources.Slot` instances
+    exists : np.array, optional
+        a boolean E by S array of the event and slot pairs with a variable
+    model : ConferenceModel, optional
+    """
+    if model is None:
+        model = ConferenceModel(events=events, slots=slots)
+    capacities = model.capacities
+    if len(capacities) == 0 or np.any(model.demands < 0):
+        return np.arange(len(capacities))
+
+    available = slot_availability_array(events, slots, model=model) != 0
+    if exists is not None:
+        available &= exists
+    demands = np.where(available, model.demands[:, None], 0)
+    smallest = np.argmin(capacities)
+    undominated = (
+        demands.max(axis=0, initial=0) > capacities - capacities[smallest])
+    undominated[smallest] = True
+    return np.flatnonzero(undominated)
+
+
+def clique_cover(adjacency):
+    """
+    Return a list of cliques which together cover every edge of a graph
+
+    The cliques are grown greedily: each one starts from an uncovered edge
+    at the vertex with most uncovered edges and is extended with the common
+    neighbour covering the most uncovered edges.
+
+    Parameters
+    ----------
+    adjacency : np.array
+        a symmetric boolean array with a False diagonal
+
+    Returns
+    -------
+    list
+        of sorted numpy arrays of vertex indices
+    """
+    adjacency = np.asarray(adjacency, dtype=bool)
+    uncovered = adjacency.copy()
+    cliques = []
+    degrees = uncovered.sum(axis=1)
+    while degrees.any():
+        first = int(np.argmax(degrees))
+        candidates = uncovered[first] * degrees
+        second = int(np.argmax(candidates))
+        clique = [first, second]
+        common = adjacency[first] & adjacency[second]
+        while common.any():
+            gains = uncovered[:, clique].sum(axis=1) * common
+            if gains.max() == 0:
+                gains = common * (degrees + 1)
+            vertex = int(np.argmax(gains))
+            clique.append(vertex)
+            common &= adjacency[vertex]
+        clique = np.array(sorted(clique))
+        block = np.ix_(clique, clique)
+        degrees[clique] -= uncovered[block].sum(axis=1)
+        uncovered[block] = False
+        cliques.append(clique)
+    return cliques
+
+
+def maximum_matching(adjacency):
+    """
+    Return a maximum matching of a bipartite graph
+
+    The matching is found with the Hopcroft-Karp algorithm: augmenting paths
+    are searched for in phases, each phase finding a maximal set of disjoint
+    shortest augmenting paths.
+
+    Parameters
+    ----------
+    adjacency : np.array
+        a boolean array with True where a row and a column are adjacent
+
+    Returns
+    -------
+    np.array
+        of the column matched to each row, or -1 if the row is unmatched
+    """
+    adjacency = np.asarray(adjacency, dtype=bool)
+    number_of_rows, number_of_columns = adjacency.shape
+    rows, columns = np.nonzero(adjacency)
+    bounds = np.searchsorted(rows, np.arange(number_of_rows + 1)).tolist()
+    columns = columns.tolist()
+    neighbours = [
+        columns[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+    match_of_row = [-1] * number_of_rows
+    match_of_column = [-1] * number_of_columns
+    unmatched = float('inf')
+
+    while True:
+        # Breadth first search for the layers of the shortest augmenting paths
+        free_rows = [row for row in range(number_of_rows)
+                     if match_of_row[row] == -1]
+        distance = [unmatched] * number_of_rows
+        for row in free_rows:
+            distance[row] = 0
+        queue = list(free_rows)
+        found = False
+        for row in queue:
+            for column in neighbours[row]:
+                other_row = match_of_column[column]
+                if other_row == -1:
+                    found = True
+                elif distance[other_row] == unmatched:
+                    distance[other_row] = distance[row] + 1
+                    queue.append(other_row)
+        if not found:
+            break
+
+        # Depth first search along the layers for disjoint augmenting paths
+        position = [0] * number_of_rows
+        for free_row in free_rows:
+            stack, path = [free_row], []
+            while stack:
+                row = stack[-1]
+                if position[row] == len(neighbours[row]):
+                    distance[row] = unmatched
+                    stack.pop()
+                    if path:
+                        path.pop()
+                    continue
+                column = neighbours[row][position[row]]
+                position[row] += 1
+                other_row = match_of_column[column]
+                if other_row == -1:
+                    path.append(column)
+                    for path_row, path_column in zip(stack, path):
+                        match_of_row[path_row] = path_column
+                        match_of_column[path_column] = path_row
+                    break
+                if distance[other_row] == distance[row] + 1:
+                    stack.append(other_row)
+                    path.append(column)
+
+    return np.array(match_of_row, dtype=np.int64)
 
 
 def _slots_in_session(slot, session_array):
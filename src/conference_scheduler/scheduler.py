@@ -9,14 +9,16 @@ A schedule can be represented in one of three forms:
     * schedule: a generator for a list of ScheduledItem instances
 """
 
+import time
 import pulp
 import numpy as np
 import conference_scheduler.converter as conv
 import conference_scheduler.lp_problem as lp
 import conference_scheduler.heuristics as heu
 import conference_scheduler.validator as val
+from conference_scheduler.lp_problem import objective_functions as of
 from conference_scheduler.resources import (
-    Shape, ChangedEventScheduledItem, ChangedSlotScheduledItem
+    ChangedEventScheduledItem, ChangedSlotScheduledItem
 )
 
 # __all__ is defined so that we can control the order in which the functions
@@ -35,6 +37,8 @@ def heuristic(events,
               initial_solution=None,
               initial_solution_algorithm_kwargs={},
               objective_function_algorithm_kwargs={},
+              time_limit=None,
+              trace=False,
               **kwargs):
     """
     Compute a schedule using a heuristic
@@ -54,6 +58,14 @@ def heuristic(events,
        necessary.
     objective_function: callable
         from lp_problem.objective_functions
+    time_limit : float, optional
+        the number of seconds for both searches. The search for the initial
+        solution is given half of it if there is an objective function and
+        the search for the objective function the time that is left. It is
+        passed to the algorithm as a deadline.
+    trace : bool
+        whether to record the progress of the searches in a
+        :py:class:`heuristics.Trace` for each of them
     kwargs : keyword arguments
         arguments for the objective function
 
@@ -62,6 +74,10 @@ def heuristic(events,
     list
         A list of tuples giving the event and slot index (for the given
         events and slots lists) for all scheduled items.
+    dict
+        If trace is True, the Trace of the search for the initial solution
+        and of that for the objective function (for those which are run)
+        with keys 'initial_solution' and 'objective_function'.
 
     Example
     -------
@@ -75,11 +91,29 @@ def heuristic(events,
 
         [(0, 1), (1, 4), (2, 5)]
     """
-    def count_violations(array):
-        return len(list(val.array_violations(array, events, slots)))
+    if time_limit is not None:
+        start = time.monotonic()
+        deadline = start + time_limit
+        if objective_function is not None:
+            initial_deadline = start + time_limit / 2
+        else:
+            initial_deadline = deadline
+        initial_solution_algorithm_kwargs = {
+            'deadline': initial_deadline, **initial_solution_algorithm_kwargs}
+        objective_function_algorithm_kwargs = {
+            'deadline': deadline, **objective_function_algorithm_kwargs}
+
+    model = lp.utils.ConferenceModel(events=events, slots=slots)
+    count_violations = val.ViolationTracker(events, slots, model=model)
+    traces = {}
 
     if initial_solution is None:
-        X = heu.get_initial_array(events=events, slots=slots)
+        X = heu.get_greedy_initial_array(events, slots, model=model)
+        if trace:
+            traces['initial_solution'] = heu.Trace()
+            initial_solution_algorithm_kwargs = {
+                **initial_solution_algorithm_kwargs,
+                'trace': traces['initial_solution']}
         X = algorithm(initial_array=X,
                       objective_function=count_violations,
                       lower_bound=0,
@@ -89,20 +123,27 @@ def heuristic(events,
 
     if objective_function is not None:
 
-        kwargs["beta"] = float('inf')
-        def func(array):
-            return objective_function(
-                events=events, slots=slots, X=array, **kwargs)
+        func = of.compiled_objective(
+            objective_function, events=events, slots=slots, **kwargs)
 
+        if trace:
+            traces['objective_function'] = heu.Trace()
+            objective_function_algorithm_kwargs = {
+                **objective_function_algorithm_kwargs,
+                'trace': traces['objective_function']}
         X = algorithm(initial_array=X,
                       objective_function=func,
                       acceptance_criteria=count_violations,
                       **objective_function_algorithm_kwargs)
 
-    return list(zip(*np.nonzero(X)))
+    scheduled = list(zip(*np.nonzero(X)))
+    if trace:
+        return scheduled, traces
+    return scheduled
 
 
-def solution(events, slots, objective_function=None, solver=None, **kwargs):
+def solution(events, slots, objective_function=None, solver=None,
+             sparse=False, clashes='pairwise', **kwargs):
     """Compute a schedule in solution form
 
     Parameters
@@ -112,9 +153,21 @@ def solution(events, slots, objective_function=None, solver=None, **kwargs):
     slots : list or tuple
         of :py:class:`resources.Slot` instances
     solver : pulp.solver
-        a pulp solver
+        a pulp solver, defaults to pulp's default solver (with
+        warmStart=True if it is CBC). A maximum matching of the events to
+        their available slots is given as the initial values of the
+        variables: pass warmStart=True when giving a CBC solver for it to be
+        used.
     objective_function: callable
         from lp_problem.objective_functions
+    sparse : bool
+        if True, variables are only created for the event and slot pairs
+        for which the event is available so that the problem has fewer
+        variables and constraints
+    clashes : str
+        the formulation of the constraints preventing clashes between
+        events: either 'pairwise' or 'clique' (see
+        lp_problem.constraints.all_constraints)
     kwargs : keyword arguments
         arguments for the objective function
 
@@ -124,6 +177,13 @@ def solution(events, slots, objective_function=None, solver=None, **kwargs):
         A list of tuples giving the event and slot index (for the given
         events and slots lists) for all scheduled items.
 
+    Raises
+    ------
+    ValueError
+        if there is no solution. Events which cannot all be given different
+        slots for which they are available are named without calling the
+        solver.
+
     Example
     -------
     For a solution where
@@ -136,20 +196,31 @@ def solution(events, slots, objective_function=None, solver=None, **kwargs):
 
         [(0, 1), (1, 4), (2, 5)]
     """
-    shape = Shape(len(events), len(slots))
-    problem = pulp.LpProblem()
-    X = lp.utils.variables(shape)
-    beta = pulp.LpVariable("upper_bound")
-
-    for constraint in lp.constraints.all_constraints(
-        events, slots, X, beta, 'lpsum'
-    ):
-        problem += constraint.condition
-
-    if objective_function is not None:
-        problem += objective_function(events=events, slots=slots, X=X,
-                                      beta=beta,
-                                      **kwargs)
+    model = lp.utils.ConferenceModel(events=events, slots=slots)
+    slot_availability = lp.utils.slot_availability_array(
+        events, slots, model=model)
+
+    # Every event must be matched to a different slot for which it is
+    # available for there to be a solution
+    matching = lp.utils.maximum_matching(slot_availability != 0)
+    unmatched = np.flatnonzero(matching == -1)
+    if len(unmatched) > 0:
+        names = ', '.join(events[event].name for event in unmatched)
+        raise ValueError(
+            f'No valid solution found: no available slots left for {names}')
+
+    # The constraints are built as a sparse matrix and added to the problem
+    # in bulk rather than as one pulp expression at a time
+    problem, X, beta = lp.matrix.build_problem(
+        events, slots, objective_function=objective_function,
+        availability=slot_availability if sparse else None,
+        clashes=clashes, model=model, **kwargs)
+
+    # The matching is given as a starting point for solvers which use one
+    if solver is None:
+        solver = lp.utils.default_solver()
+    for (event, slot), variable in X.items():
+        variable.setInitialValue(int(matching[event] == slot))
 
     status = problem.solve(solver=solver)
     if status == 1:
@@ -1,8 +1,11 @@
+import numpy as np
 from conference_scheduler import converter
 from conference_scheduler.lp_problem import constraints
+from conference_scheduler.lp_problem import utils as lpu
+from conference_scheduler.heuristics import utils as hu
 
 
-def array_violations(array, events, slots, beta=None):
+def array_violations(array, events, slots, beta=None, model=None):
     """Take a schedule in array form and return any violated constraints
 
     Parameters
@@ -13,9 +16,10 @@ def array_violations(array, events, slots, beta=None):
             of resources.Event instances
         slots : list or tuple
             of resources.Slot instances
-        constraints : list or tuple
-            of generator functions which each produce instances of
-            resources.Constraint
+        beta : float, optional
+            an upper bound on the overflow of events in slots
+        model : lp_problem.ConferenceModel, optional
+            a prebuilt model of the events and slots
 
     Returns
     -------
@@ -25,11 +29,260 @@ def array_violations(array, events, slots, beta=None):
     """
     return (
         c.label
-        for c in constraints.all_constraints(events, slots, array, beta=beta)
+        for c in constraints.all_constraints(
+            events, slots, array, beta=beta, model=model)
         if not c.condition
     )
 
 
+class ArrayValidator:
+    """Count the violated constraints of schedules in array form
+
+    Everything that does not depend on the array is computed once so that
+    the counts are quick to obtain for many arrays of zeros and ones. The
+    totals are the same as the number of constraints given by
+    :py:func:`array_violations`.
+
+    Parameters
+    ----------
+        events : list or tuple
+            of resources.Event instances
+        slots : list or tuple
+            of resources.Slot instances
+        beta : float, optional
+            an upper bound on the overflow of events in slots
+        model : lp_problem.ConferenceModel, optional
+            a prebuilt model of the events and slots
+    """
+    def __init__(self, events, slots, beta=None, model=None):
+        if model is None:
+            model = lpu.ConferenceModel(events=events, slots=slots)
+        self.unavailable = lpu.slot_availability_array(
+            events, slots, model=model) == 0
+
+        pairs = model.slot_intervals.pairs()
+        self.slots, self.other_slots = pairs[:, 0], pairs[:, 1]
+        conflicts = lpu.event_availability_array(events, model=model) == 0
+        conflicts &= model.event_has_unavailability[:, None]
+        self.events = np.flatnonzero(conflicts.any(axis=1))
+        self.conflicts = conflicts[self.events].astype(float)
+
+        self.beta = beta
+        if beta is not None:
+            self.overflow_slots = lpu.overflow_slots(
+                events, slots, model=model)
+            self.demands = model.demands
+            self.capacities = model.capacities[self.overflow_slots]
+
+    def counts(self, array):
+        """Return the number of violated constraints of each type
+
+        Parameters
+        ----------
+            array : np.array
+                a schedule in array form
+
+        Returns
+        -------
+            dict
+                mapping the name of each type of constraint to the number of
+                those constraints violated by the array
+        """
+        X = np.asarray(array)
+        counts = {
+            'schedule_all_events': np.count_nonzero(X.sum(axis=1) != 1),
+            'max_one_event_per_slot': np.count_nonzero(X.sum(axis=0) > 1),
+            'events_available_in_scheduled_slot': np.count_nonzero(
+                X[self.unavailable] > 0),
+            'events_available_during_other_events': int(np.sum(
+                X[self.events][:, self.slots] *
+                (self.conflicts @ X[:, self.other_slots]))),
+        }
+        if self.beta is not None:
+            overflow = (
+                self.demands @ X[:, self.overflow_slots] - self.capacities)
+            counts['upper_bound_on_event_overflow'] = np.count_nonzero(
+                overflow > self.beta)
+        return {name: int(count) for name, count in counts.items()}
+
+    def __call__(self, array):
+        """Return the total number of violated constraints"""
+        return sum(self.counts(array).values())
+
+
+class ViolationTracker(ArrayValidator):
+    """Count the violated constraints of a schedule as events are moved
+
+    The tracker holds a schedule in which every event is scheduled in exactly
+    one slot and every slot has at most one event as an Assignment of
+    :py:mod:`conference_scheduler.heuristics`. The change in the number of
+    violated constraints for a move of
+    :py:mod:`conference_scheduler.heuristics` is computed from the slots
+    concurrent with the two slots involved only.
+
+    Calling the tracker counts the violations of any array as for
+    :py:class:`ArrayValidator`.
+    """
+    def __init__(self, events, slots, beta=None, model=None):
+        if model is None:
+            model = lpu.ConferenceModel(events=events, slots=slots)
+        super().__init__(events, slots, beta=beta, model=model)
+        number_of_events, number_of_slots = model.shape
+
+        # Arrays are given an extra row (or column) of zeros for empty slots
+        self._unavailable = np.zeros(
+            (number_of_events + 1, number_of_slots), dtype=np.int64)
+        self._unavailable[:-1] = self.unavailable
+        self._conflicts = np.zeros(
+            (number_of_events + 1, number_of_events + 1), dtype=np.int64)
+        self._conflicts[self.events, :-1] = self.conflicts
+        self._overflowing = np.zeros(
+            (number_of_events + 1, number_of_slots), dtype=np.int64)
+        if beta is not None:
+            demands = np.append(self.demands, 0)[:, None]
+            self._overflowing[:, self.overflow_slots] = (
+                demands - self.capacities > beta)
+
+        # The indices of the concurrent pairs of slots of each slot
+        pair_slots = np.concatenate((self.slots, self.other_slots))
+        order = np.argsort(pair_slots, kind='stable')
+        bounds = np.searchsorted(
+            pair_slots[order], np.arange(number_of_slots + 1))
+        pair_indices = order % len(self.slots) if len(self.slots) else order
+        self._slot_pairs = [
+            pair_indices[start:end]
+            for start, end in zip(bounds[:-1], bounds[1:])]
+
+        # The slots concurrent with each slot, in the pairs of which it is
+        # first (or second), padded with an empty slot
+        self._following = _padded_slots(
+            self.slots, self.other_slots, number_of_slots)
+        self._preceding = _padded_slots(
+            self.other_slots, self.slots, number_of_slots)
+
+        self.assignment = None
+
+    def reset(self, array):
+        """Set the schedule to an array"""
+        self.assignment = hu.array_to_assignment(array)
+
+    def _clashes(self, pairs):
+        event_in = self.assignment.event_in
+        return self._conflicts[
+            event_in[self.slots[pairs]],
+            event_in[self.other_slots[pairs]]].sum()
+
+    def delta(self, move):
+        """Return the change in the number of violated constraints for a
+        move"""
+        event, slot, new_slot, other_event = move
+        other = -1 if other_event is None else other_event
+        pairs = np.union1d(self._slot_pairs[slot], self._slot_pairs[new_slot])
+
+        before = self._clashes(pairs)
+        self.assignment.apply(move)
+        after = self._clashes(pairs)
+        self.assignment.undo(move)
+
+        unavailable = self._unavailable
+        overflowing = self._overflowing
+        return int(
+            after - before +
+            unavailable[event, new_slot] + unavailable[other, slot] -
+            unavailable[event, slot] - unavailable[other, new_slot] +
+            overflowing[event, new_slot] + overflowing[other, slot] -
+            overflowing[event, slot] - overflowing[other, new_slot])
+
+    def _batch_clashes(self, event_in, slot, new_slot, event, other_event):
+        """Return the number of clashes involving the two slots of each of a
+        batch of moves with the given events in them"""
+        conflicts = self._conflicts
+        clashes = 0
+        for slots, events in ((slot, event), (new_slot, other_event)):
+            for neighbours, following in ((self._following[slots], True),
+                                          (self._preceding[slots], False)):
+                occupants = event_in[neighbours]
+                occupants = np.where(
+                    neighbours == slot[:, None], event[:, None], occupants)
+                occupants = np.where(
+                    neighbours == new_slot[:, None], other_event[:, None],
+                    occupants)
+                if following:
+                    clashes += conflicts[events[:, None], occupants].sum(1)
+                else:
+                    clashes += conflicts[occupants, events[:, None]].sum(1)
+
+        # Pairs of the two slots are counted for both of them
+        clashes -= (
+            (self._following[slot] == new_slot[:, None]).sum(1) *
+            conflicts[event, other_event] +
+            (self._following[new_slot] == slot[:, None]).sum(1) *
+            conflicts[other_event, event])
+        return clashes
+
+    def deltas(self, moves):
+        """Return the changes in the number of violated constraints for a
+        batch of moves"""
+        event, slot, new_slot, other = moves
+        event_in = np.append(self.assignment.event_in, -1)
+
+        before = self._batch_clashes(event_in, slot, new_slot, event, other)
+        after = self._batch_clashes(event_in, slot, new_slot, other, event)
+
+        unavailable = self._unavailable
+        overflowing = self._overflowing
+        return (
+            after - before +
+            unavailable[event, new_slot] + unavailable[other, slot] -
+            unavailable[event, slot] - unavailable[other, new_slot] +
+            overflowing[event, new_slot] + overflowing[other, slot] -
+            overflowing[event, slot] - overflowing[other, new_slot])
+
+    def apply(self, move):
+        """Apply a move to the schedule"""
+        self.assignment.apply(move)
+
+
+def _padded_slots(slots, other_slots, number_of_slots):
+    """Return an array whose row s gives other_slots[i] for each pair i with
+    slots[i] == s, padded with number_of_slots"""
+    counts = np.bincount(slots, minlength=number_of_slots)
+    width = counts.max() if len(slots) else 0
+    padded = np.full((number_of_slots, width), number_of_slots, dtype=np.int64)
+    order = np.argsort(slots, kind='stable')
+    starts = np.cumsum(counts) - counts
+    positions = np.arange(len(slots)) - starts[slots[order]]
+    padded[slots[order], positions] = other_slots[order]
+    return padded
+
+
+def array_violation_counts(array, events, slots, beta=None, model=None):
+    """Take a schedule in array form and return the number of violated
+    constraints of each type
+
+    Parameters
+    ----------
+        array : np.array
+            a schedule in array form of zeros and ones
+        events : list or tuple
+            of resources.Event instances
+        slots : list or tuple
+            of resources.Slot instances
+        beta : float, optional
+            an upper bound on the overflow of events in slots
+        model : lp_problem.ConferenceModel, optional
+            a prebuilt model of the events and slots
+
+    Returns
+    -------
+        dict
+            mapping the name of each type of constraint to the number of
+            those constraints violated by the array
+    """
+    return ArrayValidator(
+        events, slots, beta=beta, model=model).counts(array)
+
+
 def is_valid_array(array, events, slots):
     """Take a schedule in array form and return whether it is a valid
     solution for the given constraints
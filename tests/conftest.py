@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 import pytest
 import numpy as np
 from conference_scheduler.resources import (
@@ -56,6 +56,11 @@ def shape(events, slots):
     return Shape(len(events), len(slots))
 
 
+@pytest.fixture(scope='module')
+def model(events, slots):
+    return lpu.ConferenceModel(events=events, slots=slots)
+
+
 @pytest.fixture(scope='module')
 def tag_array(events):
     return lpu.tag_array(events)
@@ -111,3 +116,55 @@ def valid_schedule(events, slots):
         ScheduledItem(event=events[1], slot=slots[4]),
         ScheduledItem(event=events[2], slot=slots[5])
     ]
+
+
+@pytest.fixture(scope='module')
+def random_conference():
+    """
+    A larger randomly generated conference with overlapping slots of
+    different lengths, shared tags and unavailability of slots and events
+    """
+    random_state = np.random.RandomState(0)
+    start = datetime(2017, 10, 26, 9, 0)
+    slots = [
+        Slot(venue=f'Room {i % 4}',
+             starts_at=start + timedelta(minutes=int(
+                 30 * random_state.randint(12))),
+             duration=int(random_state.choice([30, 60, 90])),
+             capacity=int(random_state.randint(10, 200)),
+             session=f'Session {i % 3}')
+        for i in range(24)
+    ]
+    events = [
+        Event(name=f'Talk {i}',
+              duration=int(random_state.choice([30, 30, 60])),
+              demand=int(random_state.randint(0, 200)),
+              tags=[f'tag {tag}' for tag in random_state.choice(
+                  5, size=random_state.randint(0, 3), replace=False)])
+        for i in range(15)
+    ]
+    for event in events:
+        event.add_unavailability(
+            *[slots[i] for i in random_state.choice(24, size=2)])
+        if random_state.random_sample() < 0.5:
+            event.add_unavailability(events[random_state.randint(15)])
+    return events, slots
+
+
+@pytest.fixture(scope='module')
+def one_way_conference(random_conference):
+    """
+    The random conference with the unavailability of every other event
+    removed so that some pairs of conflicting events (those sharing a tag or
+    listed by only one of them) are only constrained in one order
+    """
+    events, slots = random_conference
+    events = [
+        Event(name=event.name, duration=event.duration, demand=event.demand,
+              tags=event.tags, unavailability=event.unavailability)
+        if i % 2 else
+        Event(name=event.name, duration=event.duration, demand=event.demand,
+              tags=event.tags)
+        for i, event in enumerate(events)
+    ]
+    return events, slots
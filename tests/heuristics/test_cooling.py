@@ -0,0 +1,120 @@
+import numpy as np
+from conference_scheduler.validator import ViolationTracker
+from conference_scheduler.heuristics import (
+    ExponentialCooling, GeometricCooling, LinearCooling, AdaptiveCooling,
+    acceptance_probability, simulated_annealing, get_initial_array, Trace
+)
+
+
+def temperatures(schedule, accepted, initial_temperature=100,
+                 max_iterations=10):
+    schedule.start(initial_temperature, max_iterations)
+    temperature = initial_temperature
+    values = []
+    for iterations in range(1, max_iterations + 1):
+        temperature = schedule(
+            temperature, iterations, accepted[iterations - 1])
+        values.append(temperature)
+    return values
+
+
+def test_exponential_cooling():
+    values = temperatures(ExponentialCooling(0.5), [True] * 10)
+    assert values[:3] == [50, 12.5, 1.5625]
+
+
+def test_geometric_cooling():
+    values = temperatures(GeometricCooling(0.5), [True] * 10)
+    assert values[:3] == [50, 25, 12.5]
+
+
+def test_linear_cooling():
+    values = temperatures(LinearCooling(), [True] * 10)
+    assert np.allclose(values, np.arange(90, -1, -10))
+
+
+def test_adaptive_cooling():
+    schedule = AdaptiveCooling(
+        initial_acceptance_rate=0.5, cooldown_rate=0.5, window=2)
+    accepted = [True, True, False, False, True, False, False, False, True,
+                True]
+    values = temperatures(schedule, accepted)
+    # The target rate is 0.4, 0.3, 0.2, 0.1 and 0 after each window
+    assert values == [100, 50, 50, 100, 100, 50, 50, 100, 100, 50]
+
+
+def test_acceptance_probability():
+    assert acceptance_probability(0, 1) == 1
+    assert acceptance_probability(1, 1) == np.exp(-1)
+    assert acceptance_probability(1, 1e-320) == 0
+
+
+def test_simulated_annealing_with_cooling_schedules(random_conference):
+    events, slots = random_conference
+    tracker = ViolationTracker(events, slots)
+    array = get_initial_array(events, slots, seed=2)
+
+    for schedule in (GeometricCooling(0.99), LinearCooling(),
+                     AdaptiveCooling()):
+        X = simulated_annealing(initial_array=array,
+                                objective_function=tracker,
+                                initial_temperature=10,
+                                cooling_schedule=schedule,
+                                max_iterations=500,
+                                rng=np.random.default_rng(0))
+        assert tracker(X) < tracker(array)
+
+
+class RecordingCooling(GeometricCooling):
+
+    def start(self, initial_temperature, max_iterations):
+        self.temperatures = []
+
+    def __call__(self, temperature, iterations, accepted):
+        self.temperatures.append(temperature)
+        return super().__call__(temperature, iterations, accepted)
+
+
+def test_simulated_annealing_reheats(slots, events):
+    array = np.array([
+        [1, 0, 0, 0, 0, 0, 0],
+        [0, 1, 0, 0, 0, 0, 0],
+        [0, 0, 1, 0, 0, 0, 0]
+    ])
+
+    def objective_function(array):
+        return 0
+
+    schedule = RecordingCooling(0.5)
+    simulated_annealing(initial_array=array,
+                        objective_function=objective_function,
+                        initial_temperature=8,
+                        cooling_schedule=schedule,
+                        reheat_after=3,
+                        max_iterations=8,
+                        rng=np.random.default_rng(0))
+    assert schedule.temperatures == [8, 4, 2, 8, 4, 2, 8, 4, 2]
+
+
+def test_simulated_annealing_reheats_with_exponential_cooling(slots, events):
+    array = np.array([
+        [1, 0, 0, 0, 0, 0, 0],
+        [0, 1, 0, 0, 0, 0, 0],
+        [0, 0, 1, 0, 0, 0, 0]
+    ])
+
+    def objective_function(array):
+        return 0
+
+    # The temperature only depends on the iterations since the last reheat
+    trace = Trace()
+    simulated_annealing(initial_array=array,
+                        objective_function=objective_function,
+                        initial_temperature=8,
+                        cooldown_rate=0.5,
+                        reheat_after=3,
+                        max_iterations=8,
+                        trace=trace,
+                        rng=np.random.default_rng(0))
+    temperatures = [record.temperature for record in trace.records]
+    assert temperatures == [8, 4, 1, 8, 4, 1, 8, 4, 1, 8]
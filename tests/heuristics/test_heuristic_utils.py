@@ -1,7 +1,23 @@
+import pytest
+import time
+import importlib
 import numpy as np
+from conference_scheduler import validator, heuristics
 from conference_scheduler.heuristics import utils as hu
 
 
+def test_package_exports_only_public_names():
+    for name in ('np', 'os', 'time', 'pulp', 'partial', 'lpu', 'lpm',
+                 'warnings', '_run_chain', '_timed', '_random_integer'):
+        assert not hasattr(heuristics, name)
+    for module_name in ('utils', 'cooling', 'trace', 'parallel',
+                        'large_neighbourhood_search'):
+        module = importlib.import_module(
+            f'conference_scheduler.heuristics.{module_name}')
+        for name in module.__all__:
+            assert getattr(heuristics, name) is getattr(module, name)
+
+
 # Tests for array form
 
 def test_neighbourhood_move_to_unused():
@@ -52,3 +68,232 @@ def test_get_initial_array(events, slots):
         [0, 1, 0, 0, 0, 0, 0]
     ])
     assert np.array_equal(X, expected_array)
+
+
+@pytest.mark.parametrize('seed, expected_move', [
+    (0, hu.Move(event=0, slot=2, new_slot=6)),
+    (35, hu.Move(event=1, slot=4, new_slot=5, other_event=2)),
+])
+def test_random_move(seed, expected_move):
+    array = np.array([
+        [0, 0, 1, 0, 0, 0, 0],
+        [0, 0, 0, 0, 1, 0, 0],
+        [0, 0, 0, 0, 0, 1, 0]
+    ])
+    np.random.seed(seed)
+    move = hu.random_move(array)
+    assert move == expected_move
+
+    np.random.seed(seed)
+    expected_array = hu.element_from_neighbourhood(array)
+    X = array.copy()
+    hu.apply_move(X, move)
+    assert np.array_equal(X, expected_array)
+
+    hu.apply_move(X, hu.reverse_move(move))
+    assert np.array_equal(X, array)
+
+
+def test_is_assignment_array():
+    assert hu.is_assignment_array(np.array([
+        [0, 0, 1, 0],
+        [1, 0, 0, 0]
+    ]))
+    assert not hu.is_assignment_array(np.array([
+        [0, 0, 1, 0],
+        [0, 0, 1, 0]
+    ]))
+    assert not hu.is_assignment_array(np.array([
+        [0, 0, 1, 1],
+        [1, 0, 0, 0]
+    ]))
+    assert not hu.is_assignment_array(np.array([
+        [0, 0, 0, 0],
+        [1, 0, 0, 0]
+    ]))
+
+
+def test_candidate_value():
+    array = np.array([
+        [0, 1, 1, 0],
+        [1, 0, 0, 0]
+    ])
+    move = hu.Move(event=0, slot=1, new_slot=3)
+    assert hu.candidate_value(np.sum, array, move, 3) == 2
+    assert np.array_equal(array, [[0, 1, 1, 0], [1, 0, 0, 0]])
+
+    class Function:
+        def __call__(self, X):
+            return 0
+
+        def delta(self, move):
+            return move.new_slot
+
+    assert hu.candidate_value(Function(), array, move, 3) == 6
+    functions = hu.incremental_functions(array, Function(), None)
+    assert not hasattr(functions[0], 'delta')
+    assert functions[1] is None
+
+
+# Tests for assignment form
+
+def test_array_to_assignment():
+    array = np.array([
+        [0, 0, 1, 0, 0, 0, 0],
+        [0, 0, 0, 0, 1, 0, 0],
+        [0, 0, 0, 0, 0, 1, 0]
+    ])
+    assignment = hu.array_to_assignment(array)
+    assert assignment.slot_of.dtype == np.int32
+    assert assignment.shape == (3, 7)
+    assert np.array_equal(assignment.slot_of, [2, 4, 5])
+    assert np.array_equal(assignment.event_in, [-1, -1, 0, -1, 1, 2, -1])
+
+    X = hu.assignment_to_array(assignment)
+    assert X.dtype == np.int8
+    assert np.array_equal(X, array)
+
+    with pytest.raises(ValueError):
+        hu.array_to_assignment(np.array([
+            [0, 0, 1, 0, 0, 0, 0],
+            [0, 0, 1, 0, 0, 0, 0],
+            [0, 0, 0, 0, 0, 1, 0]
+        ]))
+
+
+@pytest.mark.parametrize('seed', [0, 35])
+def test_assignment_moves(seed):
+    array = np.array([
+        [0, 0, 1, 0, 0, 0, 0],
+        [0, 0, 0, 0, 1, 0, 0],
+        [0, 0, 0, 0, 0, 1, 0]
+    ])
+    assignment = hu.array_to_assignment(array)
+    np.random.seed(seed)
+    move = assignment.random_move()
+    np.random.seed(seed)
+    assert move == hu.random_move(array)
+
+    np.random.seed(seed)
+    expected_array = hu.element_from_neighbourhood(array)
+    copy = assignment.copy()
+    assignment.apply(move)
+    assert np.array_equal(hu.assignment_to_array(assignment), expected_array)
+    assert np.array_equal(hu.assignment_to_array(copy), array)
+
+    assignment.undo(move)
+    assert np.array_equal(assignment.slot_of, copy.slot_of)
+    assert np.array_equal(assignment.event_in, copy.event_in)
+
+
+def test_search_state():
+    array = np.array([
+        [0, 0, 1, 0],
+        [1, 0, 0, 0]
+    ])
+    state = hu.SearchState(array.copy(), np.sum)
+    assert state.assignment is not None
+    assert state.array_needed
+    move = hu.Move(event=0, slot=2, new_slot=0, other_event=1)
+    assert state.value(np.sum, move, 2) == 2
+    state.apply(move)
+    assert np.array_equal(state.to_array(), [[1, 0, 0, 0], [0, 0, 1, 0]])
+
+    array = np.array([
+        [0, 1, 1, 0],
+        [1, 0, 0, 0]
+    ])
+    state = hu.SearchState(array.copy(), np.sum)
+    assert state.assignment is None
+    snapshot = state.snapshot(hu.Move(event=0, slot=1, new_slot=3))
+    assert np.array_equal(snapshot, [[0, 0, 0, 1], [1, 0, 0, 0]])
+    assert np.array_equal(state.to_array(), array)
+
+
+def test_assignment_random_moves():
+    array = np.array([
+        [0, 0, 1, 0, 0, 0, 0],
+        [0, 0, 0, 0, 1, 0, 0],
+        [0, 0, 0, 0, 0, 1, 0]
+    ])
+    assignment = hu.array_to_assignment(array)
+    moves = assignment.random_moves(100, rng=np.random.default_rng(0))
+    assert len(moves) == 100
+    for index in range(len(moves)):
+        move = moves.move(index)
+        assert move.slot == assignment.slot_of[move.event]
+        assert move.new_slot != move.slot
+        other_event = assignment.event_in[move.new_slot]
+        assert move.other_event == (None if other_event == -1
+                                    else other_event)
+
+    listed = [moves.move(index) for index in range(len(moves))]
+    for field, expected in zip(hu.moves_from_list(listed), moves):
+        assert np.array_equal(field, expected)
+    assert len(hu.moves_from_list([])) == 0
+
+
+def test_search_state_values():
+    array = np.array([
+        [0, 0, 1, 0],
+        [1, 0, 0, 0]
+    ])
+    state = hu.SearchState(array.copy(), np.sum, rng=np.random.default_rng(0))
+    moves = state.random_moves(5)
+
+    def first_column(X):
+        return X[:, 0].sum()
+
+    expected = [state.value(first_column, moves.move(index), 1)
+                for index in range(len(moves))]
+    assert np.array_equal(state.values(first_column, moves, 1), expected)
+    assert np.array_equal(state.to_array(), array)
+
+    state = hu.SearchState(
+        np.array([[0, 1, 1, 0], [1, 0, 0, 0]]), np.sum,
+        rng=np.random.default_rng(0))
+    assert state.assignment is None
+    assert len(state.random_moves(5)) == 5
+
+
+def test_get_greedy_initial_array(events, slots):
+    X = hu.get_greedy_initial_array(events=events, slots=slots)
+    expected_array = np.array([
+        [0, 0, 1, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 1, 0],
+        [0, 0, 0, 0, 0, 0, 1]
+    ])
+    assert np.array_equal(X, expected_array)
+
+
+def test_get_greedy_initial_array_is_valid(random_conference):
+    events, slots = random_conference
+    X = hu.get_greedy_initial_array(events=events, slots=slots)
+    assert hu.is_assignment_array(X)
+    assert validator.is_valid_array(X, events, slots)
+
+
+def test_get_greedy_initial_array_with_more_events_than_slots(
+        events, slots):
+    X = hu.get_greedy_initial_array(events=events, slots=slots[:2])
+    assert np.array_equal(X.sum(axis=1), [1, 1, 1])
+
+
+def test_budget_with_max_stagnation():
+    budget = hu.Budget(max_stagnation=2)
+    assert budget.deadline is None
+    assert not budget.exhausted(5)
+    assert not budget.exhausted(5)
+    assert not budget.exhausted(4)
+    assert not budget.exhausted(6)
+    assert budget.exhausted(4)
+
+
+def test_budget_with_time_limit_and_deadline():
+    assert hu.Budget(time_limit=0).exhausted(5)
+    assert hu.Budget(deadline=time.monotonic() - 1).exhausted(5)
+    assert not hu.Budget(time_limit=60).exhausted(5)
+
+    deadline = time.monotonic() + 10
+    assert hu.Budget(time_limit=60, deadline=deadline).deadline == deadline
+    assert hu.Budget(time_limit=0, deadline=deadline).deadline < deadline
@@ -1,7 +1,9 @@
+import pytest
 import numpy as np
 from conference_scheduler.lp_problem import objective_functions as of
-from conference_scheduler.validator import array_violations
-from conference_scheduler.heuristics import hill_climber
+from conference_scheduler.validator import array_violations, ViolationTracker
+from conference_scheduler.heuristics import (
+    hill_climber, get_initial_array, is_assignment_array)
 
 
 def test_hill_climber_for_valid_solution(slots, events):
@@ -113,3 +115,122 @@ def test_hill_climbing_for_obj_function_with_criteria(slots, events):
                      max_iterations=100)
 
     assert objective_function(X) == 100
+
+
+def test_hill_climber_with_violation_tracker(random_conference):
+    events, slots = random_conference
+    tracker = ViolationTracker(events, slots)
+
+    def objective_function(array):
+        return len(list(array_violations(array, events, slots)))
+
+    array = get_initial_array(events, slots, seed=2)
+    np.random.seed(0)
+    expected = hill_climber(initial_array=array,
+                            objective_function=objective_function,
+                            max_iterations=100)
+    np.random.seed(0)
+    X = hill_climber(initial_array=array,
+                     objective_function=tracker,
+                     max_iterations=100)
+    assert np.array_equal(X, expected)
+    assert objective_function(X) < objective_function(array)
+
+
+def test_hill_climber_in_batches(random_conference):
+    events, slots = random_conference
+    tracker = ViolationTracker(events, slots)
+    array = get_initial_array(events, slots, seed=2)
+
+    X = hill_climber(initial_array=array,
+                     objective_function=tracker,
+                     batch_size=16,
+                     max_iterations=100,
+                     rng=np.random.default_rng(0))
+    assert tracker(X) < tracker(array)
+
+
+def test_hill_climbing_in_batches_with_criteria(slots, events):
+
+    def objective_function(array):
+        return of.efficiency_capacity_demand_difference(slots, events, array)
+
+    def acceptance_criteria(array):
+        return sum(array[:, 3])
+
+    array = np.array([
+        [1, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 1, 0, 0],
+        [0, 1, 0, 0, 0, 0, 0]
+    ])
+
+    X = hill_climber(initial_array=array,
+                     objective_function=objective_function,
+                     acceptance_criteria=acceptance_criteria,
+                     batch_size=10,
+                     max_iterations=20,
+                     rng=np.random.default_rng(0))
+
+    assert acceptance_criteria(X) == 0
+    assert objective_function(X) == 100
+
+
+def test_hill_climber_with_time_limit(random_conference):
+    events, slots = random_conference
+    tracker = ViolationTracker(events, slots)
+    array = get_initial_array(events, slots, seed=2)
+
+    with pytest.warns(UserWarning, match='after 0 iterations'):
+        X = hill_climber(initial_array=array,
+                         objective_function=tracker,
+                         lower_bound=0,
+                         time_limit=0)
+    assert np.array_equal(X, array)
+
+
+def test_hill_climber_with_max_stagnation(random_conference):
+    events, slots = random_conference
+    tracker = ViolationTracker(events, slots)
+    array = get_initial_array(events, slots, seed=2)
+    calls = 0
+
+    def objective_function(array):
+        nonlocal calls
+        calls += 1
+        return tracker(array)
+
+    X = hill_climber(initial_array=array,
+                     objective_function=objective_function,
+                     max_iterations=10 ** 6,
+                     max_stagnation=50,
+                     rng=np.random.default_rng(0))
+    assert calls < 10 ** 4
+    assert tracker(X) < tracker(array)
+
+
+def test_hill_climber_anytime(random_conference):
+    events, slots = random_conference
+    tracker = ViolationTracker(events, slots)
+    array = get_initial_array(events, slots, seed=2)
+    calls = 0
+
+    def objective_function(array):
+        nonlocal calls
+        calls += 1
+        if calls > 200:
+            raise KeyboardInterrupt
+        return tracker(array)
+
+    with pytest.raises(KeyboardInterrupt):
+        hill_climber(initial_array=array,
+                     objective_function=objective_function,
+                     rng=np.random.default_rng(0))
+
+    calls = 0
+    X = hill_climber(initial_array=array,
+                     objective_function=objective_function,
+                     anytime=True,
+                     rng=np.random.default_rng(0))
+    assert calls == 201
+    assert is_assignment_array(X)
+    assert tracker(X) < tracker(array)
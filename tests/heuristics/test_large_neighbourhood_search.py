@@ -0,0 +1,98 @@
+import pytest
+import numpy as np
+from conference_scheduler import validator
+from conference_scheduler.converter import array_to_schedule
+from conference_scheduler.lp_problem import objective_functions as of
+from conference_scheduler.heuristics import large_neighbourhood_search, Trace
+
+
+@pytest.fixture
+def array():
+    return np.array([
+        [0, 0, 0, 1, 0, 0, 0],
+        [1, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 1]
+    ])
+
+
+def test_large_neighbourhood_search_solves_whole_problem(
+    slots, events, array
+):
+    assert validator.is_valid_array(array, events, slots)
+    assert of.efficiency_capacity_demand_difference(
+        slots, events, array) == 290
+
+    X = large_neighbourhood_search(
+        events, slots, array,
+        objective_function=of.efficiency_capacity_demand_difference,
+        neighbourhood='random', neighbourhood_size=3, max_iterations=1,
+        rng=np.random.default_rng(0))
+    assert validator.is_valid_array(X, events, slots)
+    assert of.efficiency_capacity_demand_difference(slots, events, X) == 100
+
+
+@pytest.mark.parametrize('neighbourhood', ['session', 'conflict', 'random'])
+def test_large_neighbourhood_search(slots, events, array, neighbourhood):
+    X = large_neighbourhood_search(
+        events, slots, array,
+        objective_function=of.efficiency_capacity_demand_difference,
+        neighbourhood=neighbourhood, neighbourhood_size=2, max_iterations=5,
+        clashes='pairwise', rng=np.random.default_rng(0))
+    assert validator.is_valid_array(X, events, slots)
+    assert of.efficiency_capacity_demand_difference(slots, events, X) < 290
+
+
+def test_large_neighbourhood_search_with_kwargs(slots, events, array):
+    original_schedule = list(array_to_schedule(array, events, slots))
+    np.random.seed(0)
+    X = large_neighbourhood_search(
+        events, slots, array, objective_function=of.number_of_changes,
+        max_iterations=5, original_schedule=original_schedule)
+    assert np.array_equal(X, array)
+
+
+def test_large_neighbourhood_search_without_objective(
+    slots, events, array
+):
+    X = large_neighbourhood_search(
+        events, slots, array, max_iterations=2,
+        rng=np.random.default_rng(0))
+    assert validator.is_valid_array(X, events, slots)
+
+
+def test_large_neighbourhood_search_with_time_limit(slots, events, array):
+    X = large_neighbourhood_search(
+        events, slots, array,
+        objective_function=of.efficiency_capacity_demand_difference,
+        neighbourhood='random', neighbourhood_size=3, time_limit=0,
+        rng=np.random.default_rng(0))
+    assert np.array_equal(X, array)
+
+
+def test_large_neighbourhood_search_with_max_stagnation(slots, events, array):
+    X = large_neighbourhood_search(
+        events, slots, array,
+        objective_function=of.efficiency_capacity_demand_difference,
+        neighbourhood='random', neighbourhood_size=3, max_iterations=10 ** 6,
+        max_stagnation=2, rng=np.random.default_rng(0))
+    assert of.efficiency_capacity_demand_difference(slots, events, X) == 100
+
+
+def test_large_neighbourhood_search_with_trace(slots, events, array):
+    trace = Trace()
+    X = large_neighbourhood_search(
+        events, slots, array,
+        objective_function=of.efficiency_capacity_demand_difference,
+        neighbourhood='random', neighbourhood_size=3, max_iterations=2,
+        trace=trace, rng=np.random.default_rng(0))
+    assert [record.iteration for record in trace.records] == [0, 1, 2]
+    assert [record.current_energy for record in trace.records] == [
+        290, 100, 100]
+    assert trace.counts == {'solver': 4, 'objective': 2}
+    assert trace.times['solver'] > 0
+
+
+def test_large_neighbourhood_search_needs_assignment(slots, events):
+    array = np.zeros((len(events), len(slots)))
+    with pytest.raises(ValueError):
+        large_neighbourhood_search(events, slots, array)
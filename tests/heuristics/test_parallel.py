@@ -0,0 +1,217 @@
+import pytest
+import numpy as np
+from conference_scheduler.lp_problem import objective_functions as of
+from conference_scheduler.validator import ViolationTracker
+from conference_scheduler.heuristics import (
+    multi_start, parallel_tempering, hill_climber, tabu_search,
+    simulated_annealing, get_initial_array, Trace
+)
+
+
+def test_algorithms_with_generator(random_conference):
+    events, slots = random_conference
+    tracker = ViolationTracker(events, slots)
+    array = get_initial_array(events, slots, seed=2)
+    for algorithm in (hill_climber, simulated_annealing, tabu_search):
+        state = np.random.get_state()
+        X = algorithm(initial_array=array,
+                      objective_function=tracker,
+                      max_iterations=50,
+                      rng=np.random.default_rng(0))
+        assert np.array_equal(np.random.get_state()[1], state[1])
+        assert np.array_equal(X, algorithm(initial_array=array,
+                                           objective_function=tracker,
+                                           max_iterations=50,
+                                           rng=np.random.default_rng(0)))
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_multi_start(random_conference, processes):
+    events, slots = random_conference
+    tracker = ViolationTracker(events, slots)
+    array = get_initial_array(events, slots, seed=2)
+
+    X = multi_start(initial_array=array,
+                    objective_function=tracker,
+                    algorithm=hill_climber,
+                    number_of_chains=4,
+                    processes=processes,
+                    seed=0,
+                    max_iterations=100)
+
+    chains = [
+        hill_climber(initial_array=array,
+                     objective_function=tracker,
+                     max_iterations=100,
+                     rng=np.random.default_rng(seed_sequence))
+        for seed_sequence in np.random.SeedSequence(0).spawn(4)]
+    assert tracker(X) == min(tracker(chain) for chain in chains)
+    assert tracker(X) < tracker(array)
+
+
+def test_multi_start_with_global_random_state(slots, events):
+    func = of.EfficiencyCapacityDemandDifference(events, slots)
+    array = np.array([
+        [1, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 1, 0, 0],
+        [0, 1, 0, 0, 0, 0, 0]
+    ])
+    solutions = []
+    for _ in range(2):
+        np.random.seed(0)
+        solutions.append(multi_start(initial_array=array,
+                                     objective_function=func,
+                                     number_of_chains=3,
+                                     processes=1,
+                                     max_iterations=10))
+    assert np.array_equal(*solutions)
+    assert func(solutions[0]) < func(array)
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_parallel_tempering(random_conference, processes):
+    events, slots = random_conference
+    tracker = ViolationTracker(events, slots)
+    array = get_initial_array(events, slots, seed=2)
+
+    X = parallel_tempering(initial_array=array,
+                           objective_function=tracker,
+                           temperatures=[0.5, 1, 2, 4],
+                           lower_bound=0,
+                           max_iterations=2000,
+                           processes=processes,
+                           seed=0)
+    assert tracker(X) == 0
+
+
+def test_parallel_tempering_is_reproducible(random_conference):
+    events, slots = random_conference
+    tracker = ViolationTracker(events, slots)
+    array = get_initial_array(events, slots, seed=2)
+
+    solutions = [
+        parallel_tempering(initial_array=array,
+                           objective_function=tracker,
+                           temperatures=[0.5, 1, 2, 4],
+                           max_iterations=200,
+                           processes=processes,
+                           seed=1)
+        for processes in (1, 2)]
+    assert np.array_equal(*solutions)
+
+
+def test_parallel_tempering_with_criteria(slots, events):
+    func = of.EfficiencyCapacityDemandDifference(events, slots)
+
+    def acceptance_criteria(array):
+        return sum(array[:, 3])
+
+    array = np.array([
+        [1, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 1, 0, 0],
+        [0, 1, 0, 0, 0, 0, 0]
+    ])
+    with pytest.warns(UserWarning):
+        X = parallel_tempering(initial_array=array,
+                               objective_function=func,
+                               acceptance_criteria=acceptance_criteria,
+                               lower_bound=-10 ** 4,
+                               max_iterations=100,
+                               processes=1,
+                               seed=0)
+    assert acceptance_criteria(X) == 0
+    assert func(X) == 100
+
+
+@pytest.mark.parametrize('algorithm', [multi_start, parallel_tempering])
+def test_parallel_algorithms_with_time_limit(random_conference, algorithm):
+    events, slots = random_conference
+    tracker = ViolationTracker(events, slots)
+    array = get_initial_array(events, slots, seed=2)
+
+    X = algorithm(initial_array=array,
+                  objective_function=tracker,
+                  processes=1,
+                  time_limit=0,
+                  seed=0)
+    assert np.array_equal(X, array)
+
+    X = algorithm(initial_array=array,
+                  objective_function=tracker,
+                  processes=1,
+                  max_iterations=10 ** 6,
+                  time_limit=0.5,
+                  seed=0)
+    assert tracker(X) < tracker(array)
+
+
+def test_multi_start_default_chains_do_not_depend_on_processes(
+    random_conference
+):
+    events, slots = random_conference
+    tracker = ViolationTracker(events, slots)
+    array = get_initial_array(events, slots, seed=2)
+    solutions = []
+    for processes in (1, 2):
+        trace = Trace()
+        solutions.append(multi_start(initial_array=array,
+                                     objective_function=tracker,
+                                     algorithm=hill_climber,
+                                     processes=processes,
+                                     seed=0,
+                                     max_iterations=50,
+                                     trace=trace))
+        assert trace.counts['objective'] == 4 * 51
+    assert np.array_equal(*solutions)
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_multi_start_with_trace(random_conference, processes):
+    events, slots = random_conference
+    tracker = ViolationTracker(events, slots)
+    array = get_initial_array(events, slots, seed=2)
+    received = []
+    trace = Trace(every=10, callback=received.append)
+
+    X = multi_start(initial_array=array,
+                    objective_function=tracker,
+                    algorithm=hill_climber,
+                    number_of_chains=3,
+                    processes=processes,
+                    seed=0,
+                    max_iterations=50,
+                    trace=trace)
+    assert np.array_equal(X, multi_start(initial_array=array,
+                                         objective_function=tracker,
+                                         algorithm=hill_climber,
+                                         number_of_chains=3,
+                                         processes=processes,
+                                         seed=0,
+                                         max_iterations=50))
+    assert received == list(trace.records)
+    assert trace.records[-1].iteration == 51
+    assert trace.records[-1].best_energy == tracker(X)
+    assert trace.counts['objective'] == 3 * 51
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_parallel_tempering_with_trace(random_conference, processes):
+    events, slots = random_conference
+    tracker = ViolationTracker(events, slots)
+    array = get_initial_array(events, slots, seed=2)
+    trace = Trace()
+
+    X = parallel_tempering(initial_array=array,
+                           objective_function=tracker,
+                           temperatures=[0.5, 1, 2, 4],
+                           max_iterations=200,
+                           exchange_interval=50,
+                           processes=processes,
+                           seed=1,
+                           trace=trace)
+    assert [record.iteration for record in trace.records] == [
+        0, 50, 100, 150, 200]
+    assert trace.records[-1].best_energy == tracker(X)
+    assert trace.records[-1].temperature == 0.5
+    assert 0 < trace.records[-1].acceptance_ratio <= 1
+    assert trace.counts['objective'] == 4 * 200
@@ -1,7 +1,9 @@
 import numpy as np
 from conference_scheduler.lp_problem import objective_functions as of
-from conference_scheduler.validator import array_violations
-from conference_scheduler.heuristics import simulated_annealing
+from conference_scheduler.validator import array_violations, ViolationTracker
+from conference_scheduler.heuristics import (
+    simulated_annealing, get_initial_array
+)
 import warnings
 
 
@@ -167,3 +169,70 @@ def test_simulated_annealing_for_objective_function_cooldown_rate(
                             max_iterations=10)
 
     assert objective_function(X) == 250
+
+
+def test_simulated_annealing_with_violation_tracker(random_conference):
+    events, slots = random_conference
+    tracker = ViolationTracker(events, slots)
+
+    def count_violations(array):
+        return len(list(array_violations(array, events, slots)))
+
+    def objective_function(array):
+        return of.efficiency_capacity_demand_difference(
+            slots=slots, events=events, X=array)
+
+    array = get_initial_array(events, slots, seed=2)
+    np.random.seed(0)
+    expected = simulated_annealing(initial_array=array,
+                                   objective_function=objective_function,
+                                   acceptance_criteria=count_violations,
+                                   max_iterations=100)
+    np.random.seed(0)
+    X = simulated_annealing(initial_array=array,
+                            objective_function=objective_function,
+                            acceptance_criteria=tracker,
+                            max_iterations=100)
+    assert np.array_equal(X, expected)
+
+
+def test_simulated_annealing_with_max_stagnation(random_conference):
+    events, slots = random_conference
+    tracker = ViolationTracker(events, slots)
+    array = get_initial_array(events, slots, seed=2)
+    calls = 0
+
+    def objective_function(array):
+        nonlocal calls
+        calls += 1
+        return tracker(array)
+
+    X = simulated_annealing(initial_array=array,
+                            objective_function=objective_function,
+                            max_iterations=10 ** 6,
+                            max_stagnation=50,
+                            rng=np.random.default_rng(0))
+    assert calls < 10 ** 4
+    assert tracker(X) < tracker(array)
+
+
+def test_simulated_annealing_anytime(random_conference):
+    events, slots = random_conference
+    tracker = ViolationTracker(events, slots)
+    array = get_initial_array(events, slots, seed=2)
+    calls = 0
+
+    def objective_function(array):
+        nonlocal calls
+        calls += 1
+        if calls > 200:
+            raise KeyboardInterrupt
+        return tracker(array)
+
+    X = simulated_annealing(initial_array=array,
+                            objective_function=objective_function,
+                            initial_temperature=1,
+                            anytime=True,
+                            rng=np.random.default_rng(0))
+    assert calls == 201
+    assert tracker(X) < tracker(array)
@@ -0,0 +1,131 @@
+import pytest
+import numpy as np
+from conference_scheduler.lp_problem import objective_functions as of
+from conference_scheduler.validator import array_violations, ViolationTracker
+from conference_scheduler.heuristics import (
+    tabu_search, hill_climber, get_initial_array
+)
+
+
+def test_tabu_search_for_valid_solution(slots, events):
+
+    def objective_function(array):
+        return len(list(array_violations(array, events, slots)))
+
+    array = np.array([
+        [1, 0, 0, 0, 0, 0, 0],
+        [0, 0, 1, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 1, 0]
+    ])
+    assert objective_function(array) == 2
+
+    np.random.seed(0)
+    X = tabu_search(initial_array=array,
+                    lower_bound=0,
+                    objective_function=objective_function,
+                    max_iterations=10)
+
+    assert objective_function(X) == 0
+
+
+def test_tabu_search_warning_raised(slots, events):
+
+    def objective_function(array):
+        return len(list(array_violations(array, events, slots)))
+
+    array = np.array([
+        [1, 0, 0, 0, 0, 0, 0],
+        [0, 0, 1, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 1, 0]
+    ])
+
+    np.random.seed(0)
+    with pytest.warns(UserWarning):
+        tabu_search(initial_array=array,
+                    objective_function=objective_function,
+                    lower_bound=-1,
+                    max_iterations=1)
+
+
+def test_tabu_search_for_obj_function_with_criteria(slots, events):
+
+    def objective_function(array):
+        return of.efficiency_capacity_demand_difference(slots, events, array)
+
+    def acceptance_criteria(array):
+        return sum(array[:, 3])
+
+    array = np.array([
+        [1, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 1, 0, 0],
+        [0, 1, 0, 0, 0, 0, 0]
+    ])
+    assert acceptance_criteria(array) == 0
+    assert objective_function(array) == 400
+
+    np.random.seed(0)
+    X = tabu_search(initial_array=array,
+                    objective_function=objective_function,
+                    acceptance_criteria=acceptance_criteria,
+                    max_iterations=20)
+
+    assert acceptance_criteria(X) == 0
+    assert objective_function(X) == 100
+
+
+def test_tabu_search_returns_best_solution(random_conference):
+    events, slots = random_conference
+    tracker = ViolationTracker(events, slots)
+    array = get_initial_array(events, slots, seed=2)
+    initial_violations = tracker(array)
+
+    np.random.seed(0)
+    X = tabu_search(initial_array=array,
+                    objective_function=tracker,
+                    max_iterations=50)
+    assert tracker(X) < initial_violations
+
+    np.random.seed(0)
+    climbed = hill_climber(initial_array=array,
+                           objective_function=tracker,
+                           max_iterations=50 * 20)
+    assert tracker(X) <= tracker(climbed)
+
+
+def test_tabu_search_with_time_limit(random_conference):
+    events, slots = random_conference
+    tracker = ViolationTracker(events, slots)
+    array = get_initial_array(events, slots, seed=2)
+
+    X = tabu_search(initial_array=array,
+                    objective_function=tracker,
+                    time_limit=0)
+    assert np.array_equal(X, array)
+
+    X = tabu_search(initial_array=array,
+                    objective_function=tracker,
+                    max_iterations=10 ** 6,
+                    time_limit=0.5,
+                    rng=np.random.default_rng(0))
+    assert tracker(X) < tracker(array)
+
+
+def test_tabu_search_anytime(random_conference):
+    events, slots = random_conference
+    tracker = ViolationTracker(events, slots)
+    array = get_initial_array(events, slots, seed=2)
+    calls = 0
+
+    def objective_function(array):
+        nonlocal calls
+        calls += 1
+        if calls > 200:
+            raise KeyboardInterrupt
+        return tracker(array)
+
+    X = tabu_search(initial_array=array,
+                    objective_function=objective_function,
+                    anytime=True,
+                    rng=np.random.default_rng(0))
+    assert calls == 201
+    assert tracker(X) < tracker(array)
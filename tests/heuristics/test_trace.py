@@ -0,0 +1,84 @@
+import pytest
+import numpy as np
+from conference_scheduler.lp_problem import objective_functions as of
+from conference_scheduler.validator import ViolationTracker
+from conference_scheduler.heuristics import (
+    Trace, hill_climber, simulated_annealing, tabu_search, get_initial_array
+)
+
+
+def test_trace_records():
+    received = []
+    trace = Trace(maxlen=3, every=2, callback=received.append)
+
+    for iteration in range(7):
+        trace.record(iteration, 10 - iteration, 10 - iteration, iteration)
+    trace.record(6, 4, 4, 6, force=True)
+    trace.record(7, 3, 3, 6, force=True)
+
+    assert [record.iteration for record in received] == [0, 2, 4, 6, 7]
+    assert [record.iteration for record in trace.records] == [4, 6, 7]
+    assert trace.records[0].acceptance_ratio == 1
+    assert trace.records[-1].acceptance_ratio == 6 / 7
+    assert trace.records[-1].temperature is None
+    assert trace.accepted == 6
+
+
+def test_trace_timed_and_merge():
+    trace = Trace()
+    assert trace.timed('objective', 3, sum, [1, 2]) == 3
+    assert trace.counts['objective'] == 3
+    assert trace.times['objective'] >= 0
+
+    other = Trace()
+    other.timed('objective', 2, sum, [])
+    other.timed('violations', 1, sum, [])
+    trace.merge(other)
+    assert trace.counts == {'objective': 5, 'violations': 1}
+
+    trace.record(1, 0, 0, 1)
+    assert trace.records[0].objective_rate > 0
+    assert trace.records[0].violations_rate > 0
+
+
+@pytest.mark.parametrize('algorithm, kwargs', [
+    (hill_climber, {}),
+    (hill_climber, {'batch_size': 8}),
+    (simulated_annealing, {}),
+    (tabu_search, {}),
+])
+def test_algorithms_with_trace(random_conference, algorithm, kwargs):
+    events, slots = random_conference
+    tracker = ViolationTracker(events, slots)
+    func = of.EfficiencyCapacityDemandDifference(events, slots)
+    array = get_initial_array(events, slots, seed=2)
+    X = hill_climber(initial_array=array,
+                     objective_function=tracker,
+                     rng=np.random.default_rng(0))
+
+    expected = algorithm(initial_array=X,
+                         objective_function=func,
+                         acceptance_criteria=tracker,
+                         max_iterations=100,
+                         rng=np.random.default_rng(0),
+                         **kwargs)
+    trace = Trace(every=10)
+    solution = algorithm(initial_array=X,
+                         objective_function=func,
+                         acceptance_criteria=tracker,
+                         max_iterations=100,
+                         trace=trace,
+                         rng=np.random.default_rng(0),
+                         **kwargs)
+    assert np.array_equal(solution, expected)
+
+    iterations = [record.iteration for record in trace.records]
+    assert iterations == list(range(0, 101, 10)) + [101]
+    assert trace.records[-1].best_energy == func(solution)
+    assert trace.records[0].current_energy == func(X)
+    assert 0 <= trace.records[-1].acceptance_ratio <= 1
+    assert trace.counts['objective'] >= 100
+    assert trace.counts['violations'] > 0
+    assert trace.counts['moves'] >= 100
+    if algorithm is simulated_annealing:
+        assert trace.records[0].temperature == 10 ** 4
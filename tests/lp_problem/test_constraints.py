@@ -1,6 +1,14 @@
 import pulp
+import pytest
 import numpy as np
 from conference_scheduler.lp_problem import constraints as lpc
+from conference_scheduler.lp_problem import utils as lpu
+
+
+@pytest.fixture(scope='module')
+def sparse_X(shape, events, slots):
+    availability = lpu.slot_availability_array(events, slots)
+    return lpu.variables(shape, availability=availability)
 
 
 def test_schedule_all_events(events, slots, X):
@@ -9,6 +17,13 @@ def test_schedule_all_events(events, slots, X):
     assert len(constraints) == 3
 
 
+def test_schedule_all_events_sparse(events, slots, sparse_X):
+    constraints = [
+        c.condition for c in lpc._schedule_all_events(events, slots, sparse_X)]
+    assert len(constraints) == 3
+    assert [len(c) for c in constraints] == [5, 5, 2]
+
+
 def test_schedule_all_events_fails_np(events, slots):
     # Third talk is not scheduled
     X = np.array([
@@ -39,6 +54,14 @@ def test_max_one_event_per_slot(events, slots, X):
     assert len(constraints) == 7
 
 
+def test_max_one_event_per_slot_sparse(events, slots, sparse_X):
+    constraints = [
+        c.condition
+        for c in lpc._max_one_event_per_slot(events, slots, sparse_X)]
+    assert len(constraints) == 7
+    assert [len(c) for c in constraints] == [1, 1, 1, 1, 2, 3, 3]
+
+
 def test_max_one_events_per_slot_fail_np(events, slots):
     # Two talks are scheduled in the first slot
     X = np.array([
@@ -70,6 +93,13 @@ def test_events_available_in_scheduled_slot(events, slots, X):
     assert len(constraints) == 9
 
 
+def test_events_available_in_scheduled_slot_sparse(events, slots, sparse_X):
+    constraints = [
+        c for c in lpc._events_available_in_scheduled_slot(
+            events, slots, sparse_X)]
+    assert len(constraints) == 0
+
+
 def test_events_available_in_scheduled_slot_fails_np(events, slots):
     # First event is scheduled in a slot for which it is unavailable
     X = np.array([
@@ -103,6 +133,15 @@ def test_events_available_during_other_events(events, slots, X):
     assert len(constraints) == 15
 
 
+def test_events_available_during_other_events_sparse(
+    events, slots, sparse_X
+):
+    constraints = [
+        c for c in lpc._events_available_during_other_events(
+            events, slots, sparse_X)]
+    assert len(constraints) == 9
+
+
 def test_events_available_during_other_events_fails_np(events, slots):
     # First event is scheduled during second event
     X = np.array([
@@ -129,6 +168,71 @@ def test_events_available_during_other_events_pass_np(events, slots):
     assert all(constraints) is True
 
 
+def test_events_available_during_other_events_by_clique(events, slots, X):
+    constraints = [
+        c for c in lpc._events_available_during_other_events_by_clique(
+            events, slots, X)]
+    assert len(constraints) == 10
+    assert constraints[0].label == (
+        'Event clashes with another event - events: [0, 1] and slots: [2, 6]')
+
+
+def test_events_available_during_other_events_by_clique_fails_np(
+    events, slots
+):
+    # Second event is scheduled during first event
+    for X in (
+        np.array([
+            [1, 0, 0, 0, 0, 0, 0],
+            [0, 0, 0, 0, 0, 1, 0],
+            [0, 1, 0, 0, 0, 0, 0]
+        ]),
+        np.array([
+            [0, 0, 0, 0, 0, 1, 0],
+            [1, 0, 0, 0, 0, 0, 0],
+            [0, 1, 0, 0, 0, 0, 0]
+        ])
+    ):
+        constraints = [
+            c.condition
+            for c in lpc._events_available_during_other_events_by_clique(
+                events, slots, X)]
+        assert all(constraints) is False
+
+
+def test_events_available_during_other_events_by_clique_pass_np(
+    events, slots
+):
+    X = np.array([
+        [1, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 1],
+        [0, 1, 0, 0, 0, 0, 0]
+    ])
+    constraints = [
+        c.condition
+        for c in lpc._events_available_during_other_events_by_clique(
+            events, slots, X)]
+    assert all(constraints) is True
+
+
+def test_clique_constraints_imply_pairwise_constraints(random_conference):
+    events, slots = random_conference
+    np.random.seed(0)
+    for _ in range(50):
+        X = np.zeros((len(events), len(slots)), dtype=int)
+        X[np.arange(len(events)),
+          np.random.choice(len(slots), size=len(events), replace=False)] = 1
+        clique = all(
+            c.condition
+            for c in lpc._events_available_during_other_events_by_clique(
+                events, slots, X))
+        pairwise = all(
+            c.condition
+            for c in lpc._events_available_during_other_events(
+                events, slots, X))
+        assert pairwise or not clique
+
+
 def test_upper_bound_on_event_overflow(events, slots, X):
     constraints = [
         c for c in lpc._upper_bound_on_event_overflow(
@@ -136,7 +240,9 @@ def test_upper_bound_on_event_overflow(events, slots, X):
             slots,
             X,
             beta=float('inf'))]
-    assert len(constraints) == len(slots) * len(events)
+    assert len(constraints) == 6
+    assert constraints[0].label == (
+        'Artificial upper bound constraint - slot: 0')
 
 
 def test_upper_bound_on_event_overflow_np(events, slots):
@@ -169,4 +275,12 @@ def test_constraints(events, slots, X):
     constraints = [
         c for c in lpc.all_constraints(
             events, slots, X, beta)]
-    assert len(constraints) == 55
+    assert len(constraints) == 40
+
+
+def test_constraints_by_clique(events, slots, X):
+    beta = pulp.LpVariable("upper_bound")
+    constraints = [
+        c for c in lpc.all_constraints(
+            events, slots, X, beta, clashes='clique')]
+    assert len(constraints) == 35
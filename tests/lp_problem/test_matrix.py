@@ -0,0 +1,262 @@
+import pulp
+import pytest
+import numpy as np
+from conference_scheduler import converter as conv
+from conference_scheduler.lp_problem import constraints as lpc
+from conference_scheduler.lp_problem import matrix as lpm
+from conference_scheduler.lp_problem import objective_functions as of
+from conference_scheduler.lp_problem import utils as lpu
+from conference_scheduler.resources import Shape
+
+
+def normalise(condition):
+    """
+    Return a pulp constraint as a tuple of its sense, right hand side and
+    sorted non zero coefficients with greater than constraints negated.
+    """
+    sign = -1 if condition.sense == pulp.LpConstraintGE else 1
+    sense = pulp.LpConstraintEQ if condition.sense == 0 else 'LE'
+    coefficients = sorted(
+        (variable.name, sign * value)
+        for variable, value in condition.items() if value != 0)
+    return (sense, -sign * condition.constant, tuple(coefficients))
+
+
+def matrix_rows(matrix, variables):
+    rows = []
+    for row, (lower, upper) in enumerate(zip(matrix.lower, matrix.upper)):
+        entries = matrix.rows == row
+        coefficients = tuple(sorted(
+            (variables[column].name, value)
+            for column, value in zip(matrix.columns[entries],
+                                     matrix.values[entries])))
+        sense = pulp.LpConstraintEQ if lower == upper else 'LE'
+        rows.append((sense, upper, coefficients))
+    return rows
+
+
+def test_variable_columns(shape, events, slots):
+    columns = lpm.variable_columns(shape)
+    assert np.array_equal(columns, np.arange(21).reshape(3, 7))
+
+    availability = lpu.slot_availability_array(events, slots)
+    columns = lpm.variable_columns(shape, availability)
+    assert np.array_equal(columns, [
+        [-1, -1, 0, 1, 2, 3, 4],
+        [5, 6, -1, -1, 7, 8, 9],
+        [-1, -1, -1, -1, -1, 10, 11]
+    ])
+    X = lpu.variables(shape, availability)
+    assert [X[tuple(index)] for index in np.argwhere(columns >= 0)] == list(
+        X.values())
+
+
+@pytest.mark.parametrize('sparse', [False, True])
+@pytest.mark.parametrize('clashes', ['pairwise', 'clique'])
+@pytest.mark.parametrize('conference', ['fixture', 'random', 'one way'])
+def test_constraint_matrix_matches_constraints(
+    events, slots, random_conference, one_way_conference, conference,
+    clashes, sparse
+):
+    if conference == 'random':
+        events, slots = random_conference
+    if conference == 'one way':
+        events, slots = one_way_conference
+    model = lpu.ConferenceModel(events=events, slots=slots)
+    availability = None
+    if sparse:
+        availability = lpu.slot_availability_array(events, slots)
+    X = lpu.variables(model.shape, availability=availability)
+    beta = pulp.LpVariable('upper_bound')
+
+    expected = [
+        normalise(c.condition)
+        for c in lpc.all_constraints(
+            events, slots, X, beta, 'lpsum', clashes=clashes)
+        if c.condition is not True
+    ]
+
+    columns = lpm.variable_columns(model.shape, availability)
+    matrix = lpm.constraint_matrix(
+        events, slots, columns, beta_column=len(X), clashes=clashes)
+    assert matrix_rows(matrix, list(X.values()) + [beta]) == expected
+
+
+def test_constraint_matrix_with_few_free_events(random_conference):
+    events, slots = random_conference
+    model = lpu.ConferenceModel(events=events, slots=slots)
+    # All but three events only have a variable for a single slot
+    availability = lpu.slot_availability_array(events, slots)
+    availability[3:] = 0
+    availability[np.arange(3, len(events)), np.arange(3, len(events))] = 1
+    X = lpu.variables(model.shape, availability=availability)
+    beta = pulp.LpVariable('upper_bound')
+
+    expected = [
+        normalise(c.condition)
+        for c in lpc.all_constraints(events, slots, X, beta, 'lpsum')
+        if c.condition is not True
+    ]
+    columns = lpm.variable_columns(model.shape, availability)
+    counts = np.count_nonzero(columns >= 0, axis=0)
+    pairs = model.slot_intervals.pairs()
+    conflicts = np.count_nonzero(
+        (lpu.event_availability_array(events) == 0) &
+        model.event_has_unavailability[:, None])
+    assert np.dot(counts[pairs[:, 0]], counts[pairs[:, 1]]) < (
+        len(pairs) * conflicts)
+
+    matrix = lpm.constraint_matrix(
+        events, slots, columns, beta_column=len(X), model=model)
+    assert matrix_rows(matrix, list(X.values()) + [beta]) == expected
+
+
+def forbidden_pairs(matrix, columns):
+    """
+    Return the pairs of variables of different events in different slots
+    which the rows of a clash ConstraintMatrix forbid together
+    """
+    events, slots = np.nonzero(columns >= 0)
+    cells = np.argsort(columns[events, slots])
+    pairs = set()
+    for row in range(len(matrix.lower)):
+        row_cells = cells[matrix.columns[matrix.rows == row]]
+        for first in row_cells:
+            for second in row_cells:
+                if (events[first] != events[second] and
+                        slots[first] != slots[second]):
+                    pairs.add((first, second))
+    return pairs
+
+
+@pytest.mark.parametrize('sparse', [False, True])
+def test_clique_clashes_forbid_the_pairwise_pairs(one_way_conference, sparse):
+    events, slots = one_way_conference
+    model = lpu.ConferenceModel(events=events, slots=slots)
+    clashes = lpu.clash_array(events, model=model)
+    assert np.any(clashes & ~clashes.T)
+    availability = None
+    if sparse:
+        availability = lpu.slot_availability_array(events, slots)
+    columns = lpm.variable_columns(model.shape, availability)
+
+    pairs = {
+        clashes: forbidden_pairs(
+            lpm._clash_constraints[clashes](model=model, columns=columns),
+            columns)
+        for clashes in ('pairwise', 'clique')}
+    assert pairs['clique'] == pairs['pairwise']
+
+
+def test_constraint_matrix_without_beta(events, slots, shape):
+    columns = lpm.variable_columns(shape)
+    matrix = lpm.constraint_matrix(events, slots, columns)
+    assert len(matrix.lower) == 34
+    assert len(matrix.rows) == len(matrix.columns) == len(matrix.values)
+
+
+def test_add_constraints(events, slots, shape):
+    X = lpu.variables(shape)
+    problem = pulp.LpProblem()
+    columns = lpm.variable_columns(shape)
+    matrix = lpm.constraint_matrix(events, slots, columns)
+    lpm.add_constraints(problem, matrix, list(X.values()))
+
+    expected = [
+        normalise(c.condition)
+        for c in lpc.all_constraints(events, slots, X, None, 'lpsum')]
+    assert [
+        normalise(c) for c in problem.constraints.values()] == expected
+
+
+def test_add_constraints_with_two_sided_and_empty_rows():
+    x = pulp.LpVariable('x', lowBound=0)
+    y = pulp.LpVariable('y', lowBound=0)
+    matrix = lpm.ConstraintMatrix(
+        rows=np.array([1, 0, 1]),
+        columns=np.array([0, 1, 1]),
+        values=np.array([2., 1., 3.]),
+        lower=np.array([-np.inf, 1, 0]),
+        upper=np.array([4, 2, np.inf]))
+    problem = pulp.LpProblem()
+    problem += x + y
+    lpm.add_constraints(problem, matrix, [x, y])
+
+    assert list(problem.constraints) == ['_C1', '_C2', '_C3']
+    assert [str(c) for c in problem.constraints.values()] == [
+        'y <= 4.0', '2.0*x + 3.0*y <= 2.0', '2.0*x + 3.0*y >= 1.0']
+    assert problem.variables() == [x, y]
+    assert problem.solve(pulp.PULP_CBC_CMD(msg=False)) == 1
+    assert y.value() == pytest.approx(1 / 3)
+
+
+def test_matrix_form(events, slots, shape):
+    form = lpm.matrix_form(events, slots)
+    number_of_variables = shape.events * shape.slots
+    assert form.shape == (40, number_of_variables + 1)
+    assert form.beta_column == number_of_variables
+    assert np.array_equal(
+        form.variables, np.argwhere(np.ones(shape, dtype=bool)))
+    assert np.array_equal(form.cost, np.zeros(number_of_variables + 1))
+    assert form.constant == 0
+    assert len(form.indptr) == form.shape[0] + 1
+    assert len(form.data) == len(form.indices) == form.indptr[-1]
+
+
+@pytest.mark.parametrize('sparse', [False, True])
+@pytest.mark.parametrize('clashes', ['pairwise', 'clique'])
+def test_matrix_form_matches_constraints(
+    events, slots, random_conference, clashes, sparse
+):
+    events, slots = random_conference
+    form = lpm.matrix_form(events, slots, sparse=sparse, clashes=clashes)
+    availability = None
+    if sparse:
+        availability = lpu.slot_availability_array(events, slots)
+    X = lpu.variables(
+        Shape(len(events), len(slots)), availability=availability)
+    beta = pulp.LpVariable('upper_bound')
+    variables = list(X.values()) + [beta]
+    assert [tuple(index) for index in form.variables] == list(X.keys())
+
+    expected = [
+        normalise(c.condition)
+        for c in lpc.all_constraints(
+            events, slots, X, beta, 'lpsum', clashes=clashes)
+        if c.condition is not True
+    ]
+    A = form.toarray()
+    rows = []
+    for row, (lower, upper) in enumerate(zip(form.lower, form.upper)):
+        sense = pulp.LpConstraintEQ if lower == upper else 'LE'
+        coefficients = tuple(sorted(
+            (variables[column].name, A[row, column])
+            for column in np.flatnonzero(A[row])))
+        rows.append((sense, upper, coefficients))
+    assert rows == expected
+
+
+def test_matrix_form_objective(events, slots, shape):
+    form = lpm.matrix_form(
+        events, slots, objective=of.efficiency_capacity_demand_difference)
+    demands = np.array([event.demand for event in events])
+    capacities = np.array([slot.capacity for slot in slots])
+    expected = (demands[:, None] - capacities[None, :]).ravel()
+    assert np.array_equal(form.cost[:-1], expected)
+    assert form.cost[-1] == 0
+
+    form = lpm.matrix_form(
+        events, slots, objective=of.equity_capacity_demand_difference)
+    assert np.array_equal(form.cost, np.eye(len(form.cost))[-1])
+
+
+def test_matrix_form_objective_constant(events, slots, shape):
+    X = np.zeros(shape, dtype=int)
+    X[0, 2] = X[1, 4] = X[2, 5] = 1
+    original_schedule = conv.array_to_schedule(X, events, slots)
+    form = lpm.matrix_form(
+        events, slots, objective=of.number_of_changes,
+        original_schedule=original_schedule)
+    assert form.constant == 3
+    assert np.array_equal(form.cost[:-1], 1 - 2 * X.ravel())
+    assert form.cost[:-1] @ X.ravel() + form.constant == 0
@@ -1,4 +1,8 @@
+import pickle
+import pytest
+import pulp
 import numpy as np
+from conference_scheduler import heuristics as heu
 from conference_scheduler.lp_problem import objective_functions as of
 from conference_scheduler.converter import array_to_schedule
 
@@ -26,6 +30,41 @@ def test_efficiency_apacity_demand_difference_with_examples(slots, events):
     assert overflow == 440
 
 
+def test_efficiency_capacity_demand_difference_matches_lp(slots, events):
+    X = np.array([
+        [1, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 1, 0, 0],
+        [0, 0, 0, 1, 0, 0, 0]
+    ], dtype=np.int8)
+    overflow = of.efficiency_capacity_demand_difference(slots, events, X)
+    assert overflow == 440
+    assert overflow == of.efficiency_capacity_demand_difference(
+        slots, events, {(row, col): int(X[row, col])
+                        for row in range(3) for col in range(7)})
+
+
+def test_equity_capacity_demand_difference(slots, events):
+    assert of.equity_capacity_demand_difference(
+        slots, events, X={}, beta='beta') == 'beta'
+
+    X = np.array([
+        [1, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 1, 0, 0],
+        [0, 1, 0, 0, 0, 0, 0]
+    ])
+    assert of.equity_capacity_demand_difference(slots, events, X) == 450
+
+    X = np.array([
+        [0, 0, 0, 1, 0, 0, 0],
+        [0, 0, 0, 0, 0, 1, 0],
+        [0, 0, 0, 0, 0, 0, 1]
+    ])
+    assert of.equity_capacity_demand_difference(slots, events, X) == 300
+
+    X = np.zeros((3, 7))
+    assert of.equity_capacity_demand_difference(slots, events, X) == -10
+
+
 def test_number_of_changes(slots, events):
     X_orig = np.array([
         [1, 0, 0, 0, 0, 0, 0],
@@ -50,3 +89,147 @@ def test_number_of_changes(slots, events):
         [0, 0, 0, 0, 0, 1, 0]
     ])
     assert of.number_of_changes(slots, events, schedule, X_new) == 7
+
+    X_new = {(row, col): X_new[row, col]
+             for row in range(3) for col in range(7)}
+    assert of.number_of_changes(slots, events, schedule, X_new) == 7
+
+
+@pytest.mark.parametrize('objective_function', [
+    of.efficiency_capacity_demand_difference,
+    of.equity_capacity_demand_difference,
+    of.number_of_changes,
+])
+def test_compiled_objective(slots, events, objective_function):
+    X_orig = np.array([
+        [1, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 1, 0, 0],
+        [0, 1, 0, 0, 0, 0, 0]
+    ])
+    kwargs = {'original_schedule': list(
+        array_to_schedule(array=X_orig, slots=slots, events=events))}
+    compiled = of.compiled_objective(
+        objective_function, events=events, slots=slots, **kwargs)
+    assert not isinstance(compiled, of.ObjectiveFunction)
+    compiled = pickle.loads(pickle.dumps(compiled))
+
+    random_state = np.random.RandomState(0)
+    for _ in range(10):
+        X = np.eye(7)[random_state.permutation(7)[:3]]
+        assert compiled(X) == objective_function(
+            slots=slots, events=events, X=X, **kwargs)
+
+
+def test_compiled_objective_for_other_functions(slots, events):
+    def total(slots, events, X, weight):
+        return weight * np.sum(X)
+
+    compiled = of.compiled_objective(
+        total, events=events, slots=slots, weight=2)
+    assert isinstance(compiled, of.ObjectiveFunction)
+    assert compiled(np.ones((3, 7))) == 42
+
+
+def test_compiled_objective_for_numpy_only_functions(slots, events):
+    def first_slot_and_spread(slots, events, X, **kwargs):
+        spread = np.sum(X, axis=0) * np.arange(X.shape[1])
+        return X[:, 0].sum() + spread.sum()
+
+    compiled = of.compiled_objective(
+        first_slot_and_spread, events=events, slots=slots)
+    assert isinstance(compiled, of.ObjectiveFunction)
+    X = np.eye(7)[[0, 1, 3]]
+    assert compiled(X) == 5
+
+
+def test_cost_array(slots, events):
+    cost, constant = of.cost_array(
+        of.efficiency_capacity_demand_difference, events=events, slots=slots)
+    assert np.array_equal(cost, of._overflow_array(slots, events))
+    assert constant == 0
+
+    assert of.cost_array(
+        of.equity_capacity_demand_difference,
+        events=events, slots=slots) is None
+
+
+def test_cost_array_of_non_linear_functions(slots, events):
+    def squared(slots, events, X, **kwargs):
+        return X[0, 0] * X[0, 1]
+
+    def other_variables(slots, events, X, **kwargs):
+        return X[0, 0] + pulp.LpVariable('other')
+
+    def broken(slots, events, X, **kwargs):
+        return X[0, 0] + kwargs['missing']
+
+    assert of.cost_array(squared, events=events, slots=slots) is None
+    assert of.cost_array(other_variables, events=events, slots=slots) is None
+    with pytest.raises(KeyError):
+        of.cost_array(broken, events=events, slots=slots)
+
+
+def test_compiled_objective_for_linear_functions(slots, events):
+    def weighted_slots(slots, events, X, weights, **kwargs):
+        return sum(
+            weights[col] * X[row, col]
+            for row in range(len(events)) for col in range(len(slots))
+        ) + 5
+
+    weights = list(range(7))
+    compiled = of.compiled_objective(
+        weighted_slots, events=events, slots=slots, weights=weights)
+    assert isinstance(compiled, of.LinearObjectiveFunction)
+    assert np.array_equal(compiled.cost, np.tile(weights, (3, 1)))
+    compiled = pickle.loads(pickle.dumps(compiled))
+
+    X = np.eye(7)[[6, 1, 3]]
+    assert compiled(X) == 15 == weighted_slots(slots, events, X, weights)
+
+
+@pytest.mark.parametrize('objective_function', [
+    of.efficiency_capacity_demand_difference,
+    of.number_of_changes,
+])
+def test_compiled_objective_delta(slots, events, objective_function):
+    X_orig = np.array([
+        [1, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 1, 0, 0],
+        [0, 1, 0, 0, 0, 0, 0]
+    ])
+    kwargs = {'original_schedule': list(
+        array_to_schedule(array=X_orig, slots=slots, events=events))}
+    compiled = of.compiled_objective(
+        objective_function, events=events, slots=slots, **kwargs)
+
+    np.random.seed(0)
+    X = X_orig.copy()
+    compiled.reset(X)
+    value = compiled(X)
+    for _ in range(50):
+        move = heu.random_move(X)
+        delta = compiled.delta(move)
+        heu.apply_move(X, move)
+        compiled.apply(move)
+        assert value + delta == compiled(X)
+        value += delta
+
+
+@pytest.mark.parametrize('objective_function', [
+    of.efficiency_capacity_demand_difference, of.number_of_changes])
+def test_compiled_objective_deltas(slots, events, objective_function):
+    X_orig = np.array([
+        [1, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 1, 0, 0],
+        [0, 1, 0, 0, 0, 0, 0]
+    ])
+    kwargs = {'original_schedule': list(
+        array_to_schedule(array=X_orig, slots=slots, events=events))}
+    compiled = of.compiled_objective(
+        objective_function, events=events, slots=slots, **kwargs)
+    compiled.reset(X_orig)
+    moves = heu.array_to_assignment(X_orig).random_moves(
+        50, rng=np.random.default_rng(0))
+    expected = [compiled.delta(moves.move(index))
+                for index in range(len(moves))]
+    assert np.array_equal(compiled.deltas(moves), expected)
@@ -1,7 +1,50 @@
+import itertools as it
 import numpy as np
+import pulp
+from conference_scheduler.resources import Event
 from conference_scheduler.lp_problem import utils as lpu
 
 
+def test_conference_model(model):
+    assert model.shape == (3, 7)
+    assert np.array_equal(model.event_durations, [30, 30, 60])
+    assert np.array_equal(model.demands, [30, 500, 20])
+    assert np.array_equal(model.slot_durations, [30, 30, 30, 30, 30, 90, 90])
+    assert np.array_equal(model.capacities, [50, 50, 50, 10, 50, 200, 200])
+    assert np.array_equal(model.starts, [0, 33, 120, 150, 180, 0, 120])
+    assert np.array_equal(model.ends, [30, 63, 150, 180, 210, 90, 210])
+    assert model.sessions == [
+        '01 Morning A', '02 Afternoon A', '03 Morning B', '04 Afternoon B']
+    assert np.array_equal(model.session_ids, [0, 0, 0, 1, 1, 2, 3])
+    assert model.tags == ['community', 'documentation']
+    assert np.array_equal(
+        model.tag_membership, [[True, False], [True, True], [False, True]])
+    assert np.array_equal(
+        model.event_has_unavailability, [True, True, False])
+
+
+def test_empty_conference_model():
+    model = lpu.ConferenceModel()
+    assert model.shape == (0, 0)
+    assert model.starts.shape == (0, )
+    assert model.tag_membership.shape == (0, 0)
+
+
+def test_arrays_from_model(events, slots, model):
+    assert np.array_equal(lpu.tag_array(events, model=model),
+                          lpu.tag_array(events))
+    assert np.array_equal(lpu.session_array(slots, model=model),
+                          lpu.session_array(slots))
+    assert np.array_equal(
+        lpu.slot_availability_array(events, slots, model=model),
+        lpu.slot_availability_array(events, slots))
+    assert np.array_equal(
+        lpu.event_availability_array(events, model=model),
+        lpu.event_availability_array(events))
+    assert (list(lpu.concurrent_slots(slots, model=model)) ==
+            list(lpu.concurrent_slots(slots)))
+
+
 def test_tag_array(events):
     tag_array = lpu.tag_array(events)
     assert np.array_equal(tag_array, np.array([[1, 0], [1, 1], [0, 1]]))
@@ -26,6 +69,24 @@ def test_slot_availability_array(events, slots):
     ]))
 
 
+def test_slot_availability_array_matches_loop(random_conference):
+    events, slots = random_conference
+    expected = np.ones((len(events), len(slots)))
+    for row, event in enumerate(events):
+        for col, slot in enumerate(slots):
+            if slot in event.unavailability or event.duration > slot.duration:
+                expected[row, col] = 0
+    assert np.array_equal(lpu.slot_availability_array(events, slots),
+                          expected)
+
+
+def test_slot_availability_array_with_equal_slots(slots):
+    duplicated_slots = slots + (slots[0], )
+    event = Event('Talk', duration=30, demand=0, unavailability=[slots[0]])
+    array = lpu.slot_availability_array([event], duplicated_slots)
+    assert np.array_equal(array, [[0, 1, 1, 1, 1, 1, 1, 0]])
+
+
 def test_event_availability_array(events):
     event_availability_array = lpu.event_availability_array(events)
     assert np.array_equal(event_availability_array, np.array([
@@ -35,6 +96,28 @@ def test_event_availability_array(events):
     ]))
 
 
+def test_event_availability_array_matches_loop(random_conference):
+    events, slots = random_conference
+    expected = np.ones((len(events), len(events)))
+    for row, event in enumerate(events):
+        for col, other_event in enumerate(events):
+            if row != col:
+                tags = set(event.tags)
+                events_share_tag = len(tags.intersection(other_event.tags)) > 0
+                if (other_event in event.unavailability) or events_share_tag:
+                    expected[row, col] = 0
+                    expected[col, row] = 0
+    assert np.array_equal(lpu.event_availability_array(events), expected)
+
+
+def test_event_availability_array_with_equal_events():
+    events = [Event('Talk', duration=30, demand=0) for _ in range(2)]
+    events.append(Event('Other talk', duration=30, demand=0,
+                        unavailability=[Event('Talk', 30, 0)]))
+    array = lpu.event_availability_array(events)
+    assert np.array_equal(array, [[1, 1, 0], [1, 1, 0], [0, 0, 1]])
+
+
 def test_slots_overlap(slots):
     assert lpu.slots_overlap(slots[0], slots[1]) is False
     assert lpu.slots_overlap(slots[0], slots[2]) is False
@@ -59,11 +142,152 @@ def test_concurrent_slots(slots):
     assert slots == [(0, 5), (1, 5), (2, 6), (3, 6), (4, 6)]
 
 
+def test_concurrent_slots_matches_pairwise(random_conference):
+    events, slots = random_conference
+    expected = [
+        (i, j)
+        for i, j in it.combinations(range(len(slots)), 2)
+        if lpu.slots_overlap(slots[i], slots[j])
+    ]
+    assert len(expected) > 0
+    assert list(lpu.concurrent_slots(slots)) == expected
+
+
+def test_interval_index():
+    index = lpu.IntervalIndex(starts=[0, 0, 30, 10, 60, 0],
+                              ends=[90, 30, 60, 20, 90, 90])
+    assert index.pairs().tolist() == [
+        [0, 1], [0, 2], [0, 3], [0, 4], [0, 5], [1, 3], [1, 5], [2, 5],
+        [3, 5], [4, 5]]
+    assert index.concurrent_with(0).tolist() == [1, 2, 3, 4, 5]
+    assert index.concurrent_with(3).tolist() == [0, 1, 5]
+    assert index.concurrent_with(4).tolist() == [0, 5]
+
+
+def test_interval_index_without_pairs():
+    index = lpu.IntervalIndex(starts=[0, 30], ends=[30, 60])
+    assert index.pairs().shape == (0, 2)
+    assert index.concurrent_with(1).tolist() == []
+
+
+def test_slots_concurrent_with(model):
+    assert model.slot_intervals.concurrent_with(5).tolist() == [0, 1]
+    assert model.slot_intervals.concurrent_with(6).tolist() == [2, 3, 4]
+    assert model.slot_intervals.concurrent_with(2).tolist() == [6]
+
+
+def test_conflict_array(events):
+    assert np.array_equal(lpu.conflict_array(events), [
+        [False, True, False],
+        [True, False, True],
+        [False, True, False]
+    ])
+
+
+def test_concurrency_array(slots):
+    array = lpu.concurrency_array(slots)
+    assert np.array_equal(array, array.T)
+    assert sorted(zip(*np.nonzero(np.triu(array)))) == list(
+        lpu.concurrent_slots(slots))
+
+
+def test_clique_cover(random_conference):
+    events, slots = random_conference
+    for adjacency in (lpu.conflict_array(events),
+                      lpu.concurrency_array(slots)):
+        cliques = lpu.clique_cover(adjacency)
+        covered = np.zeros(adjacency.shape, dtype=bool)
+        for clique in cliques:
+            block = np.ix_(clique, clique)
+            assert np.all(adjacency[block] | np.eye(len(clique), dtype=bool))
+            covered[block] = True
+        assert np.all(covered[adjacency])
+
+
+def test_clique_cover_of_complete_graph():
+    adjacency = ~np.eye(4, dtype=bool)
+    cliques = lpu.clique_cover(adjacency)
+    assert [clique.tolist() for clique in cliques] == [[0, 1, 2, 3]]
+    assert lpu.clique_cover(np.zeros((3, 3), dtype=bool)) == []
+
+
+def test_clash_cliques_are_computed_once(one_way_conference):
+    events, slots = one_way_conference
+    model = lpu.ConferenceModel(events=events, slots=slots)
+    event_cliques, slot_cliques = model.clash_cliques()
+    clashes = lpu.clash_array(events, model=model)
+    assert len(event_cliques) > 0
+    for clique in event_cliques:
+        assert np.all(
+            (clashes & clashes.T)[np.ix_(clique, clique)] |
+            np.eye(len(clique), dtype=bool))
+    assert model.clash_cliques()[0] is event_cliques
+    assert model.clash_cliques()[1] is slot_cliques
+
+
+def test_default_solver():
+    solver = lpu.default_solver(msg=False)
+    assert isinstance(solver, pulp.PULP_CBC_CMD)
+    assert solver.optionsDict['warmStart']
+    assert not solver.msg
+
+
+def test_default_solver_other_than_cbc(monkeypatch):
+    glpk = pulp.GLPK_CMD()
+    monkeypatch.setattr(pulp, 'LpSolverDefault', glpk)
+    assert lpu.default_solver() is glpk
+
+
 def test_variables(shape):
     X = lpu.variables(shape)
     assert len(X) == 21
 
 
+def test_sparse_variables(shape, events, slots):
+    availability = lpu.slot_availability_array(events, slots)
+    X = lpu.variables(shape, availability=availability)
+    assert isinstance(X, lpu.SparseVariables)
+    assert len(X) == 12
+    assert sorted(X) == [tuple(index) for index in np.argwhere(availability)]
+    assert X[0, 0] == 0
+    assert (0, 0) not in X
+    assert lpu.is_variable(X, (0, 2))
+    assert not lpu.is_variable(X, (0, 0))
+
+
+def test_is_variable_for_dense_arrays(X):
+    assert lpu.is_variable(X, (0, 0))
+    assert lpu.is_variable(np.zeros((3, 7)), (0, 0))
+
+
+def test_overflow_slots(events, slots, model):
+    assert np.array_equal(
+        lpu.overflow_slots(events, slots, model=model), [0, 1, 3, 4, 5, 6])
+    exists = np.zeros(model.shape, dtype=bool)
+    assert np.array_equal(
+        lpu.overflow_slots(events, slots, exists=exists, model=model), [3])
+
+
+def test_overflow_slots_bound_the_overflow(random_conference):
+    events, slots = random_conference
+    model = lpu.ConferenceModel(events=events, slots=slots)
+    kept = lpu.overflow_slots(events, slots, model=model)
+    assert 0 < len(kept) < len(slots)
+
+    availability = lpu.slot_availability_array(events, slots, model=model)
+    overflow = model.demands[:, None] - model.capacities[None, :]
+    random_state = np.random.RandomState(0)
+    for _ in range(20):
+        X = np.zeros(model.shape)
+        for event, slot in enumerate(
+            random_state.permutation(len(slots))[:len(events)]
+        ):
+            X[event, slot] = availability[event, slot]
+        expected = np.max(np.where(X == 1, overflow, -model.capacities))
+        bounds = model.demands @ X[:, kept] - model.capacities[kept]
+        assert np.max(bounds) == expected
+
+
 def test_slots_in_session(session_array):
     assert np.array_equal(lpu._slots_in_session(0, session_array),
                           np.array([0, 1, 2]))
@@ -78,3 +302,29 @@ def test_events_with_diff_tags(tag_array):
                           np.array([]))
     assert np.array_equal(lpu._events_with_diff_tag(2, tag_array),
                           np.array([0]))
+
+
+def test_maximum_matching():
+    adjacency = np.array([
+        [1, 1, 0, 0],
+        [1, 0, 0, 0],
+        [0, 1, 1, 0],
+        [0, 0, 1, 0],
+    ], dtype=bool)
+    assert np.array_equal(lpu.maximum_matching(adjacency), [0, -1, 1, 2])
+
+    matching = lpu.maximum_matching(np.zeros((2, 3), dtype=bool))
+    assert np.array_equal(matching, [-1, -1])
+
+
+def test_maximum_matching_is_maximum():
+    random_state = np.random.RandomState(0)
+    for _ in range(50):
+        adjacency = random_state.random_sample((5, 6)) < 0.3
+        matching = lpu.maximum_matching(adjacency)
+        rows = np.flatnonzero(matching >= 0)
+        assert len(set(matching[rows])) == len(rows)
+        assert adjacency[rows, matching[rows]].all()
+        assert len(rows) == max(
+            adjacency[range(5), columns].sum()
+            for columns in it.permutations(range(6), 5))
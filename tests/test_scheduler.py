@@ -1,3 +1,4 @@
+import pulp
 import pytest
 import numpy as np
 from collections import Counter
@@ -6,9 +7,10 @@ from conference_scheduler.resources import (
     ChangedSlotScheduledItem
 )
 from datetime import datetime
-from conference_scheduler import scheduler, converter
+from conference_scheduler import scheduler, converter, validator
 from conference_scheduler import heuristics as heu
 from conference_scheduler.lp_problem import objective_functions as of
+from conference_scheduler.lp_problem import utils as lpu
 
 
 # Testing of the three output functions called by external programs
@@ -52,7 +54,7 @@ def test_equity_demand_difference_schedule(slots, events):
         objective_function=of.equity_capacity_demand_difference
     )
     assert type(solution) is list
-    assert list(solution) == [(0, 2), (1, 5), (2, 6)]
+    assert list(solution) == [(0, 3), (1, 5), (2, 6)]
 
 
 def test_small_distance_from_other_schedule(slots, events):
@@ -86,6 +88,108 @@ def test_small_distance_from_other_schedule(slots, events):
     assert list(solution) == [(0, 2), (1, 4), (2, 5)]
 
 
+def test_sparse_solution(slots, events):
+    solution = scheduler.solution(events=events, slots=slots, sparse=True)
+    assert validator.is_valid_solution(solution, events, slots)
+
+
+def test_sparse_total_demand_difference_schedule(slots, events):
+    dense = scheduler.array(
+        events=events, slots=slots,
+        objective_function=of.efficiency_capacity_demand_difference)
+    sparse = scheduler.array(
+        events=events, slots=slots,
+        objective_function=of.efficiency_capacity_demand_difference,
+        sparse=True)
+    assert validator.is_valid_array(sparse, events, slots)
+    assert (
+        of.efficiency_capacity_demand_difference(
+            slots, events, sparse.astype(int)) ==
+        of.efficiency_capacity_demand_difference(
+            slots, events, dense.astype(int)))
+
+
+def test_sparse_equity_demand_difference_schedule(slots, events):
+    solution = scheduler.solution(
+        events=events, slots=slots,
+        objective_function=of.equity_capacity_demand_difference,
+        sparse=True
+    )
+    assert list(solution) == [(0, 3), (1, 5), (2, 6)]
+
+
+def test_sparse_small_distance_from_other_schedule(slots, events):
+    X_orig = np.array([
+        [0, 0, 0, 0, 0, 0, 1],
+        [0, 0, 1, 0, 0, 0, 0],
+        [0, 1, 0, 0, 0, 0, 0]
+    ])
+    schedule = converter.array_to_schedule(array=X_orig, slots=slots,
+                                           events=events)
+    solution = scheduler.solution(
+        events=events, slots=slots,
+        objective_function=of.number_of_changes,
+        original_schedule=schedule,
+        sparse=True
+    )
+    assert list(solution) == [(0, 2), (1, 4), (2, 5)]
+
+
+def test_clique_solution(slots, events):
+    for sparse in (False, True):
+        solution = scheduler.solution(
+            events=events, slots=slots, clashes='clique', sparse=sparse)
+        assert validator.is_valid_solution(solution, events, slots)
+
+
+def test_clique_equity_demand_difference_schedule(slots, events):
+    solution = scheduler.solution(
+        events=events, slots=slots,
+        objective_function=of.equity_capacity_demand_difference,
+        clashes='clique'
+    )
+    assert list(solution) == [(0, 3), (1, 5), (2, 6)]
+
+
+@pytest.mark.parametrize('long_slot_first', [False, True])
+def test_clique_and_pairwise_agree_on_one_way_unavailability(
+    long_slot_first
+):
+    """
+    Only the first event lists the second as unavailable so the clash
+    constraints only forbid it in the first of two concurrent slots while the
+    second is in the other. Whether that leaves a schedule depends on the
+    order of the slots and must be the same for both forms of the
+    constraints.
+    """
+    start = datetime(2017, 1, 1, 9, 0)
+    slots = [
+        Slot(venue='Room 1', starts_at=start, duration=30, capacity=50,
+             session='Morning'),
+        Slot(venue='Room 2', starts_at=start, duration=60, capacity=50,
+             session='Morning')]
+    if long_slot_first:
+        slots.reverse()
+    other_event = Event(name='Workshop', duration=60, demand=10)
+    events = [
+        Event(name='Talk', duration=30, demand=10,
+              unavailability=[other_event]),
+        other_event]
+
+    verdicts = []
+    for clashes in ('pairwise', 'clique'):
+        for sparse in (False, True):
+            try:
+                solution = scheduler.solution(
+                    events, slots, clashes=clashes, sparse=sparse)
+            except ValueError:
+                verdicts.append(False)
+            else:
+                assert validator.is_valid_solution(solution, events, slots)
+                verdicts.append(True)
+    assert verdicts == [long_slot_first] * 4
+
+
 def test_unsolvable_raises_error(events):
     slots = [
         Slot(
@@ -95,6 +199,8 @@ def test_unsolvable_raises_error(events):
     ]
     with pytest.raises(ValueError):
         scheduler.solution(events, slots)
+    with pytest.raises(ValueError):
+        scheduler.solution(events, slots, sparse=True)
 
 
 def test_solution_solver_recognised_by_pulp_raises_error(events, slots):
@@ -311,7 +417,19 @@ def test_heuristic_solution(events, slots):
     np.random.seed(1)
     solution = scheduler.heuristic(events=events, slots=slots)
 
-    assert solution == [(0, 4), (1, 0), (2, 6)]
+    assert solution == [(0, 2), (1, 5), (2, 6)]
+
+
+def test_heuristic_solution_with_numpy_only_objective_function(
+    events, slots
+):
+    def later_slots(events, slots, X, **kwargs):
+        return np.sum(X * np.arange(X.shape[1]))
+
+    np.random.seed(1)
+    solution = scheduler.heuristic(
+        events=events, slots=slots, objective_function=later_slots)
+    assert validator.is_valid_solution(solution, events, slots)
 
 
 def test_heuristic_solution_with_simulated_annealing(events, slots):
@@ -322,7 +440,7 @@ def test_heuristic_solution_with_simulated_annealing(events, slots):
         algorithm=heu.simulated_annealing,
         objective_function=of.efficiency_capacity_demand_difference)
 
-    assert solution == [(0, 4), (1, 5), (2, 6)]
+    assert solution == [(0, 2), (1, 5), (2, 6)]
 
     solution = scheduler.heuristic(
         events=events,
@@ -332,7 +450,7 @@ def test_heuristic_solution_with_simulated_annealing(events, slots):
         objective_function_algorithm_kwargs={"max_iterations": 2},
         objective_function=of.efficiency_capacity_demand_difference)
 
-    assert solution == [(0, 4), (1, 0), (2, 6)]
+    assert solution == [(0, 2), (1, 5), (2, 6)]
 
 
 def test_heuristic_solution_with_sim_annealing_init_sol_and_equity(events,
@@ -350,7 +468,7 @@ def test_heuristic_solution_with_sim_annealing_init_sol_and_equity(events,
         initial_solution=X_orig,
         objective_function=of.equity_capacity_demand_difference)
 
-    assert solution == [(0, 3), (1, 4), (2, 6)]
+    assert solution == [(0, 6), (1, 5), (2, 1)]
 
     np.random.seed(1)
     X_orig = np.array([
@@ -365,4 +483,118 @@ def test_heuristic_solution_with_sim_annealing_init_sol_and_equity(events,
         initial_solution=X_orig,
         objective_function=of.equity_capacity_demand_difference)
 
-    assert solution == [(0, 0), (1, 4), (2, 6)]
+    assert solution == [(0, 6), (1, 5), (2, 1)]
+
+
+def test_unmatched_events_are_named(events, slots):
+    # Talk 2 is unavailable for both of these slots and Workshop 1 is too
+    # long for them
+    with pytest.raises(ValueError) as error:
+        scheduler.solution(events, slots[2:4])
+    assert str(error.value) == (
+        'No valid solution found: no available slots left for Talk 2, '
+        'Workshop 1')
+
+
+def test_solution_with_warm_start(events, slots):
+    solver = pulp.PULP_CBC_CMD(msg=False, warmStart=True)
+    solution = scheduler.solution(events, slots, solver=solver)
+    assert validator.is_valid_solution(solution, events, slots)
+
+
+def test_solution_default_solver_uses_warm_start(
+    events, slots, monkeypatch
+):
+    solvers = []
+    solve = pulp.LpProblem.solve
+
+    def recording_solve(problem, solver=None, **kwargs):
+        solvers.append(solver)
+        return solve(problem, solver, **kwargs)
+
+    monkeypatch.setattr(pulp.LpProblem, 'solve', recording_solve)
+    solution = scheduler.solution(events, slots)
+    assert validator.is_valid_solution(solution, events, slots)
+    assert solvers[0].optionsDict['warmStart']
+
+
+def test_matching_initial_array(events, slots):
+    X = heu.get_matching_initial_array(events, slots)
+    assert heu.is_assignment_array(X)
+    availability = lpu.slot_availability_array(events, slots)
+    assert np.all(availability[X == 1] == 1)
+
+
+def test_heuristic_solution_with_tabu_search(events, slots):
+    np.random.seed(1)
+    solution = scheduler.heuristic(
+        events=events,
+        slots=slots,
+        algorithm=heu.tabu_search,
+        objective_function=of.efficiency_capacity_demand_difference)
+    assert validator.is_valid_solution(solution, events, slots)
+
+
+def test_heuristic_solution_with_multi_start(events, slots):
+    np.random.seed(1)
+    solution = scheduler.heuristic(
+        events=events,
+        slots=slots,
+        algorithm=heu.multi_start,
+        initial_solution_algorithm_kwargs={
+            "algorithm": heu.hill_climber, "processes": 2},
+        objective_function_algorithm_kwargs={
+            "algorithm": heu.hill_climber, "processes": 2},
+        objective_function=of.efficiency_capacity_demand_difference)
+    assert validator.is_valid_solution(solution, events, slots)
+
+
+def test_heuristic_solution_with_time_limit(events, slots, monkeypatch):
+    deadlines = []
+
+    def algorithm(**kwargs):
+        deadlines.append(kwargs['deadline'])
+        return heu.simulated_annealing(**kwargs)
+
+    # The clock is frozen so that the deadlines given to each phase are known
+    monkeypatch.setattr(scheduler.time, 'monotonic', lambda: 100.0)
+    np.random.seed(1)
+    solution = scheduler.heuristic(
+        events=events,
+        slots=slots,
+        algorithm=algorithm,
+        objective_function=of.efficiency_capacity_demand_difference,
+        time_limit=1)
+    assert validator.is_valid_solution(solution, events, slots)
+    assert deadlines == [100.5, 101]
+
+    deadlines.clear()
+    solution = scheduler.heuristic(
+        events=events, slots=slots, algorithm=algorithm, time_limit=1)
+    assert validator.is_valid_solution(solution, events, slots)
+    assert deadlines == [101]
+
+
+def test_heuristic_solution_with_trace(events, slots):
+    np.random.seed(1)
+    solution, traces = scheduler.heuristic(
+        events=events,
+        slots=slots,
+        objective_function=of.efficiency_capacity_demand_difference,
+        trace=True)
+    assert validator.is_valid_solution(solution, events, slots)
+    assert set(traces) == {'initial_solution', 'objective_function'}
+    assert traces['initial_solution'].records[-1].best_energy == 0
+    assert traces['objective_function'].counts['objective'] > 0
+
+    np.random.seed(1)
+    assert scheduler.heuristic(
+        events=events,
+        slots=slots,
+        objective_function=of.efficiency_capacity_demand_difference) == (
+            solution)
+
+    solution, traces = scheduler.heuristic(
+        events=events, slots=slots, initial_solution=np.array(solution),
+        trace=True)
+    assert traces == {}
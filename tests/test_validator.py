@@ -1,5 +1,7 @@
+import pytest
 import numpy as np
 from conference_scheduler import validator
+from conference_scheduler import heuristics as heu
 from conference_scheduler.resources import ScheduledItem
 
 
@@ -108,3 +110,74 @@ def test_schedule_unscheduled_event_has_violations(events, slots):
     assert violations == [
         'Event either not scheduled or scheduled multiple times - event: 1'
     ]
+
+
+# Tests for violation counts
+
+
+def test_array_violation_counts(events, slots):
+    array = np.array([
+        [0, 0, 1, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 1],
+        [0, 0, 0, 0, 0, 0, 1]
+    ])
+    counts = validator.array_violation_counts(array, events, slots)
+    assert counts == {
+        'schedule_all_events': 0,
+        'max_one_event_per_slot': 1,
+        'events_available_in_scheduled_slot': 0,
+        'events_available_during_other_events': 1,
+    }
+    assert sum(counts.values()) == len(
+        list(validator.array_violations(array, events, slots)))
+
+    counts = validator.array_violation_counts(array, events, slots, beta=200)
+    assert counts['upper_bound_on_event_overflow'] == 1
+
+
+@pytest.mark.parametrize('beta', [None, 0, 100])
+def test_array_validator_matches_array_violations(random_conference, beta):
+    events, slots = random_conference
+    count_violations = validator.ArrayValidator(events, slots, beta=beta)
+    random_state = np.random.RandomState(0)
+    for density in (0.02, 0.1, 0.3):
+        for _ in range(5):
+            array = (random_state.random_sample(
+                (len(events), len(slots))) < density).astype(float)
+            assert count_violations(array) == len(list(
+                validator.array_violations(array, events, slots, beta=beta)))
+
+
+@pytest.mark.parametrize('beta', [None, 0, 100])
+def test_violation_tracker(random_conference, beta):
+    events, slots = random_conference
+    tracker = validator.ViolationTracker(events, slots, beta=beta)
+    np.random.seed(0)
+    X = heu.get_initial_array(events, slots)
+    tracker.reset(X)
+    violations = tracker(X)
+    for _ in range(200):
+        move = heu.random_move(X)
+        candidate = X.copy()
+        heu.apply_move(candidate, move)
+        assert violations + tracker.delta(move) == tracker(candidate)
+        if np.random.random() < 0.5:
+            violations += tracker.delta(move)
+            tracker.apply(move)
+            X = candidate
+    assert np.array_equal(tracker.assignment.slot_of, np.nonzero(X)[1])
+    assert violations == len(
+        list(validator.array_violations(X, events, slots, beta=beta)))
+
+
+@pytest.mark.parametrize('beta', [None, 50])
+def test_violation_tracker_deltas(random_conference, beta):
+    events, slots = random_conference
+    tracker = validator.ViolationTracker(events, slots, beta=beta)
+    X = heu.get_initial_array(events, slots, seed=0)
+    tracker.reset(X)
+    moves = tracker.assignment.random_moves(
+        500, rng=np.random.default_rng(0))
+    expected = [tracker.delta(moves.move(index))
+                for index in range(len(moves))]
+    assert np.array_equal(tracker.deltas(moves), expected)